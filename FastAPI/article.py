@@ -83,11 +83,14 @@ def get_related(article_id: str):
         "article_label"
     ]
 
-    docs = get_article_from_es(id_list, SOURCE_FIELDS=source_fields)
-
-    # get_article_from_es가 HTTPException을 "return"하는 구조면 방어
-    if isinstance(docs, HTTPException):
-        raise docs
+    # 순서(유사도 순) 유지 + 검색 대신 id 조회
+    docs = [
+        d["_source"]
+        for d in es.mget(index="article_data", ids=id_list, _source=source_fields)["docs"]
+        if d.get("found")
+    ] if id_list else []
+    if not docs:
+        raise HTTPException(status_code=404, detail="article not found")
 
     # score 매핑(선택)
     score_map = {d["article_id"]: d.get("score") for d in related[:3]}
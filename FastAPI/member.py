@@ -3,6 +3,7 @@ from sqlalchemy import text
 from datetime import datetime
 from util.elastic import es  # util 폴더의 elastic.py
 from util.text_cleaner import yyyymmdd_to_iso
+from util.vector_store import delete_vectors
 
 import random
 import string
@@ -470,6 +471,7 @@ def reset_user_algorithm(user_id):
                 }
             }
         )
+        delete_vectors("user", [user_id])
         return True
     except Exception as e:
         print(f"Algorithm & Embedding reset error: {e}")
@@ -1,5 +1,8 @@
 from util.elastic import es  # util 폴더의 elastic.py
 from util.text_cleaner import yyyymmdd_to_iso
+from labeler.ann_index import ann_neighbors, ann_vector
+from labeler.related_store import related_hits
+from util.vector_store import get_vector, rerank
 
 # FastAPI/search.py (또는 해당 파일)
 
@@ -117,52 +120,63 @@ def es_search_related_by_embedding(article_id: str, size: int = 4):
     - 동일 언론사 중복 제거
     """
 
-    # -------------------------------
-    # 1. 기준 기사 임베딩 조회
-    # -------------------------------
-    base = es.search(
-        index="article_data",
-        body={
-            "size": 1,
-            "_source": ["article_embedding"],
-            "query": {"term": {"article_id": article_id}}
-        }
-    )
-
-    hits = base["hits"]["hits"]
-    if not hits:
-        return []
-
-    query_vector = hits[0]["_source"]["article_embedding"]
+    related_fields = [
+        "article_id",
+        "article_title",
+        "article_img",
+        "press",
+        "reporter",  #  기자명 추가 해정
+        "upload_date",  #  날짜 추가
+        "article_label"
+    ]
 
     # -------------------------------
-    # 2. KNN 검색 (후보는 넉넉히)
+    # 1. 미리 계산한 연관 기사 목록 (labeler.related_store) → get + mget
     # -------------------------------
-    res = es.search(
-        index="article_data",
-        size=50,  # ⭐ 후보를 넉넉히 가져온다
-        knn={
-            "field": "article_embedding",
-            "query_vector": query_vector,
-            "k": 50,
-            "num_candidates": 200,
-            "filter": [
-                {"range": {"collected_at": {"gte": "now-7d"}}}
+    candidate_hits = related_hits(article_id, related_fields, since_days=7)
+
+    if candidate_hits is None:
+        # -------------------------------
+        # 2. 목록이 없으면 기준 기사 임베딩 조회
+        # -------------------------------
+        query_vector = ann_vector(article_id)
+        if query_vector is None:
+            query_vector = get_vector("article", article_id)
+            if query_vector is None:
+                return []
+
+        # -------------------------------
+        # 3. KNN 검색 (후보는 넉넉히)
+        #    사이드카 인덱스(labeler.ann_index)에서 이웃을 찾고 문서는 mget, 못 쓰면 ES kNN
+        # -------------------------------
+        neighbors = ann_neighbors(query_vector, k=50, since_days=7)
+        if neighbors is not None:
+            scores = dict(neighbors)
+            docs = es.mget(index="article_data", ids=list(scores), _source=related_fields)["docs"] if scores else []
+            candidate_hits = [
+                {"_source": d["_source"], "_score": scores[d["_id"]]}
+                for d in docs if d.get("found")
             ]
-        },
-        _source=[
-            "article_id",
-            "article_title",
-            "article_img",
-            "press",
-            "reporter",  #  기자명 추가 해정
-            "upload_date",  #  날짜 추가
-            "article_label"
-        ]
-    )
+        else:
+            res = es.search(
+                index="article_data",
+                size=50,  # ⭐ 후보를 넉넉히 가져온다
+                knn={
+                    "field": "article_embedding",
+                    "query_vector": query_vector,
+                    "k": 50,
+                    "num_candidates": 200,
+                    "filter": [
+                        {"range": {"collected_at": {"gte": "now-7d"}}}
+                    ]
+                },
+                _source=related_fields
+            )
+            # int8 양자화 점수 → float 사본으로 다시 계산 (유사도 구간 컷이 점수에 민감)
+            candidate_hits = rerank("article", query_vector, res["hits"]["hits"])
 
     # -------------------------------
-    # 3. 필터 설정값
+    # 4. 필터 설정값
     # -------------------------------
     SIMILARITY_MAX = 0.90   # 너무 비슷하면 제거
     SIMILARITY_MIN = 0.75   # 너무 안 비슷하면 제거
@@ -171,9 +185,9 @@ def es_search_related_by_embedding(article_id: str, size: int = 4):
     used_press = set()
 
     # -------------------------------
-    # 4. 후보 필터링
+    # 5. 후보 필터링
     # -------------------------------
-    for h in res["hits"]["hits"]:
+    for h in candidate_hits:
         src = h["_source"]
 
         # 자기 자신 제외
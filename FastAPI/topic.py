@@ -3,6 +3,7 @@ from fastapi import HTTPException
 from util.logger import Logger
 from .article import get_article_from_es, ensure_list
 from util.text_cleaner import yyyymmdd_to_iso
+from util.vector_store import get_vectors
 import numpy as np
 
 
@@ -49,26 +50,12 @@ def get_topic_article(id_list):
             ids = [ids]
             # logger.info(ids)
 
-        polar_vec = []
         ids = ensure_list(ids)
         logger.info("============")
-        try:
-            docs = get_article_from_es(
-                ids[0][1],
-                SOURCE_FIELDS=["article_embedding"],
-                max=len(ids)
-            )
-        except HTTPException as e:
-            # ✅ ES에 문서 없으면 이 그룹은 그냥 비움
-            if e.status_code == 404:
-                all_result.append([])
-                continue
-            raise
-
-        for doc in docs:
-            vec = doc.get("article_embedding")
-            if vec:
-                polar_vec.append(vec)
+        # 벡터는 _source 에 없으므로 float 사본에서 읽습니다 (util.vector_store)
+        # ✅ ES에 문서 없으면 아래에서 이 그룹은 그냥 비움
+        vectors = get_vectors("article", ensure_list(ids[0][1])[:len(ids)])
+        polar_vec = list(vectors.values())
 
         # 벡터가 하나도 없으면 skip
         if not polar_vec:
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
@@ -10,6 +10,8 @@ from pydantic import BaseModel
 from util.scheduler_runtime import scheduler
 from util.elastic import es
 from util.elastic_templates import build_info_docs
+from util.backfill import BACKFILL_JOBS, is_running, run_backfill
+from labeler.model_registry import model_stats
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -141,3 +143,52 @@ def resume_all(env: str = "dev"):
     except Exception as e:
         _log_scheduler_action(env, "resume", "all", "error", error_message=str(e))
         raise HTTPException(status_code=500, detail=str(e))
+
+
+class BackfillBody(BaseModel):
+    date_from: Optional[str] = None      # collected_at >= (예: 2026-01-01)
+    date_to: Optional[str] = None        # collected_at <=
+    statuses: Optional[List[str]] = None
+    workers: int = 2
+    chunk_size: int = 500
+    max_docs_per_sec: Optional[float] = None
+    restart: bool = False
+
+
+@router.post("/backfill/{job}")
+def trigger_backfill(job: str, body: BackfillBody, env: str = "dev"):
+    """
+    POST /admin/backfill/{re_clean|re_embedding}
+    - scheduler에 1회성 job(backfill_{job}, trigger 없음 = 즉시 실행)으로 등록합니다
+    - checkpoint가 있으면 이어서 진행 (restart=true면 처음부터)
+    """
+    if job not in BACKFILL_JOBS:
+        _log_scheduler_action(env, "backfill", job, "error", error_message="job not found")
+        raise HTTPException(status_code=404, detail=f"backfill job not found: {job}")
+    if is_running(job):
+        _log_scheduler_action(env, "backfill", job, "error", error_message="already running")
+        raise HTTPException(status_code=409, detail=f"backfill already running: {job}")
+
+    options = body.model_dump()
+    try:
+        scheduler.add_job(
+            run_backfill,
+            id=f"backfill_{job}",
+            args=[job],
+            kwargs=options,
+            replace_existing=True,
+            max_instances=1,
+        )
+        _log_scheduler_action(env, "backfill", job, "ok", extra={"job": job, **options})
+        return {"ok": True, "job_id": f"backfill_{job}", "options": options}
+    except Exception as e:
+        _log_scheduler_action(env, "backfill", job, "error", error_message=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/models")
+def list_models():
+    """
+    프로세스에 로드된 모델 목록 (로드/워밍업 시간, 파라미터 메모리, RSS 증가량, 스레드 수)
+    """
+    return {"ok": True, "models": model_stats()}
@@ -15,6 +15,8 @@ from datetime import timedelta, timezone
 
 from util.elastic import es
 from util.logger import Logger
+from util.vector_store import get_vectors
+from labeler.ann_index import ann_vector
 
 logger = Logger().get_logger(__name__)
 
@@ -127,12 +129,12 @@ def recommend_trend_articles(limit: int = 20):
             "article_title",
             "article_label.trend_score",
             "article_label.article_trust_score",
-            "article_embedding",
             "article_img",
             "reporter", # 해정 추가 트렌드 메인
             "article_label", # 해정 추가 카테고리 가져와야해서
             "press",
-            "collected_at"
+            "collected_at",
+            "dup_group_id"
         ]
     )
 
@@ -143,10 +145,19 @@ def recommend_trend_articles(limit: int = 20):
 
     logger.info("[TREND-RECOMMEND] raw candidates=%d", len(hits))
 
+    # 벡터는 _source 에 없으므로 사이드카 인덱스 → float 사본 순으로 한 번에 읽습니다
+    vectors = {}
+    for h in hits:
+        vec = ann_vector(h["_id"])
+        if vec is not None:
+            vectors[h["_id"]] = vec
+    vectors.update(get_vectors("article", [h["_id"] for h in hits if h["_id"] not in vectors]))
+
     # 2. 후보 기사 정제
     candidates = []
     embeddings = []
     scores = []
+    seen_groups = set()
 
     for h in hits:
         src = h.get("_source", {})
@@ -159,10 +170,17 @@ def recommend_trend_articles(limit: int = 20):
         if any(bad in title for bad in BAN_WORDS):
             continue
 
-        emb = src.get("article_embedding")
+        emb = vectors.get(h["_id"])
         if not emb:
             continue
 
+        # 같은 통신사 원문(근사 중복 그룹)은 트렌드 점수가 가장 높은 1건만 후보로
+        group_id = src.get("dup_group_id")
+        if group_id:
+            if group_id in seen_groups:
+                continue
+            seen_groups.add(group_id)
+
         trend_score = label.get("trend_score", 0.0)
         # trust_score = label.get("article_trust_score", 0.0)
 
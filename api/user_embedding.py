@@ -3,6 +3,7 @@ from util.elastic import es
 from util.database import SessionLocal
 from sqlalchemy import text
 from util.logger import Logger
+from util.vector_store import get_vector, get_vectors, put_vectors
 
 import numpy as np
 import json
@@ -73,19 +74,11 @@ def update_user_embedding(user_id):
     article_id, preference_score = article_row
     preference_score = float(preference_score)
 
-    resp = es.search(
-        index="article_data",
-        body={
-            "_source": ["article_embedding"],
-            "query": {"term": {"article_id": article_id}}
-        }
-    )
-
-    hits = resp.get("hits", {}).get("hits", [])
-    if not hits:
+    # 벡터는 _source 에 없으므로 float 사본에서 읽습니다 (util.vector_store)
+    article_embedding = get_vector("article", article_id)
+    if article_embedding is None:
         return
 
-    article_embedding = hits[0]["_source"].get("article_embedding")
     if not article_embedding or len(article_embedding) != 768:
         raise RuntimeError(f"Invalid article_embedding article_id={article_id}")
 
@@ -94,14 +87,17 @@ def update_user_embedding(user_id):
     resp = es.search(
         index="user_embeddings",
         body={
-            "_source": ["embedding"],
+            "_source": ["user_id"],
             "query": {"term": {"user_id": user_id}}
         }
     )
 
     hits = resp.get("hits", {}).get("hits", [])
+    # 이전 방식으로 저장되어 float 사본이 없는 사용자(_source 에서도 벡터가 빠진 경우)는 새 사용자처럼 다시 만듭니다
+    user_embedding = get_vector("user", hits[0]["_id"]) if hits else None
 
-    if not hits:
+    if user_embedding is None:
+        put_vectors("user", {user_id: old_emb.tolist()})
         es.index(
             index="user_embeddings",
             id=user_id,
@@ -115,13 +111,13 @@ def update_user_embedding(user_id):
         logger.info(f"[EMB UPDATE] user_id={user_id} CREATE")
         return
 
-    user_embedding = hits[0]["_source"].get("embedding")
-    if not user_embedding or len(user_embedding) != 768:
+    if len(user_embedding) != 768:
         raise RuntimeError(f"Invalid user_embedding user_id={user_id}")
 
     new_emb = np.asarray(user_embedding, dtype=np.float32)
     updated_embedding = 0.9 * old_emb + 0.1 * preference_score * new_emb
 
+    put_vectors("user", {user_id: updated_embedding.tolist()})
     es.update(
         index="user_embeddings",
         id=user_id,
@@ -140,20 +136,10 @@ def update_user_embedding(user_id):
 # 유저 기사 조회 (기존 유지)
 # -------------------------------------------------
 def user_articles(user_id):
-    resp = es.search(
-        index="user_embeddings",
-        body={
-            "_source": ["embedding"],
-            "query": {"term": {"user_id": user_id}}
-        }
-    )
-
-    hits = resp.get("hits", {}).get("hits", [])
-    if not hits:
+    query_vec = get_vector("user", user_id)
+    if query_vec is None:
         return []
 
-    query_vec = hits[0]["_source"]["embedding"]
-
     res = es.search(
         index="article_data",
         size=20,
@@ -197,17 +183,18 @@ def get_similar_users_mean_embedding(
             "k": top_k,
             "num_candidates": 100,
         },
-        _source=["embedding"],
+        _source=["user_id"],
     )
 
     hits = res.get("hits", {}).get("hits", [])
     if not hits:
         return None
 
+    vectors = get_vectors("user", [h["_id"] for h in hits])
     emb_list = []
 
     for h in hits:
-        emb = (h.get("_source") or {}).get("embedding")
+        emb = vectors.get(h["_id"])
         if not emb or len(emb) != 768:
             continue
 
@@ -284,12 +271,14 @@ def recommend_articles(user_id: str, limit: int = 20,random: bool = False):
         resp = es.search(
             index="user_embeddings",
             body={
-                "_source": ["embedding"],
+                "_source": ["user_id"],
                 "query": {"term": {"user_id": user_id}}
             }
         )
         user_hits = resp.get("hits", {}).get("hits", [])
-        has_user_embedding = len(user_hits) > 0
+        # 벡터는 _source 에 없으므로 float 사본에서 읽습니다 (util.vector_store)
+        query_vec = get_vector("user", user_hits[0]["_id"]) if user_hits else None
+        has_user_embedding = query_vec is not None
         # [LOG-1] 콜드스타트 / 개인화 분기 확인
         logger.info(
             f"[RECOMMEND] user_id={user_id} has_user_embedding={has_user_embedding}"
@@ -298,7 +287,6 @@ def recommend_articles(user_id: str, limit: int = 20,random: bool = False):
     # 2. 후보 기사 조회
     # -------------------------------------------------
     if has_user_embedding:
-        query_vec = user_hits[0]["_source"]["embedding"]
         res_base = es.search(
             index="article_data",
             size=100,
@@ -0,0 +1,118 @@
+"""
+BigKinds 미리보기 테이블 읽기 벤치마크
+
+저장된 테이블 fixture를 headless Chrome으로 열고, 행을 --rows 개까지 복제한 뒤
+- legacy : 행마다 find_element 9번 (기존 crawl_bigkinds_full 방식)
+- script : execute_script 1번으로 테이블 전체 JSON 직렬화 (read_preview_table)
+두 방식의 소요 시간과 결과 일치 여부를 출력합니다
+
+실행 (프로젝트 루트):
+    python -m bench.bench_bigkinds_table --rows 1000
+"""
+import argparse
+import time
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from webdriver_manager.chrome import ChromeDriverManager
+
+from crawler.bigkinds_table import PREVIEW_ROWS_SELECTOR, read_preview_table
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "bigkinds_preview_table.html"
+COLLECTED_AT = "2026-01-07T14:00:00+09:00"
+
+# fixture 행을 n개가 될 때까지 복제하면서 tr/td id를 새 행번호로 바꿉니다
+_REPLICATE_JS = """
+const target = arguments[0];
+const tbody = document.querySelector("#preview-wrap > table > tbody");
+const templates = Array.from(tbody.querySelectorAll("tr"));
+let n = templates.length;
+while (n < target) {
+    const src = templates[n % templates.length];
+    const srcNo = src.id.split("-")[1];
+    const tr = src.cloneNode(true);
+    tr.id = "row-" + n;
+    for (const td of tr.querySelectorAll("td")) {
+        const col = td.id.split("-")[0];
+        td.id = col + "-" + n;
+        if (col === "0") td.textContent = td.textContent + "_" + n;
+    }
+    tbody.appendChild(tr);
+    n++;
+}
+return n;
+"""
+
+
+def _split_csv(raw):
+    return [k.strip() for k in raw.split(",") if k.strip()]
+
+
+def read_legacy(driver):
+    """기존 방식: 행마다 find_element 9번"""
+    results = []
+    rows = driver.find_elements(By.CSS_SELECTOR, PREVIEW_ROWS_SELECTOR)
+    for row in rows:
+        row_no = row.get_attribute("id").split('-')[1]
+
+        def cell(col):
+            return driver.find_element(By.CSS_SELECTOR, f'td[id="{col}-{row_no}"]').text
+
+        keywords_raw = cell(14)
+        feature_raw = cell(15)
+        org_raw = cell(13)
+        person_raw = cell(11)
+
+        results.append({
+            "press": cell(2),
+            "article_id": cell(0),
+            "upload_date": cell(1),
+            "reporter": cell(3),
+            "keywords": _split_csv(keywords_raw),
+            "features": _split_csv(feature_raw),
+            "url": cell(17),
+            "collected_at": COLLECTED_AT,
+            "entities": {
+                "org": _split_csv(org_raw),
+                "person": _split_csv(person_raw)
+            }
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+
+    try:
+        driver.get(FIXTURE.as_uri())
+        n_rows = driver.execute_script(_REPLICATE_JS, args.rows)
+        print(f"rows: {n_rows}")
+
+        t0 = time.perf_counter()
+        legacy = read_legacy(driver)
+        t_legacy = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        script = read_preview_table(driver, COLLECTED_AT)
+        t_script = time.perf_counter() - t0
+
+        print(f"legacy (find_element x9/row) : {t_legacy:8.3f}s")
+        print(f"script (execute_script x1)   : {t_script:8.3f}s")
+        print(f"speedup                      : {t_legacy / max(t_script, 1e-9):8.1f}x")
+        print(f"identical output             : {legacy == script}")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+재생 서버 기반 크롤링 처리량 벤치마크 (네트워크/ES 불필요)
+
+--archive 를 주지 않으면 bench/fixtures/pages 의 언론사별 페이지를
+https://<key>.replay.local/article/<n> 형태 URL로 --per-press 개씩 복제해 임시 아카이브를 만듭니다.
+실제 녹화본(CRAWLER_RECORD_PATH로 저장한 아카이브)을 주면 그 URL들을 그대로 재생합니다
+
+재생 서버(지연/에러율 주입) → CrawlSession.fetch_html → CrawlSession.parse 를
+--concurrency / --rate / --burst 설정으로 돌려 pages/s 와 재시도·실패 수를 출력합니다
+
+실행 (프로젝트 루트):
+    python -m bench.bench_crawl_replay --per-press 50 --latency-ms 80 --error-rate 0.02 --concurrency 8 --rate 20
+"""
+import argparse
+import asyncio
+import dataclasses
+import tempfile
+import time
+from pathlib import Path
+
+from crawler.engine import CrawlSession
+from crawler.press_specs import PRESS_SPECS
+from crawler.replay import ResponseArchive, start_replay_server
+
+PAGES_DIR = Path(__file__).resolve().parent / "fixtures" / "pages"
+
+
+def build_fixture_archive(path: Path, per_press: int) -> None:
+    archive = ResponseArchive(str(path)).open_for_write()
+    try:
+        for spec in PRESS_SPECS.values():
+            page = PAGES_DIR / f"{spec.key}.html"
+            if not page.exists():
+                continue
+            body = page.read_bytes()
+            for n in range(per_press):
+                archive.add(f"https://{spec.key}.replay.local/article/{n}", 200, "text/html; charset=utf-8", body)
+    finally:
+        archive.close()
+
+
+def targets_by_press(archive_path: Path):
+    """아카이브 URL을 host 기준으로 언론사 spec에 배정합니다 (fixture URL은 key가 host 앞부분)"""
+    by_key = {spec.key: spec for spec in PRESS_SPECS.values()}
+    targets = {}
+    for url in ResponseArchive(str(archive_path)).load():
+        host = url.split("/")[2]
+        key = next((k for k in by_key if host.startswith(f"{k}.") or k in host), None)
+        if key:
+            targets.setdefault(key, []).append(url)
+    return {by_key[k]: urls for k, urls in targets.items()}
+
+
+async def run(replay_url: str, targets, args):
+    ok = failed = 0
+    async with CrawlSession(record_path=None, replay_url=replay_url) as session:
+        async def one(spec, url):
+            nonlocal ok, failed
+            try:
+                html = await session.fetch_html(spec, url)
+                await session.parse(spec, html)
+                ok += 1
+            except Exception:
+                failed += 1
+
+        jobs = []
+        for spec, urls in targets.items():
+            # 재생 시에는 renderer도 httpx로 (playwright 렌더링 비용은 별도 측정 대상)
+            tuned = dataclasses.replace(
+                spec, renderer="httpx", concurrency=args.concurrency, rate=args.rate, burst=args.burst
+            )
+            jobs.extend(one(tuned, url) for url in urls)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*jobs)
+        elapsed = time.perf_counter() - t0
+    return ok, failed, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--archive", type=Path, default=None)
+    parser.add_argument("--per-press", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=2.0)
+    parser.add_argument("--burst", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_path = args.archive
+        if archive_path is None:
+            archive_path = Path(tmp) / "fixture_archive.jsonl.gz"
+            build_fixture_archive(archive_path, args.per_press)
+
+        server = start_replay_server(
+            str(archive_path),
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        )
+        try:
+            targets = targets_by_press(archive_path)
+            ok, failed, elapsed = asyncio.run(run(server.base_url, targets, args))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    total = ok + failed
+    print(f"presses                 : {len(targets)}")
+    print(f"pages                   : {total} (ok={ok}, failed={failed})")
+    print(f"injected errors         : {server.error_cnt}")
+    print(f"elapsed                 : {elapsed:8.2f}s")
+    print(f"throughput              : {total / max(elapsed, 1e-9):8.1f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+임베딩 백엔드 비교: PyTorch fp32 vs ONNX int8 (labeler.onnx_embedder)
+
+1) 문장 임베딩 cosine 일치 (문장별 평균/최소)
+2) 기사 임베딩(build_doc_embeddings: 제목 + tfidf 가중 문장 평균) cosine 일치
+3) 문장/초 처리량 (CPU, MODEL_NUM_THREADS)
+평균 cosine이 --min-mean 미만이거나 최소 cosine이 --min-cos 미만이면 exit 1
+
+먼저 int8 모델을 내보내야 합니다:
+    python -m labeler.onnx_embedder --qconfig avx2
+
+실행 (프로젝트 루트):
+    python -m bench.bench_embed_backends --archive data/crawl_archive.jsonl.gz
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from bench.bench_text_cleaner import load_archive_bodies, load_golden
+from labeler import onnx_embedder
+from labeler.create_embeddings import build_doc_embeddings, split_sentences_ko
+from labeler.model_registry import EMBED_MODEL_NAME, MODEL_NUM_THREADS, _configure_threads
+from util.text_cleaner import clean_article_text
+
+
+def load_articles(args):
+    if args.archive:
+        texts = [clean_article_text(t) for t in load_archive_bodies(args.archive)]
+    else:
+        texts = [g["expected"] for g in load_golden() if len(g["expected"]) > 40]
+    articles = []
+    for i, text in enumerate(texts[:args.docs]):
+        sents = [s for s in split_sentences_ko(text) if s]
+        if sents:
+            articles.append({"article_id": str(i), "article_title": sents[0][:60], "article_content": text})
+    return articles
+
+
+def sentences_per_sec(model, sents, batch_size):
+    model.encode(sents[:batch_size], batch_size=batch_size)  # warm-up
+    t0 = time.perf_counter()
+    model.encode(sents, batch_size=batch_size)
+    return len(sents) / max(time.perf_counter() - t0, 1e-9)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--archive", default=None)
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--min-mean", type=float, default=0.99)
+    parser.add_argument("--min-cos", type=float, default=0.95)
+    args = parser.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+
+    _configure_threads()
+    torch_model = SentenceTransformer(EMBED_MODEL_NAME)
+    onnx_model = onnx_embedder.load_quantized(num_threads=MODEL_NUM_THREADS)
+
+    articles = load_articles(args)
+    sents = [s for a in articles for s in split_sentences_ko(a["article_content"]) if s]
+
+    a = torch_model.encode(sents, batch_size=args.batch_size, normalize_embeddings=True)
+    b = onnx_model.encode(sents, batch_size=args.batch_size, normalize_embeddings=True)
+    sent_cos = np.sum(a * b, axis=1)
+
+    doc_a = build_doc_embeddings(torch_model, articles)
+    doc_b = build_doc_embeddings(onnx_model, articles)
+    doc_cos = np.array([float(np.dot(doc_a[k], doc_b[k])) for k in doc_a])
+
+    torch_sps = sentences_per_sec(torch_model, sents, args.batch_size)
+    onnx_sps = sentences_per_sec(onnx_model, sents, args.batch_size)
+
+    print(f"articles / sentences      : {len(articles)} / {len(sents)}")
+    print(f"threads                   : {MODEL_NUM_THREADS}")
+    print(f"sentence cosine mean/min  : {sent_cos.mean():.5f} / {sent_cos.min():.5f}")
+    print(f"article cosine mean/min   : {doc_cos.mean():.5f} / {doc_cos.min():.5f}")
+    print(f"torch fp32                : {torch_sps:8.1f} sentences/s")
+    print(f"onnx int8 ({onnx_embedder.EMBED_ONNX_QCONFIG:<6})         : {onnx_sps:8.1f} sentences/s")
+    print(f"speedup                   : {onnx_sps / max(torch_sps, 1e-9):8.2f}x")
+
+    if doc_cos.mean() < args.min_mean or doc_cos.min() < args.min_cos:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
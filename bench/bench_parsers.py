@@ -0,0 +1,88 @@
+"""
+기사 HTML 파싱 백엔드 벤치마크
+
+저장된 기사 페이지(--pages 디렉터리, 파일명 "<PressSpec.key>*.html")를 언론사별로
+- 설치된 백엔드(selectolax / lxml / bs4)마다 extract_article 소요 시간
+- bs4 결과와의 일치 여부
+- 루프 안 직렬 파싱 vs ProcessPoolExecutor(extract_fields) 처리량
+을 출력합니다
+
+기본 fixture(bench/fixtures/pages)는 언론사별 선택자 구조만 맞춘 합성 페이지입니다.
+실제 페이지로 재려면 브라우저에서 "다른 이름으로 저장"한 HTML을 같은 이름 규칙으로 넣으면 됩니다
+
+실행 (프로젝트 루트):
+    python -m bench.bench_parsers --repeat 200 --workers 4
+"""
+import argparse
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from crawler.parsers import available_backends, extract_article, extract_fields
+from crawler.press_specs import PRESS_SPECS
+
+PAGES_DIR = Path(__file__).resolve().parent / "fixtures" / "pages"
+
+
+def load_pages(pages_dir: Path):
+    """{PressSpec: [bytes, ...]}"""
+    by_key = {spec.key: spec for spec in PRESS_SPECS.values()}
+    pages = defaultdict(list)
+    for path in sorted(pages_dir.glob("*.html")):
+        key = next((k for k in sorted(by_key, key=len, reverse=True) if path.stem.startswith(k)), None)
+        if key is None:
+            print(f"skip (unknown press key): {path.name}")
+            continue
+        pages[by_key[key]].append(path.read_bytes())
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=Path, default=PAGES_DIR)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    backends = available_backends()
+    print(f"backends: {', '.join(backends)}")
+    print(f"{'press':<12}" + "".join(f"{b:>14}" for b in backends) + f"{'parity':>10}")
+
+    jobs = []
+    for spec, htmls in pages.items():
+        row = f"{spec.key:<12}"
+        outputs = {}
+        for backend in backends:
+            t0 = time.perf_counter()
+            for _ in range(args.repeat):
+                for html in htmls:
+                    extract_article(spec, html, backend=backend)
+            per_page_ms = (time.perf_counter() - t0) * 1000 / (args.repeat * len(htmls))
+            outputs[backend] = [extract_article(spec, html, backend=backend) for html in htmls]
+            row += f"{per_page_ms:>11.3f} ms"
+        parity = all(outputs[b] == outputs["bs4"] for b in backends)
+        print(row + f"{str(parity):>10}")
+        jobs.extend((spec.name, html) for html in htmls)
+
+    # 크롤 1회 분량을 흉내내어 직렬 vs 프로세스 풀 처리량 비교 (기본 백엔드 사용)
+    jobs = jobs * args.repeat
+    t0 = time.perf_counter()
+    for name, html in jobs:
+        extract_fields(name, html)
+    t_inline = time.perf_counter() - t0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(extract_fields, *zip(*jobs[:args.workers])))  # 워커 기동/임포트는 제외
+        t0 = time.perf_counter()
+        list(pool.map(extract_fields, *zip(*jobs), chunksize=16))
+        t_pool = time.perf_counter() - t0
+
+    print(f"pages                       : {len(jobs)}")
+    print(f"inline                      : {len(jobs) / t_inline:10.1f} pages/s")
+    print(f"process pool (x{args.workers:<2})          : {len(jobs) / t_pool:10.1f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
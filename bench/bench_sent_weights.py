@@ -0,0 +1,87 @@
+"""
+문장 가중치 일치 + 처리 시간 벤치마크 (기사마다 TfidfVectorizer fit vs 묶음 해싱 계산)
+
+1) 같은 기사 묶음에 대해 sent_weights_tfidf_in_doc(기존) / sent_weights_tfidf_batch 가중치의
+   최대 절대 오차를 출력 (--tol 을 넘으면 exit 1)
+2) 묶음(--batch, 임베딩 단계 batch_size와 같은 64) 단위로 두 방식의 시간을 잽니다
+
+기사 코퍼스:
+    - --archive: 녹화 아카이브 응답 본문 (bench_text_cleaner와 같은 추출)
+    - 없으면 골든 입력 문장을 섞어 만든 기사 --docs 개
+
+실행 (프로젝트 루트):
+    python -m bench.bench_sent_weights --archive data/crawl_archive.jsonl.gz
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from bench.bench_text_cleaner import load_archive_bodies, load_golden
+from labeler.create_embeddings import sent_weights_tfidf_batch, sent_weights_tfidf_in_doc, split_sentences_ko
+from util.text_cleaner import clean_article_text
+
+
+def build_docs(args):
+    if args.archive:
+        texts = [clean_article_text(t) for t in load_archive_bodies(args.archive)]
+    else:
+        rng = random.Random(7)
+        sents = [s for g in load_golden() for s in split_sentences_ko(g["expected"]) if s]
+        texts = [" ".join(rng.choice(sents) for _ in range(rng.randint(5, 45))) for _ in range(args.docs)]
+    docs = []
+    for text in texts:
+        sents = [s for s in split_sentences_ko(text) if s][:40]
+        if sents:
+            docs.append(sents)
+    return docs
+
+
+def per_doc(docs):
+    out = []
+    for sents in docs:
+        try:
+            out.append(sent_weights_tfidf_in_doc(sents, mode="sum"))
+        except ValueError:
+            # n-gram이 하나도 없는 기사 (기존 방식은 empty vocabulary 예외)
+            out.append(None)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--archive", default=None)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--tol", type=float, default=1e-4)
+    args = parser.parse_args()
+
+    docs = build_docs(args)
+    batches = [docs[i:i + args.batch] for i in range(0, len(docs), args.batch)]
+
+    t0 = time.perf_counter()
+    legacy = [w for b in batches for w in per_doc(b)]
+    legacy_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batched = [w for b in batches for w in sent_weights_tfidf_batch(b)]
+    batch_s = time.perf_counter() - t0
+
+    compared = [(a, b) for a, b in zip(legacy, batched) if a is not None]
+    max_err = max((float(np.abs(a - b).max()) for a, b in compared), default=0.0)
+
+    print(f"docs                      : {len(docs)} ({sum(len(d) for d in docs)} sentences)")
+    print(f"batches                   : {len(batches)} x {args.batch}")
+    print(f"per-doc tfidf             : {legacy_s * 1000:8.1f} ms")
+    print(f"batch hashing             : {batch_s * 1000:8.1f} ms")
+    print(f"speedup                   : {legacy_s / max(batch_s, 1e-9):8.2f}x")
+    print(f"skipped (empty vocab)     : {len(legacy) - len(compared)}")
+    print(f"max |w_doc - w_batch|     : {max_err:.2e} (tol {args.tol:.0e})")
+    if max_err > args.tol:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+clean_article_text 골든 비교 + 처리량(MB/s) 벤치마크
+
+1) bench/fixtures/text_cleaner_golden.jsonl 의 input → expected 가 글자 단위로 같은지 확인
+   (expected 는 단계별 구현(legacy_clean_article_text) 출력으로 만든 값)
+2) 기사 본문 코퍼스에서 legacy / 현재 구현의 MB/s 와 출력 일치 여부를 출력
+   - --archive: 녹화 아카이브(CRAWLER_RECORD_PATH) 응답을 언론사 규칙으로 파싱한 실제 본문
+   - 없으면 골든 입력을 --repeat 번 반복
+
+실행 (프로젝트 루트):
+    python -m bench.bench_text_cleaner --archive data/crawl_archive.jsonl.gz
+"""
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+from util.text_cleaner import clean_article_text
+
+GOLDEN = Path(__file__).resolve().parent / "fixtures" / "text_cleaner_golden.jsonl"
+
+# ---------- 비교 기준: 최적화 이전 단계별 구현 ----------
+_LEGACY_VIEW_TOKENS = ("크게보기", "작게보기", "기사보기", "더보기")
+_LEGACY_INLINE_PHOTO_PATTERNS = [
+    r'\((?:[^)]{0,80})?(?:사진|제공|출처|캡처)(?:[^)]{0,80})?\)',
+    r'\[(?:[^\]]{0,80})?(?:사진|제공|출처|캡처)(?:[^\]]{0,80})?\]',
+    r'【(?:[^】]{0,80})?(?:사진|제공|출처|캡처)(?:[^】]{0,80})?】',
+]
+_LEGACY_PHOTO_LINE_RE = re.compile(
+    r'(사진\s*(?:출처|제공)\s*[=:]\s*[^.。\n]+'
+    r'|사진\s*[=:]\s*[^.。\n]+'
+    r'|자료\s*사진'
+    r'|동아DB|동아일보DB'
+    r'|연합뉴스|뉴시스|로이터|AFP|AP|EPA'
+    r'|ⓒ\s*[^.。\n]+'
+    r'|출처\s*:\s*[^.。\n]+'
+    r'|제공\s*:\s*[^.。\n]+'
+    r'|캡처|캡처화면|화면캡처|유튜브\s*캡처)'
+)
+
+
+def legacy_clean_article_text(text: Optional[str]) -> str:
+    if not text:
+        return ""
+    s = text
+    for tok in _LEGACY_VIEW_TOKENS:
+        s = s.replace(tok, " ")
+    s = re.sub(r"<[^>]+>", " ", s)
+    for p in _LEGACY_INLINE_PHOTO_PATTERNS:
+        s = re.sub(p, " ", s)
+    s = re.sub(r"([가-힣])\n+([가-힣])", r"\1\2", s)
+    s = re.sub(r"[\r\n\t]+", " ", s)
+    s = re.sub(_LEGACY_PHOTO_LINE_RE, " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+
+def load_golden():
+    with open(GOLDEN, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_archive_bodies(archive_path: str):
+    """녹화 응답 → 언론사 규칙으로 추출한 title/content (clean_articles 입력과 같은 형태)"""
+    from crawler.parsers import extract_article
+    from crawler.press_specs import PRESS_SPECS
+    from crawler.replay import ResponseArchive
+
+    by_key = {spec.key: spec for spec in PRESS_SPECS.values()}
+    bodies = []
+    for url, record in ResponseArchive(archive_path).load().items():
+        host = url.split("/")[2]
+        spec = next((s for k, s in by_key.items() if k in host), None)
+        if spec is None:
+            continue
+        fields = extract_article(spec, record["body"])
+        for raw in (fields["article_title"], fields["article_content"]):
+            if isinstance(raw, list):
+                raw = " ".join(str(x) for x in raw if x)
+            if raw:
+                bodies.append(str(raw))
+    return bodies
+
+
+def throughput(fn, corpus, mb):
+    t0 = time.perf_counter()
+    for text in corpus:
+        fn(text)
+    return mb / max(time.perf_counter() - t0, 1e-9)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--archive", default=None)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    golden = load_golden()
+    mismatches = [g for g in golden if clean_article_text(g["input"]) != g["expected"]]
+    print(f"golden cases              : {len(golden)}")
+    print(f"golden mismatches         : {len(mismatches)}")
+    for g in mismatches[:3]:
+        print(f"  input   : {g['input'][:80]!r}")
+        print(f"  expected: {g['expected'][:80]!r}")
+        print(f"  actual  : {clean_article_text(g['input'])[:80]!r}")
+
+    if args.archive:
+        corpus = load_archive_bodies(args.archive)
+    else:
+        corpus = [g["input"] for g in golden] * args.repeat
+    mb = sum(len(t.encode("utf-8")) for t in corpus) / 1e6
+
+    identical = all(legacy_clean_article_text(t) == clean_article_text(t) for t in corpus)
+    legacy_mbps = throughput(legacy_clean_article_text, corpus, mb)
+    current_mbps = throughput(clean_article_text, corpus, mb)
+
+    print(f"corpus                    : {len(corpus)} texts, {mb:.2f} MB")
+    print(f"legacy                    : {legacy_mbps:8.1f} MB/s")
+    print(f"current                   : {current_mbps:8.1f} MB/s")
+    print(f"speedup                   : {current_mbps / max(legacy_mbps, 1e-9):8.2f}x")
+    print(f"identical output          : {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+벡터 저장 방식 recall / 크기 벤치마크 (util.vector_store)
+
+기준: float32 전수 비교 top-k. 비교 대상:
+    - int8     : ES int8_hnsw 와 같은 방식의 스칼라 양자화 (분위수 구간 → 0..127, 7bit)
+    - int8+rr  : int8 상위 k x oversample 후보를 float 사본으로 재정렬 (util.vector_store.rerank)
+    - byte     : element_type byte (round(v * 127)) — 쿼리도 같이 양자화해야 하는 방식
+그래프(HNSW) 탐색 오차는 빼고 양자화 오차만 봅니다. --live 면 ES 두 인덱스 kNN 결과 겹침도 잽니다.
+
+벡터:
+    - --ann-dir: 연관 기사 사이드카 인덱스(labeler.ann_index) 파일 (기본 data/ann)
+    - 없으면 군집 형태의 합성 벡터 --docs 개 (실제 분포와 다르니 참고용)
+
+실행 (프로젝트 루트):
+    python -m bench.bench_vector_recall --ann-dir data/ann
+    python -m bench.bench_vector_recall --live article_data article_data_202610181200
+"""
+import argparse
+import base64
+import json
+import sys
+import time
+
+import numpy as np
+
+DIM = 768
+
+
+def load_vectors(args) -> np.ndarray:
+    from labeler.ann_index import AnnIndex
+
+    index = AnnIndex.load(args.ann_dir)
+    if index.alive_count:
+        rows = np.flatnonzero(index.alive[:index.count])
+        return np.asarray(index._vectors[rows], dtype=np.float32)[:args.docs]
+
+    print(f"no ann index at {args.ann_dir}, using synthetic clustered vectors")
+    rng = np.random.default_rng(args.seed)
+    centers = rng.normal(size=(max(args.docs // 50, 1), DIM))
+    vecs = centers[rng.integers(0, len(centers), args.docs)] + 0.6 * rng.normal(size=(args.docs, DIM))
+    return (vecs / np.linalg.norm(vecs, axis=1, keepdims=True)).astype(np.float32)
+
+
+def quantize_int8(vecs: np.ndarray) -> np.ndarray:
+    """Lucene scalar quantization 근사: 신뢰구간 1 - 1/(dims+1) 분위수로 자르고 7bit 로 양자화 → 복원 값"""
+    conf = 1 - 1 / (vecs.shape[1] + 1)
+    lo, hi = np.quantile(vecs, [(1 - conf) / 2, 1 - (1 - conf) / 2])
+    scale = 127.0 / (hi - lo)
+    q = np.round((np.clip(vecs, lo, hi) - lo) * scale)
+    return (q / scale + lo).astype(np.float32)
+
+
+def quantize_byte(vecs: np.ndarray) -> np.ndarray:
+    return (np.clip(np.round(vecs * 127), -128, 127) / 127).astype(np.float32)
+
+
+def topk(base: np.ndarray, queries: np.ndarray, k: int, self_rows: np.ndarray) -> np.ndarray:
+    sims = queries @ base.T
+    sims[np.arange(len(queries)), self_rows] = -np.inf  # 자기 자신 제외
+    part = np.argpartition(-sims, k, axis=1)[:, :k]
+    order = np.take_along_axis(sims, part, axis=1).argsort(axis=1)[:, ::-1]
+    return np.take_along_axis(part, order, axis=1)
+
+
+def recall(truth: np.ndarray, found: np.ndarray) -> float:
+    k = truth.shape[1]
+    return float(np.mean([len(set(t) & set(f[:k])) / k for t, f in zip(truth, found)]))
+
+
+def rerank_rows(vecs: np.ndarray, queries: np.ndarray, cand: np.ndarray, k: int) -> np.ndarray:
+    exact = np.einsum("qd,qcd->qc", queries, vecs[cand])
+    order = exact.argsort(axis=1)[:, ::-1][:, :k]
+    return np.take_along_axis(cand, order, axis=1)
+
+
+def live_overlap(src: str, dst: str, vecs: np.ndarray, k: int, num_candidates: int) -> float:
+    from util.elastic import es
+
+    scores = []
+    for q in vecs:
+        ids = []
+        for index in (src, dst):
+            res = es.search(
+                index=index,
+                size=k,
+                knn={"field": "article_embedding", "query_vector": q.tolist(), "k": k, "num_candidates": num_candidates},
+                _source=False,
+            )
+            ids.append({h["_id"] for h in res["hits"]["hits"]})
+        scores.append(len(ids[0] & ids[1]) / k)
+    return float(np.mean(scores))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ann-dir", default="data/ann")
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--oversample", type=int, nargs="+", default=[2, 3])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-recall", type=float, default=0.95, help="int8+rerank(최대 oversample) 기준")
+    parser.add_argument("--live", nargs=2, metavar=("FLOAT_INDEX", "INT8_INDEX"), default=None)
+    parser.add_argument("--num-candidates", type=int, default=200)
+    args = parser.parse_args()
+
+    vecs = load_vectors(args)
+    rng = np.random.default_rng(args.seed)
+    q_rows = rng.choice(len(vecs), size=min(args.queries, len(vecs)), replace=False)
+    queries = vecs[q_rows]
+    k = args.k
+
+    t0 = time.perf_counter()
+    truth = topk(vecs, queries, k, q_rows)
+    float_ms = (time.perf_counter() - t0) * 1000
+
+    int8 = quantize_int8(vecs)
+    byte = quantize_byte(vecs)
+    results = {
+        "int8": recall(truth, topk(int8, queries, k, q_rows)),
+        "byte": recall(truth, topk(byte, quantize_byte(queries), k, q_rows)),
+    }
+    for over in args.oversample:
+        cand = topk(int8, queries, k * over, q_rows)
+        results[f"int8+rr x{over}"] = recall(truth, rerank_rows(vecs, queries, cand, k))
+
+    # 저장 크기 (벡터 1개)
+    sample = vecs[0]
+    json_bytes = len(json.dumps([float(x) for x in sample]))
+    b64_bytes = len(base64.b64encode(sample.astype("<f4").tobytes()))
+
+    print(f"vectors / queries / k       : {len(vecs)} / {len(queries)} / {k}")
+    print(f"float exact top-k           : {float_ms:8.1f} ms")
+    for name, value in results.items():
+        print(f"recall@{k:<3} {name:<16} : {value:.4f}")
+    print(f"_source json float list     : {json_bytes:6d} bytes/vector (기존 응답/디스크)")
+    print(f"vector_store base64 float32 : {b64_bytes:6d} bytes/vector")
+    print(f"hnsw 메모리 float32/int8/byte: {DIM * 4} / {DIM + 4} / {DIM} bytes/vector")
+
+    if args.live:
+        overlap = live_overlap(args.live[0], args.live[1], queries[:100], k, args.num_candidates)
+        print(f"live kNN overlap@{k} {args.live[0]} vs {args.live[1]}: {overlap:.4f}")
+
+    best = results[f"int8+rr x{max(args.oversample)}"] if args.oversample else results["int8"]
+    if best < args.min_recall:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
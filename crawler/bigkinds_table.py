@@ -0,0 +1,68 @@
+import json
+from typing import Any, Dict, List
+
+# BigKinds 미리보기 테이블 컬럼 번호 (td id = "{컬럼}-{행번호}")
+COLUMNS = {
+    "article_id": 0,
+    "upload_date": 1,
+    "press": 2,
+    "reporter": 3,
+    "person": 11,
+    "org": 13,
+    "keywords": 14,
+    "features": 15,
+    "url": 17,
+}
+
+PREVIEW_ROWS_SELECTOR = "#preview-wrap > table > tbody > tr"
+
+# 브라우저 안에서 테이블 전체를 JSON 문자열 하나로 직렬화합니다
+# (행마다 find_element 9번 → WebDriver 왕복 1번)
+PREVIEW_TABLE_JS = """
+const columns = arguments[0];
+const rows = document.querySelectorAll(arguments[1]);
+const out = [];
+for (const tr of rows) {
+    const parts = (tr.id || "").split("-");
+    if (parts.length < 2) continue;
+    const rowNo = parts[1];
+    const row = {};
+    for (const [name, col] of Object.entries(columns)) {
+        const td = document.getElementById(col + "-" + rowNo);
+        row[name] = td ? (td.innerText || "").trim() : "";
+    }
+    out.push(row);
+}
+return JSON.stringify(out);
+"""
+
+
+def _split_csv(raw: str) -> List[str]:
+    return [k.strip() for k in (raw or "").split(",") if k.strip()]
+
+
+def parse_preview_table(raw_json: str, collected_at: str) -> List[Dict[str, Any]]:
+    """PREVIEW_TABLE_JS 결과(JSON 문자열)를 article_data 1차 적재 문서 리스트로 변환합니다"""
+    results = []
+    for row in json.loads(raw_json or "[]"):
+        results.append({
+            "press": row["press"],
+            "article_id": row["article_id"],
+            "upload_date": row["upload_date"],
+            "reporter": row["reporter"],
+            "keywords": _split_csv(row["keywords"]),
+            "features": _split_csv(row["features"]),
+            "url": row["url"],
+            "collected_at": collected_at,
+            "entities": {
+                "org": _split_csv(row["org"]),
+                "person": _split_csv(row["person"])
+            }
+        })
+    return results
+
+
+def read_preview_table(driver, collected_at: str) -> List[Dict[str, Any]]:
+    """현재 페이지의 BigKinds 미리보기 테이블을 execute_script 1번으로 읽어옵니다"""
+    raw_json = driver.execute_script(PREVIEW_TABLE_JS, COLUMNS, PREVIEW_ROWS_SELECTOR)
+    return parse_preview_table(raw_json, collected_at)
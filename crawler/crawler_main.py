@@ -4,283 +4,358 @@ from datetime import datetime, timedelta, timezone
 import traceback
 
 from wordcloud.wordCloudMaker import make_wordcloud_data
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.support import expected_conditions as EC
 
 from score.trust.trust_pipline import run_trust_pipeline
 
-from crawler.kbs_crawler import kbs_crawl
-from crawler.donga_crawler import donga_crawl
-from crawler.chosun_crawler import chosun_crawl
-from crawler.kmib_crawler import kmib_crawl
-from crawler.hani_crawler import hani_crawl
-from crawler.naeil_crawl import naeil_crawl
-from crawler.everyday_crawler import everyday_crawl
-from crawler.hankookilbo_crawler import hankookilbo_crawl
+from crawler.bigkinds_table import PREVIEW_ROWS_SELECTOR, read_preview_table
+from crawler.engine import CrawlSession
+from crawler.press_specs import PRESS_SPECS
 
 from util.cleaner import clean_articles
 from util.elastic import es
+from elasticsearch import helpers
 from util.logger import Logger
 from util.elastic_templates import build_error_doc, build_info_docs
 from util.repository import upsert_article
+from util.stream_pipeline import StreamingPipeline, StreamStage
+from util.waits import WaitRecorder
+from util.webdriver_pool import webdriver_pool
 
 from labeler.create_embeddings import create_embedding
+from labeler.embedding_cache import log_cache_stats
 from labeler.categorizer import categorizer
 
 logger = Logger().get_logger(__name__)
 KST = timezone(timedelta(hours=9))
 
 
-def crawl_bigkinds_full():  # 이건 그냥 셀레니움하기위한 셋업
-    now_kst = datetime.now(KST).isoformat(timespec="seconds")
-    run_id = now_kst[:13].replace("-", "").replace("T", "_")  # 예: 20260107_14
-    job_id = "crawl_bigkinds_full"
-    t_job0 = time.monotonic()
+def _scrape_bigkinds_press(driver, press_name, now_kst, run_id, job_id, big_error_list):
+    """
+    BigKinds에서 언론사 1곳의 미리보기 테이블을 긁어 article_data에 1차 적재합니다
+    - Selenium(동기) 작업이라 이벤트 루프 밖의 스레드에서 실행됩니다
+    - 진행 불가한 실패면 None 반환
+    - 페이지 대기는 고정 sleep 대신 DOM 조건 대기이며, 실제 대기 시간은 info_logs에 남깁니다
+    """
+    waits = WaitRecorder()
+    try:
+        return _scrape_bigkinds_press_steps(
+            driver, press_name, now_kst, run_id, job_id, big_error_list, waits
+        )
+    finally:
+        es.index(
+            index="info_logs",
+            document=build_info_docs(
+                run_id=run_id,
+                job_id=job_id,
+                component="crawler",
+                stage=f"{press_name}_bigkinds_waits_end",
+                status="warn" if waits.timed_out() else "ok",
+                duration_ms=waits.total_ms(),
+                message=waits.summary(prefix=press_name)
+            )
+        )
 
-    print(f"[{now_kst}] 빅카인즈 전체 크롤링 시작")
 
-    options = webdriver.ChromeOptions()
-    options.add_argument("--start-maximized")
-    # options.add_argument("--headless")
+def _scrape_bigkinds_press_steps(driver, press_name, now_kst, run_id, job_id, big_error_list, waits):
+    print(f"==== {press_name} 크롤링 시작 ====")
+    driver.get("https://www.bigkinds.or.kr/v2/news/index.do")
+    waits.wait(driver, EC.presence_of_element_located((By.ID, press_name)), "page_ready")
+
+    # 1) 언론사 선택 기능
+    try:
+        checkbox = driver.find_element(By.ID, press_name)
+        driver.execute_script("arguments[0].click();", checkbox)
+    except Exception as e:
+        big_error_list.append({
+            "error_type": type(e).__name__,
+            "error_message": f"{press_name} : {str(e)}"
+        })
+        # ✅ info_logs: press selection 실패도 stage summary로 남김
+        es.index(
+            index="info_logs",
+            document=build_info_docs(
+                run_id=run_id,
+                job_id=job_id,
+                component="crawler",
+                stage=f"{press_name}_select_end",
+                status="error",
+                duration_ms=None,
+                input_cnt=0,
+                success_cnt=0,
+                failed_cnt=1,
+                message=f"{press_name} press checkbox select failed",
+                error_message=str(e),
+                retryable=True
+            )
+        )
+        return None
+    waits.wait(driver, EC.element_located_to_be_selected((By.ID, press_name)), "press_selected", timeout=5)
+
+    # 3) 검색 클릭 기능
+    try:
+        search_btn = driver.find_element(
+            By.CSS_SELECTOR,
+            "#search-foot-div > div.foot-btn > button.btn.btn-search.news-search-btn.news-report-search-btn"
+        )
+        driver.execute_script("arguments[0].click();", search_btn)
+    except Exception as e:
+        big_error_list.append({
+            "error_type": type(e).__name__,
+            "error_message": f"{press_name} : {str(e)}"
+        })
+        # 검색 실패는 press 단위로 계속 진행 가능하니 warning으로 남김
+        es.index(
+            index="info_logs",
+            document=build_info_docs(
+                run_id=run_id,
+                job_id=job_id,
+                component="crawler",
+                stage=f"{press_name}_search_click_end",
+                status="warn",
+                duration_ms=None,
+                input_cnt=0,
+                success_cnt=0,
+                failed_cnt=1,
+                message=f"{press_name} search click failed",
+                error_message=str(e),
+                retryable=True
+            )
+        )
+        pass
+    waits.wait(driver, EC.element_to_be_clickable((By.CSS_SELECTOR, "button.step-3-click")), "search_done")
+
+    # 5) 뉴스분석 클릭 기능
+    try:
+        analysis_btn = driver.find_element(By.CSS_SELECTOR, "button.step-3-click")
+        driver.execute_script("arguments[0].click();", analysis_btn)
+    except Exception as e:
+        big_error_list.append({
+            "error_type": type(e).__name__,
+            "error_message": f"{press_name} : {str(e)}"
+        })
+        # ✅ 분석 버튼 실패는 press 단위 진행 불가 → error
+        es.index(
+            index="info_logs",
+            document=build_info_docs(
+                run_id=run_id,
+                job_id=job_id,
+                component="crawler",
+                stage=f"{press_name}_analysis_click_end",
+                status="error",
+                duration_ms=None,
+                input_cnt=0,
+                success_cnt=0,
+                failed_cnt=1,
+                message=f"{press_name} analysis click failed",
+                error_message=str(e),
+                retryable=True
+            )
+        )
+        return None
+
+    waits.wait(
+        driver,
+        EC.presence_of_element_located((By.CSS_SELECTOR, PREVIEW_ROWS_SELECTOR)),
+        "preview_table_ready",
+        timeout=30,
+    )
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    # ✅ BigKinds table parse 단계 타이머(press 단위)
+    t_press_table0 = time.monotonic()
+
+    # 6) 테이블 전체를 브라우저에서 JSON으로 한 번에 가져오기
+    press_results = read_preview_table(driver, now_kst)
+    parsed_cnt = len(press_results)
+
+    # 7) 이미 수집된 기사(status>=2)는 건너뛰고 새 기사만 1차 적재/상세 크롤링 대상으로
+    new_results = _filter_new_articles(press_results)
+    skipped_cnt = parsed_cnt - len(new_results)
+
+    # BigKinds 1차 ES 적재 (새 기사만, bulk 1번)
+    if new_results:
+        helpers.bulk(
+            es,
+            (
+                {"_op_type": "index", "_index": "article_data", "_id": data["article_id"], "_source": data}
+                for data in new_results
+            ),
+            chunk_size=500,
+            request_timeout=120,
+        )
 
-    press_list = ["동아일보", "KBS", "한겨레", "조선일보", "국민일보", "내일신문", "매일신문", "한국일보"]
-    all_results = []
-    big_error_list = []
+    # ✅ press 단위: BigKinds 테이블 파싱/1차 적재 완료 요약
+    es.index(
+        index="info_logs",
+        document=build_info_docs(
+            run_id=run_id,
+            job_id=job_id,
+            component="crawler",
+            stage=f"{press_name}_bigkinds_table_end",
+            status="ok",
+            duration_ms=int((time.monotonic() - t_press_table0) * 1000),
+            input_cnt=parsed_cnt,
+            success_cnt=len(new_results),
+            failed_cnt=0,
+            message=f"{press_name} parsed {parsed_cnt} rows, new={len(new_results)} skipped(already collected)={skipped_cnt}"
+        )
+    )
+    return press_results, new_results
 
-    success_list = []
 
-    for press_name in press_list:
-        print(f"==== {press_name} 크롤링 시작 ====")
-        press_results = []
-        driver.get("https://www.bigkinds.or.kr/v2/news/index.do")
-        time.sleep(2)
+# 이 status 이상이면 이미 임베딩까지 끝난 기사로 보고 다시 처리하지 않습니다
+COLLECTED_STATUS = 2
 
-        # 1) 언론사 선택 기능
-        try:
-            checkbox = driver.find_element(By.ID, press_name)
-            driver.execute_script("arguments[0].click();", checkbox)
-        except Exception as e:
-            big_error_list.append({
-                "error_type": type(e).__name__,
-                "error_message": f"{press_name} : {str(e)}"
-            })
-            # ✅ info_logs: press selection 실패도 stage summary로 남김
-            es.index(
-                index="info_logs",
-                document=build_info_docs(
-                    run_id=run_id,
-                    job_id=job_id,
-                    component="crawler",
-                    stage=f"{press_name}_select_end",
-                    status="error",
-                    duration_ms=None,
-                    input_cnt=0,
-                    success_cnt=0,
-                    failed_cnt=1,
-                    message=f"{press_name} press checkbox select failed",
-                    error_message=str(e),
-                    retryable=True
-                )
-            )
-            continue
-        time.sleep(1)
 
-        # 3) 검색 클릭 기능
-        try:
-            search_btn = driver.find_element(
-                By.CSS_SELECTOR,
-                "#search-foot-div > div.foot-btn > button.btn.btn-search.news-search-btn.news-report-search-btn"
-            )
-            driver.execute_script("arguments[0].click();", search_btn)
-        except Exception as e:
-            big_error_list.append({
-                "error_type": type(e).__name__,
-                "error_message": f"{press_name} : {str(e)}"
-            })
-            # 검색 실패는 press 단위로 계속 진행 가능하니 warning으로 남김
-            es.index(
-                index="info_logs",
-                document=build_info_docs(
-                    run_id=run_id,
-                    job_id=job_id,
-                    component="crawler",
-                    stage=f"{press_name}_search_click_end",
-                    status="warn",
-                    duration_ms=None,
-                    input_cnt=0,
-                    success_cnt=0,
-                    failed_cnt=1,
-                    message=f"{press_name} search click failed",
-                    error_message=str(e),
-                    retryable=True
-                )
-            )
-            pass
-        time.sleep(3)
+def _filter_new_articles(rows):
+    """
+    press 배치의 article_id를 mget 1번으로 조회해서
+    article_data에 없거나 status < COLLECTED_STATUS 인 기사만 남깁니다
+    """
+    if not rows:
+        return []
 
-        # 5) 뉴스분석 클릭 기능
-        try:
-            analysis_btn = driver.find_element(By.CSS_SELECTOR, "button.step-3-click")
-            driver.execute_script("arguments[0].click();", analysis_btn)
-        except Exception as e:
-            big_error_list.append({
-                "error_type": type(e).__name__,
-                "error_message": f"{press_name} : {str(e)}"
-            })
-            # ✅ 분석 버튼 실패는 press 단위 진행 불가 → error
-            es.index(
-                index="info_logs",
-                document=build_info_docs(
-                    run_id=run_id,
-                    job_id=job_id,
-                    component="crawler",
-                    stage=f"{press_name}_analysis_click_end",
-                    status="error",
-                    duration_ms=None,
-                    input_cnt=0,
-                    success_cnt=0,
-                    failed_cnt=1,
-                    message=f"{press_name} analysis click failed",
-                    error_message=str(e),
-                    retryable=True
-                )
-            )
+    ids = list({data["article_id"] for data in rows})
+    resp = es.mget(index="article_data", ids=ids, _source=["status"])
+
+    collected = set()
+    for d in resp["docs"]:
+        if not d.get("found"):
             continue
+        try:
+            status = int((d.get("_source") or {}).get("status") or 0)
+        except (TypeError, ValueError):
+            status = 0
+        if status >= COLLECTED_STATUS:
+            collected.add(d["_id"])
 
-        time.sleep(4)
-
-        # 6) 테이블 rows 가져오기
-        rows = driver.find_elements(By.CSS_SELECTOR, "#preview-wrap > table > tbody > tr")
-
-        # ✅ BigKinds table parse 단계 타이머(press 단위)
-        t_press_table0 = time.monotonic()
-        parsed_cnt = 0
-
-        for row in rows:
-            row_id = row.get_attribute("id")
-            row_no = row_id.split('-')[1]
-
-            keywords_raw = driver.find_element(By.CSS_SELECTOR, f'td[id="14-{row_no}"]').text
-            feature_raw = driver.find_element(By.CSS_SELECTOR, f'td[id="15-{row_no}"]').text
-
-            org_raw = driver.find_element(By.CSS_SELECTOR, f'td[id="13-{row_no}"]').text
-            person_raw = driver.find_element(By.CSS_SELECTOR, f'td[id="11-{row_no}"]').text
-
-            keywords = [k.strip() for k in keywords_raw.split(",") if k.strip()]
-            features = [f.strip() for f in feature_raw.split(",") if f.strip()]
-
-            org = [k.strip() for k in org_raw.split(",") if k.strip()]
-            person = [k.strip() for k in person_raw.split(",") if k.strip()]
-
-            data = {
-                "press": driver.find_element(By.CSS_SELECTOR, f'td[id="2-{row_no}"]').text,
-                "article_id": driver.find_element(By.CSS_SELECTOR, f'td[id="0-{row_no}"]').text,
-                "upload_date": driver.find_element(By.CSS_SELECTOR, f'td[id="1-{row_no}"]').text,
-                "reporter": driver.find_element(By.CSS_SELECTOR, f'td[id="3-{row_no}"]').text,
-                "keywords": keywords,
-                "features": features,
-                "url": driver.find_element(By.CSS_SELECTOR, f'td[id="17-{row_no}"]').text,
-                "collected_at": now_kst,
-                "entities": {
-                    "org": org,
-                    "person": person
-                }
-            }
-
-            all_results.append(data)
-            press_results.append(data)
-            parsed_cnt += 1
-
-            # BigKinds 1차 ES 적재(덮어쓰기)
-            es.index(
-                index="article_data",
-                document=data,
-                id=data['article_id']
-            )
+    return [data for data in rows if data["article_id"] not in collected]
+
+
+async def _run_press_crawl(session, press_name, press_results, run_id, job_id, on_article=None):
+    """언론사별 원문 크롤링 1건을 실행하고 stage summary를 남깁니다 (실패해도 빈 리스트 반환)"""
+    t_press_crawl0 = time.monotonic()
+    try:
+        spec = PRESS_SPECS.get(press_name)
+        result = await session.crawl(spec, press_results, on_article=on_article) if spec else []
+        result = result or []
 
-        # ✅ press 단위: BigKinds 테이블 파싱/1차 적재 완료 요약
         es.index(
             index="info_logs",
             document=build_info_docs(
                 run_id=run_id,
                 job_id=job_id,
                 component="crawler",
-                stage=f"{press_name}_bigkinds_table_end",
+                stage=f"{press_name}_crawl_end",
                 status="ok",
-                duration_ms=int((time.monotonic() - t_press_table0) * 1000),
-                input_cnt=parsed_cnt,
-                success_cnt=parsed_cnt,
-                failed_cnt=0,
-                message=f"{press_name} parsed {parsed_cnt} rows and indexed to article_data"
+                duration_ms=int((time.monotonic() - t_press_crawl0) * 1000),
+                input_cnt=len(press_results),
+                success_cnt=len(result),
+                failed_cnt=max(0, len(press_results) - len(result)),
+                message=f"{press_name} crawler finished"
             )
         )
+        return result
 
-        # ✅ press 단위: 언론사별 원문 크롤러 호출
-        try:
-            t_press_crawl0 = time.monotonic()
-
-            if press_name == "동아일보":
-                result = asyncio.run(donga_crawl(press_results))
-            elif press_name == "KBS":
-                result = asyncio.run(kbs_crawl(press_results))
-            elif press_name == "한겨레":
-                result = asyncio.run(hani_crawl(press_results))
-            elif press_name == "조선일보":
-                result = asyncio.run(chosun_crawl(press_results))
-            elif press_name == "국민일보":
-                result = asyncio.run(kmib_crawl(press_results))
-            elif press_name == "내일신문":
-                result = asyncio.run(naeil_crawl(press_results))
-            elif press_name == "매일신문":
-                result = asyncio.run(everyday_crawl(press_results))
-            elif press_name == "한국일보":
-                result = asyncio.run(hankookilbo_crawl(press_results))
-            else:
-                result = []
-
-            result = result or []
-            success_list.extend(result)
+    except Exception as e:
 
-            es.index(
-                index="info_logs",
-                document=build_info_docs(
-                    run_id=run_id,
-                    job_id=job_id,
-                    component="crawler",
-                    stage=f"{press_name}_crawl_end",
-                    status="ok",
-                    duration_ms=int((time.monotonic() - t_press_crawl0) * 1000),
-                    input_cnt=len(press_results),
-                    success_cnt=len(result),
-                    failed_cnt=max(0, len(press_results) - len(result)),
-                    message=f"{press_name} crawler finished"
-                )
+        # 기존 error_log 유지
+        es.index(
+            index="error_log",
+            document=build_error_doc(
+                message=f"{press_name} 크롤러 호출 실패",
+                service_name="crawler",
+                service_environment="dev",
+                pipeline_job="crawl_bigkinds_full",
+                pipeline_step=f"{press_name}_crawl",
+                event_severity=3,
+                exception=e,
+                samples=[{
+                    "press": press_name,
+                    "traceback": traceback.format_exc()
+                }],
+                tags=["crawler", "bigkinds", press_name]
             )
+        )
+        return []
+
+
+def _build_stream_stages():
+    """
+    원문 적재 이후 단계들입니다. batch_size는 각 단계가 한 번에 처리하기 좋은 크기
+    - 임베딩은 모델 배치 크기, 신뢰도는 run_trust_pipeline의 bulk 크기에 맞춤
+    - 모든 단계가 article_data/article_raw를 mget(실시간)으로 읽으므로 단계 사이 refresh 대기가 없습니다
+    """
+    return [
+        StreamStage("clean_articles", "preprocess", clean_articles, batch_size=200, max_wait=1.0),
+        StreamStage("create_embedding", "embedding", create_embedding, batch_size=64, max_wait=2.0),
+        StreamStage("categorizer", "categorizer", categorizer, batch_size=256, max_wait=1.0),
+        StreamStage("trust_pipeline", "trust", run_trust_pipeline, batch_size=100, max_wait=1.0),
+        StreamStage("upsert_article", "db", upsert_article, batch_size=500, max_wait=2.0),
+    ]
+
+
+async def _collect_bigkinds(driver, press_list, now_kst, run_id, job_id, big_error_list):
+    """
+    BigKinds 테이블 수집(Selenium, 스레드)과 언론사별 상세 크롤링(asyncio task)을 겹쳐서 실행합니다
+    - 한 언론사 테이블이 끝나면 바로 상세 크롤링 task를 띄우고, Selenium은 다음 언론사로 넘어갑니다
+    - 상세 크롤링은 언론사(host)별 limiter로 각자 제한되므로 전체 시간은 가장 느린 언론사 수준이 됩니다
+    - 전 언론사가 CrawlSession의 HTTP/2 클라이언트 하나를 공유합니다
+    - 이미 수집된 기사는 상세 크롤링에서 빠집니다 (all_results=테이블 전체, new_results=새 기사)
+    - 원문이 적재된 기사는 바로 스트리밍 파이프라인(전처리 → 임베딩 → 카테고리 → 신뢰도 → DB)으로 흘러갑니다
+    """
+    all_results = []
+    new_results = []
+    tasks = []
+    success_list = []
 
-        except Exception as e:
-
-            # 기존 error_log 유지
-            es.index(
-                index="error_log",
-                document=build_error_doc(
-                    message=f"{press_name} 크롤러 호출 실패",
-                    service_name="crawler",
-                    service_environment="dev",
-                    pipeline_job="crawl_bigkinds_full",
-                    pipeline_step=f"{press_name}_crawl",
-                    event_severity=3,
-                    exception=e,
-                    samples=[{
-                        "press": press_name,
-                        "traceback": traceback.format_exc()
-                    }],
-                    tags=["crawler", "bigkinds", press_name]
-                )
+    pipeline = StreamingPipeline(_build_stream_stages(), run_id, job_id)
+    pipeline.start()
+
+    async with CrawlSession() as session:
+        for press_name in press_list:
+            scraped = await asyncio.to_thread(
+                _scrape_bigkinds_press, driver, press_name, now_kst, run_id, job_id, big_error_list
             )
+            if scraped is None:
+                continue
+
+            press_results, press_new = scraped
+            all_results.extend(press_results)
+            new_results.extend(press_new)
+            if not press_new:
+                continue
+
+            tasks.append(asyncio.create_task(
+                _run_press_crawl(session, press_name, press_new, run_id, job_id, on_article=pipeline.put)
+            ))
+
+        for result in await asyncio.gather(*tasks):
+            success_list.extend(result)
+
+    # 크롤링이 끝나도 파이프라인에 남은 기사는 끝까지 처리합니다
+    completed_ids = await pipeline.close()
+    return all_results, new_results, success_list, completed_ids
+
+
+def crawl_bigkinds_full():  # 이건 그냥 셀레니움하기위한 셋업
+    now_kst = datetime.now(KST).isoformat(timespec="seconds")
+    run_id = now_kst[:13].replace("-", "").replace("T", "_")  # 예: 20260107_14
+    job_id = "crawl_bigkinds_full"
+    t_job0 = time.monotonic()
+
+    print(f"[{now_kst}] 빅카인즈 전체 크롤링 시작")
+
+    press_list = list(PRESS_SPECS)
+    big_error_list = []
+
+    # 수집 + 전 언론사 상세 크롤링 + 후속 단계(스트리밍)를 하나의 이벤트 루프에서 실행합니다
+    # 브라우저는 공용 풀에서 빌려 쓰고 반납합니다 (headless, 실행 사이 재사용)
+    with webdriver_pool.lease() as driver:
+        all_results, new_results, success_list, completed_ids = asyncio.run(
+            _collect_bigkinds(driver, press_list, now_kst, run_id, job_id, big_error_list)
+        )
 
     es.index(
         index="info_logs",
@@ -288,17 +363,25 @@ def crawl_bigkinds_full():  # 이건 그냥 셀레니움하기위한 셋업
             run_id=run_id,
             job_id=job_id,
             component="crawler",
-            stage="bigkinds_collect_and_press_crawl_end",
+            stage="bigkinds_collect_and_stream_end",
             status="ok",
             duration_ms=int((time.monotonic() - t_job0) * 1000),
-            input_cnt=len(all_results),
+            input_cnt=len(new_results),
             success_cnt=len(success_list),
-            failed_cnt=max(0, len(all_results) - len(success_list)),
-            message=f"all press done. collected={len(all_results)} success={len(success_list)}"
+            failed_cnt=max(0, len(new_results) - len(success_list)),
+            message=(
+                f"all press done. collected={len(all_results)} new={len(new_results)} "
+                f"skipped={len(all_results) - len(new_results)} success={len(success_list)} "
+                f"stream_done={len(completed_ids)}"
+            )
         )
     )
 
-    driver.quit()
+    # 임베딩 캐시 hit/miss (스트리밍 임베딩 단계 누적)
+    try:
+        log_cache_stats(run_id, job_id)
+    except Exception:
+        logger.exception("embedding cache stats log failed")
 
     # 워드클라우드
     if all_results:
@@ -321,111 +404,12 @@ def crawl_bigkinds_full():  # 이건 그냥 셀레니움하기위한 셋업
             )
         )
 
-    id_list = [data["article_id"] for data in all_results]
+    # 이번 실행에서 새로 처리하는 기사 (이미 수집된 기사는 뒤 단계도 건너뜀)
+    id_list = [data["article_id"] for data in new_results]
 
     logger.info(f"[{now_kst}] 빅카인즈 전체 크롤링 완료. 총 {len(all_results)}개 기사 수집")
-    time.sleep(30)
-
-    print(len(success_list))
     logger.info(f"[{len(id_list)}] 개 기사 중 . 총 {len(id_list) - len(success_list)}개 결측치 발생")
-
-    # 전처리
-    logger.info("기사 본문 전처리 및 업데이트")
-    t0 = time.monotonic()
-    clean_articles(success_list)
-    es.index(
-        index="info_logs",
-        document=build_info_docs(
-            run_id=run_id,
-            job_id=job_id,
-            component="preprocess",
-            stage="clean_articles_end",
-            status="ok",
-            duration_ms=int((time.monotonic() - t0) * 1000),
-            input_cnt=len(success_list),
-            success_cnt=len(success_list),
-            failed_cnt=0,
-            message="clean_articles updated article_data"
-        )
-    )
-
-    logger.info("기사별 임베딩 생성")
-
-    if success_list:
-        # 임베딩
-        t0 = time.monotonic()
-        create_embedding(success_list)
-        es.index(
-            index="info_logs",
-            document=build_info_docs(
-                run_id=run_id,
-                job_id=job_id,
-                component="embedding",
-                stage="create_embedding_end",
-                status="ok",
-                duration_ms=int((time.monotonic() - t0) * 1000),
-                input_cnt=len(success_list),
-                success_cnt=len(success_list),
-                failed_cnt=0
-            )
-        )
-
-        # 카테고라이저
-        t0 = time.monotonic()
-        categorizer(success_list)
-        es.index(
-            index="info_logs",
-            document=build_info_docs(
-                run_id=run_id,
-                job_id=job_id,
-                component="categorizer",
-                stage="categorizer_end",
-                status="ok",
-                duration_ms=int((time.monotonic() - t0) * 1000),
-                input_cnt=len(success_list),
-                success_cnt=len(success_list),
-                failed_cnt=0
-            )
-        )
-
-        # 신뢰도
-        t0 = time.monotonic()
-        run_trust_pipeline(success_list)
-        es.index(
-            index="info_logs",
-            document=build_info_docs(
-                run_id=run_id,
-                job_id=job_id,
-                component="trust",
-                stage="trust_pipeline_end",
-                status="ok",
-                duration_ms=int((time.monotonic() - t0) * 1000),
-                input_cnt=len(success_list),
-                success_cnt=len(success_list),
-                failed_cnt=0
-            )
-        )
-
-        time.sleep(30)
-
-        # DB upsert
-        t0 = time.monotonic()
-        upsert_article(success_list)
-        es.index(
-            index="info_logs",
-            document=build_info_docs(
-                run_id=run_id,
-                job_id=job_id,
-                component="db",
-                stage="upsert_article_end",
-                status="ok",
-                duration_ms=int((time.monotonic() - t0) * 1000),
-                input_cnt=len(success_list),
-                success_cnt=len(success_list),
-                failed_cnt=0,
-                message="upserted to DB"
-            )
-        )
+    logger.info(f"스트리밍 파이프라인 완료: {len(completed_ids)}개 기사 DB 반영")
 
     # ✅ 세션 요약 stage summary
     es.index(
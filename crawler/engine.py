@@ -0,0 +1,333 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+from urllib.parse import urlparse, urlunparse
+
+import httpx
+
+from crawler.fetcher import HostLimiter, MAX_RETRIES, backoff_delay, fetch_with_retry
+from crawler.parsers import extract_article, extract_fields
+from crawler.press_specs import PressSpec
+from crawler.replay import ResponseArchive, replay_target
+from util.bulk_sink import AsyncBulkSink
+from util.elastic import es, get_async_es
+from util.elastic_templates import build_error_doc
+from util.logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+# 모든 언론사가 공유하는 기본 헤더 (언론사별 헤더는 PressSpec.headers로 덮어씀)
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+TIMEOUT = httpx.Timeout(connect=10.0, read=30.0, write=10.0, pool=10.0)
+
+# 한 실행 동안 keep-alive 연결을 재사용하도록 풀을 넉넉히 잡습니다
+LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0)
+
+# HTML 파싱(CPU)은 이벤트 루프 밖 프로세스 풀에서 처리합니다. 0이면 루프 안에서 바로 파싱
+PARSE_WORKERS = int(os.getenv("CRAWLER_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# 녹화/재생 (crawler/replay.py). 둘 다 비어 있으면 평소처럼 언론사 사이트에서 가져옵니다
+RECORD_PATH = os.getenv("CRAWLER_RECORD_PATH") or None
+REPLAY_URL = os.getenv("CRAWLER_REPLAY_URL") or None
+
+
+def force_https(url: str) -> str:
+    if not url:
+        return url
+
+    parsed = urlparse(url)
+
+    if parsed.scheme == "http":
+        parsed = parsed._replace(scheme="https")
+        return urlunparse(parsed)
+
+    if parsed.scheme == "" and url.startswith("//"):
+        return "https:" + url
+
+    return url
+
+
+def normalize_url(spec: PressSpec, url: str) -> str:
+    """PressSpec의 URL 재작성 규칙 적용 (KBS PC 버전 경로, 한겨레 https 강제 등)"""
+    for old, new in spec.url_rewrites:
+        if old in url:
+            url = url.replace(old, new)
+    if spec.force_https:
+        url = force_https(url)
+    return url
+
+
+class CrawlSession:
+    """
+    한 번의 수집 실행 동안 전 언론사가 공유하는 크롤링 자원입니다
+    - keep-alive HTTP/2 httpx 클라이언트 1개 (연결 수립 비용은 실행당 1번)
+    - playwright 브라우저 1개 (renderer="playwright" 언론사가 있을 때만 띄움)
+    - 언론사별 HostLimiter (PressSpec의 concurrency/rate/burst)
+    - 비동기 ES 클라이언트 1개 (기사별 쓰기는 AsyncBulkSink로 모아서 전송)
+    - HTML 파싱용 프로세스 풀 1개 (fetch는 루프, 파싱은 워커 프로세스 → 루프가 막히지 않음)
+    - record_path: 가져온 응답을 URL 키 아카이브에 녹화 / replay_url: 로컬 재생 서버에서 가져옴
+
+    사용법:
+        async with CrawlSession() as session:
+            success_ids = await session.crawl(PRESS_SPECS["KBS"], press_results)
+    """
+
+    def __init__(self, record_path: Optional[str] = RECORD_PATH, replay_url: Optional[str] = REPLAY_URL):
+        self.record_path = record_path
+        self.replay_url = replay_url
+        self._archive: Optional[ResponseArchive] = None
+        self.client: Optional[httpx.AsyncClient] = None
+        self.es_async = None
+        self._limiters: Dict[str, HostLimiter] = {}
+        self._playwright = None
+        self._browser = None
+        self._browser_context = None
+        self._browser_lock = asyncio.Lock()
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+
+    async def __aenter__(self) -> "CrawlSession":
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=TIMEOUT,
+            limits=LIMITS,
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+        )
+        self.es_async = get_async_es()
+        if PARSE_WORKERS > 0:
+            self._parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+        if self.record_path:
+            self._archive = ResponseArchive(self.record_path).open_for_write()
+        if self.replay_url:
+            logger.info(f"crawl replay mode: {self.replay_url}")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._browser_context is not None:
+            await self._browser_context.close()
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        await self.client.aclose()
+        await self.es_async.close()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True, cancel_futures=True)
+        if self._archive is not None:
+            logger.info(f"recorded {self._archive.recorded_cnt} responses: {self.record_path}")
+            self._archive.close()
+
+    def _limiter(self, spec: PressSpec) -> HostLimiter:
+        if spec.key not in self._limiters:
+            self._limiters[spec.key] = HostLimiter(
+                concurrency=spec.concurrency, rate=spec.rate, burst=spec.burst
+            )
+        return self._limiters[spec.key]
+
+    async def _get_browser_context(self):
+        async with self._browser_lock:
+            if self._browser_context is None:
+                from playwright.async_api import async_playwright
+
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                self._browser_context = await self._browser.new_context(
+                    user_agent=DEFAULT_HEADERS["User-Agent"],
+                    locale="ko-KR",
+                    viewport={"width": 1280, "height": 720},
+                )
+            return self._browser_context
+
+    async def _render(self, url: str, limiter: HostLimiter) -> str:
+        # 페이지 렌더링도 host 제한 + 지터 백오프 재시도를 거칩니다
+        context = await self._get_browser_context()
+        attempt = 0
+        while True:
+            try:
+                async with limiter.limit(url):
+                    page = await context.new_page()
+                    try:
+                        await page.goto(url, wait_until="domcontentloaded", timeout=25000)
+                        return await page.content()
+                    finally:
+                        await page.close()
+            except Exception:
+                if attempt >= MAX_RETRIES:
+                    raise
+            delay = backoff_delay(attempt)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def fetch_html(self, spec: PressSpec, url: str) -> Union[str, bytes]:
+        limiter = self._limiter(spec)
+        target = replay_target(self.replay_url, url) if self.replay_url else url
+        if spec.renderer == "playwright":
+            html = await self._render(target, limiter)
+            if self._archive is not None:
+                self._archive.add(url, 200, "text/html; charset=utf-8", html.encode("utf-8"))
+            return html
+        resp = await fetch_with_retry(self.client, target, limiter, headers=spec.headers or None)
+        if self._archive is not None:
+            self._archive.add(url, resp.status_code, resp.headers.get("content-type"), resp.content)
+        return resp.content
+
+    async def parse(self, spec: PressSpec, html: Union[str, bytes]) -> Dict[str, Any]:
+        """원본 바이트 → 추출 필드. 워커 프로세스로는 언론사명과 바이트만 넘깁니다"""
+        if self._parse_pool is None:
+            return extract_article(spec, html)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._parse_pool, extract_fields, spec.name, html)
+
+    async def crawl(
+        self,
+        spec: PressSpec,
+        bigkinds_data: List[Dict[str, Any]],
+        on_article: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> List[str]:
+        """
+        빅카인즈에서 받은 URL 리스트로 상세 기사를 크롤링합니다
+        - 성공: article_data 이미지 업데이트 + article_raw 인덱싱
+        - 결측: article_data 삭제
+        - ES 쓰기는 AsyncBulkSink로 모아서 보내고, 항목별 실패는 error_list에 합류
+        - 에러/결측: 마지막에 요약 로그 1건만 error_log에 적재
+        - on_article: article_raw 적재가 flush 된 기사마다 await on_article(article_id) (스트리밍 파이프라인)
+        """
+        now_kst_iso = datetime.now(KST).isoformat()
+        now_run_id = datetime.now(KST).strftime("%Y%m%d_%H")  # yyyymmdd_hh
+        print(f"{spec.name} 상세 크롤링 구동 시작: {now_run_id}")
+
+        id_list = [data["article_id"] for data in bigkinds_data]
+
+        error_list: List[Dict[str, Any]] = []
+        empty_articles: List[Dict[str, Any]] = []
+
+        async def handoff(meta: Dict[str, Any]) -> None:
+            if on_article is not None:
+                await on_article(meta["article_id"])
+
+        async def _crawl_one(sink: AsyncBulkSink, article_id: str, url: Optional[str], row_title: Optional[str]):
+            if not url:
+                error_list.append({
+                    "article_id": article_id,
+                    "error_url": url,
+                    "error_type": "EmptyURL",
+                    "error_message": "url is empty"
+                })
+                return
+
+            url = normalize_url(spec, url)
+
+            try:
+                html = await self.fetch_html(spec, url)
+                fields = await self.parse(spec, html)
+            except Exception as e:
+                error_list.append({
+                    "article_id": article_id,
+                    "error_url": url,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                })
+                return
+
+            article_title = fields["article_title"]
+            if not article_title and spec.title_fallback_to_row:
+                article_title = row_title
+            article_raw = {
+                "article_id": article_id,
+                "article_title": article_title,
+                "article_content": fields["article_content"],
+                "collected_at": now_kst_iso
+            }
+            meta = {"article_id": article_id, "error_url": url}
+
+            null_count = sum(1 for v in article_raw.values() if v in (None, "", []))
+            if null_count == 0:
+                await sink.add({
+                    "_op_type": "update",
+                    "_index": "article_data",
+                    "_id": article_id,
+                    "doc": {"article_img": fields["article_img"]},
+                }, error_list=error_list, meta=meta)
+                await sink.add({
+                    "_op_type": "index",
+                    "_index": "article_raw",
+                    "_id": article_id,
+                    "_source": article_raw,
+                }, error_list=error_list, meta=meta, on_success=handoff)
+            else:
+                empty_articles.append({
+                    "article_id": article_id,
+                    "reason": "null_fields_in_article_raw",
+                    "null_count": null_count
+                })
+                await sink.add({
+                    "_op_type": "delete",
+                    "_index": "article_data",
+                    "_id": article_id,
+                }, error_list=error_list, meta=meta)
+
+        # sink를 빠져나올 때 남은 쓰기가 모두 flush 되므로 이후 error_list는 확정 상태입니다
+        # 다음 단계(clean_articles)는 article_raw를 mget(실시간)으로 읽으므로 refresh 대기는 필요 없습니다
+        async with AsyncBulkSink(self.es_async) as sink:
+            await asyncio.gather(*[
+                _crawl_one(sink, data["article_id"], data.get("url"), data.get("title"))
+                for data in bigkinds_data
+            ])
+        logger.info(
+            f"{spec.name} bulk sink: flush={sink.flush_cnt} ok={sink.success_cnt} "
+            f"failed={sink.failed_cnt} es_ms={sink.flush_ms} refresh_wait_ms={sink.refresh_wait_ms}"
+        )
+
+        # ✅ 요약 로그 1건만 저장 (에러 or 결측이 하나라도 있으면)
+        if error_list or empty_articles:
+            samples: List[Dict[str, Any]] = []
+            samples.extend(error_list[:10])
+            if len(samples) < 10:
+                samples.extend(empty_articles[: (10 - len(samples))])
+
+            doc = build_error_doc(
+                message=f"{spec.name} 상세 크롤링 요약: 에러 {len(error_list)}건, 결측 {len(empty_articles)}건",
+
+                service_name="crawler",
+                service_environment=os.getenv("APP_ENV", "dev"),
+
+                pipeline_run_id=now_run_id,
+                pipeline_job=f"{spec.key}_crawl",
+                pipeline_step="article_content",
+
+                event_severity=3,
+                event_outcome="failure",
+
+                metrics={
+                    "error_count": len(error_list),
+                    "empty_count": len(empty_articles),
+                    "total_targets": len(id_list),
+                    "success_count": len(id_list) - len(error_list) - len(empty_articles),
+                },
+
+                context={
+                    "press": spec.name,
+                    "domain": spec.key,
+                    "total_targets": len(id_list),
+                    "runtime": spec.renderer,
+                },
+
+                samples=samples,
+                tags=["crawler", spec.key, "detail", "summary"],
+            )
+            es.index(index="error_log", document=doc)
+
+        empty_ids = {x["article_id"] for x in empty_articles}
+        error_ids = {x["article_id"] for x in error_list}
+        result = list(set(id_list) - empty_ids - error_ids)
+
+        print(f"==== {spec.name} 상세 크롤링 완료: {len(result)}개 성공 ====")
+        return result
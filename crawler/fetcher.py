@@ -0,0 +1,117 @@
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from util.logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+# host(언론사) 단위 기본 제한값입니다
+DEFAULT_CONCURRENCY = 4     # 동시에 날아가는 요청 수
+DEFAULT_RATE = 2.0          # 초당 요청 수 (token bucket 충전 속도)
+DEFAULT_BURST = 4           # 순간적으로 허용하는 요청 수 (bucket 크기)
+
+# 재시도 설정 (지수 백오프 + full jitter)
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """초당 rate개씩 토큰이 차는 버킷입니다. 토큰이 없으면 찰 때까지 기다립니다"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostLimiter:
+    """
+    host별로 동시 요청 수(semaphore)와 요청 속도(token bucket)를 함께 제한합니다
+    - 기존 고정 asyncio.sleep(0.5~1.5) 대신 사용
+    - asyncio 객체를 들고 있으므로 이벤트 루프 안에서 생성해서 사용합니다
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+    ):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self._hosts: Dict[str, Tuple[asyncio.Semaphore, TokenBucket]] = {}
+
+    def _slot(self, url: str) -> Tuple[asyncio.Semaphore, TokenBucket]:
+        host = urlparse(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = (
+                asyncio.Semaphore(self.concurrency),
+                TokenBucket(self.rate, self.burst),
+            )
+        return self._hosts[host]
+
+    @asynccontextmanager
+    async def limit(self, url: str):
+        sem, bucket = self._slot(url)
+        async with sem:
+            await bucket.acquire()
+            yield
+
+
+def backoff_delay(attempt: int) -> float:
+    """attempt번째 재시도 대기 시간 (full jitter)"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+async def fetch_with_retry(
+    client: httpx.AsyncClient,
+    url: str,
+    limiter: HostLimiter,
+    retries: int = MAX_RETRIES,
+    headers: Optional[Dict[str, str]] = None,
+) -> httpx.Response:
+    """
+    host 제한을 지키면서 GET 요청을 보냅니다
+    - 네트워크 오류 / 429 / 5xx 는 지터 백오프로 재시도
+    - 그 외 4xx 는 바로 raise_for_status
+    """
+    attempt = 0
+    while True:
+        resp = None
+        async with limiter.limit(url):
+            try:
+                resp = await client.get(url, headers=headers)
+            except httpx.TransportError:
+                if attempt >= retries:
+                    raise
+
+        if resp is not None and (resp.status_code not in RETRY_STATUS or attempt >= retries):
+            resp.raise_for_status()
+            return resp
+
+        delay = backoff_delay(attempt)
+        attempt += 1
+        logger.info(f"retry {attempt}/{retries} after {delay:.2f}s: {url}")
+        await asyncio.sleep(delay)
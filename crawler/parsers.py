@@ -0,0 +1,215 @@
+import os
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from bs4 import BeautifulSoup
+
+from crawler.press_specs import PRESS_SPECS, PressSpec
+from util.logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+# 선택 설치 파서들: 없으면 BeautifulSoup으로 대체됩니다
+try:
+    from selectolax.parser import HTMLParser as LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+try:
+    import lxml.html
+    import cssselect  # noqa: F401  lxml의 .cssselect()가 사용
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# "auto" | "selectolax" | "lxml" | "bs4"
+PARSE_BACKEND = os.getenv("CRAWLER_PARSE_BACKEND", "auto")
+
+# BeautifulSoup get_text()와 같게 이 태그 안의 텍스트는 제외합니다
+_SKIP_TEXT_TAGS = {"script", "style"}
+
+
+class _Backend:
+    """파서별 차이(선택/텍스트/속성/삭제)만 감싼 어댑터. 추출 규칙은 _extract 한 곳에 있습니다"""
+
+    def __init__(
+        self,
+        name: str,
+        parse: Callable[[bytes], Any],
+        select_one: Callable[[Any, str], Any],
+        select: Callable[[Any, str], List[Any]],
+        texts: Callable[[Any], List[str]],
+        attr: Callable[[Any, str], Optional[str]],
+        remove: Callable[[Any], None],
+    ):
+        self.name = name
+        self.parse = parse
+        self.select_one = select_one
+        self.select = select
+        self.texts = texts
+        self.attr = attr
+        self.remove = remove
+
+
+# ---------- BeautifulSoup (fallback) ----------
+def _bs4_backend(parser: str) -> _Backend:
+    return _Backend(
+        name="bs4",
+        parse=lambda html: BeautifulSoup(html, parser),
+        select_one=lambda root, sel: root.select_one(sel),
+        select=lambda root, sel: root.select(sel),
+        texts=lambda node: list(node.strings),
+        attr=lambda node, name: node.get(name),
+        remove=lambda node: node.decompose(),
+    )
+
+
+# ---------- lxml (libxml2) ----------
+def _lxml_texts(el) -> List[str]:
+    out: List[str] = []
+
+    def walk(e):
+        if e.text and e.tag not in _SKIP_TEXT_TAGS:
+            out.append(e.text)
+        for child in e:
+            # 주석/PI는 본문이 아니지만 뒤따르는 tail 텍스트는 본문입니다
+            if isinstance(child.tag, str):
+                walk(child)
+            if child.tail:
+                out.append(child.tail)
+
+    walk(el)
+    return out
+
+
+def _lxml_select_one(root, sel):
+    found = root.cssselect(sel)
+    return found[0] if found else None
+
+
+LXML_BACKEND = _Backend(
+    name="lxml",
+    parse=lambda html: lxml.html.document_fromstring(html),
+    select_one=_lxml_select_one,
+    select=lambda root, sel: root.cssselect(sel),
+    texts=_lxml_texts,
+    attr=lambda node, name: node.get(name),
+    # drop_tree는 tail 텍스트를 남기므로 BeautifulSoup decompose와 결과가 같습니다
+    remove=lambda node: node.drop_tree(),
+) if HAS_LXML else None
+
+
+# ---------- selectolax (lexbor) ----------
+def _lexbor_texts(node) -> List[str]:
+    out: List[str] = []
+    for n in node.traverse(include_text=True):
+        if n.tag != "-text":
+            continue
+        parent = n.parent
+        if parent is not None and parent.tag in _SKIP_TEXT_TAGS:
+            continue
+        out.append(n.text_content or "")
+    return out
+
+
+SELECTOLAX_BACKEND = _Backend(
+    name="selectolax",
+    parse=lambda html: LexborHTMLParser(html),
+    select_one=lambda root, sel: root.css_first(sel),
+    select=lambda root, sel: root.css(sel),
+    texts=_lexbor_texts,
+    attr=lambda node, name: node.attributes.get(name),
+    remove=lambda node: node.decompose(),
+) if HAS_SELECTOLAX else None
+
+
+def available_backends() -> List[str]:
+    names = []
+    if SELECTOLAX_BACKEND:
+        names.append("selectolax")
+    if LXML_BACKEND:
+        names.append("lxml")
+    names.append("bs4")
+    return names
+
+
+def _get_backend(name: str, spec: PressSpec) -> _Backend:
+    if name in ("auto", "selectolax") and SELECTOLAX_BACKEND:
+        return SELECTOLAX_BACKEND
+    if name in ("auto", "selectolax", "lxml") and LXML_BACKEND:
+        return LXML_BACKEND
+    return _bs4_backend(spec.parser)
+
+
+def _stripped(texts: List[str]) -> List[str]:
+    return [t.strip() for t in texts if t.strip()]
+
+
+def _extract(backend: _Backend, spec: PressSpec, html: bytes) -> Dict[str, Any]:
+    root = backend.parse(html)
+
+    # 제목 (get_text(strip=True) / .text.strip() 과 동일)
+    title_el = backend.select_one(root, spec.title_selector)
+    if title_el is None:
+        article_title = None
+    elif spec.title_strip_strings:
+        article_title = "".join(_stripped(backend.texts(title_el)))
+    else:
+        article_title = "".join(backend.texts(title_el)).strip()
+
+    # 본문
+    article_content: Any = None
+    if spec.content_mode == "paragraphs":
+        paragraphs = backend.select(root, spec.content_selector)
+        if spec.drop_last_paragraph:
+            paragraphs = paragraphs[:-1]
+        texts = ["".join(_stripped(backend.texts(p))) for p in paragraphs]
+        if not spec.keep_empty_paragraphs:
+            texts = [t for t in texts if t]
+        article_content = spec.content_joiner.join(texts) if paragraphs else None
+    else:
+        body = backend.select_one(root, spec.content_selector)
+        if body is not None:
+            for sel in spec.remove_selectors:
+                for node in backend.select(body, sel):
+                    backend.remove(node)
+            if spec.content_mode == "lines":
+                # get_text("\n", strip=True).split("\n")
+                article_content = "\n".join(_stripped(backend.texts(body))).split("\n")
+                article_content = [line.strip() for line in article_content]
+            else:
+                article_content = "".join(_stripped(backend.texts(body)))
+
+    # 대표 이미지
+    img = backend.select_one(root, spec.image_selector)
+    article_img = (backend.attr(img, spec.image_attr) or None) if img is not None else None
+    if article_img and spec.image_max_len and len(article_img) > spec.image_max_len:
+        article_img = None
+
+    return {
+        "article_title": article_title,
+        "article_content": article_content,
+        "article_img": article_img,
+    }
+
+
+def extract_article(spec: PressSpec, html: Union[str, bytes], backend: str = PARSE_BACKEND) -> Dict[str, Any]:
+    """
+    HTML에서 제목/본문/대표 이미지를 PressSpec 규칙대로 추출합니다
+    - 빠른 C 파서(selectolax → lxml) 우선, 실패하거나 없으면 BeautifulSoup
+    """
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+
+    chosen = _get_backend(backend, spec)
+    if chosen.name != "bs4":
+        try:
+            return _extract(chosen, spec, html)
+        except Exception as e:
+            logger.info(f"{chosen.name} parse failed, fallback to bs4 ({spec.key}): {e}")
+    return _extract(_bs4_backend(spec.parser), spec, html)
+
+
+def extract_fields(press_name: str, html: Union[str, bytes]) -> Dict[str, Any]:
+    """ProcessPoolExecutor 작업 단위: 언론사명 + 원본 바이트 → 추출 필드 (피클 가능한 인자만 사용)"""
+    return extract_article(PRESS_SPECS[press_name], html)
@@ -0,0 +1,137 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from crawler.fetcher import DEFAULT_BURST, DEFAULT_CONCURRENCY, DEFAULT_RATE
+
+
+@dataclass(frozen=True)
+class PressSpec:
+    """
+    언론사 1곳의 상세 기사 추출 규칙입니다
+    - 새 언론사 추가 = PRESS_SPECS에 항목 1개 추가
+    - content_mode
+        "text"       : content_selector 첫 요소의 텍스트
+        "paragraphs" : content_selector에 걸리는 요소들의 텍스트를 content_joiner로 연결
+        "lines"      : content_selector 첫 요소를 줄 단위 리스트로 (국민일보)
+    """
+    name: str                       # BigKinds 체크박스 id(=언론사명)
+    key: str                        # 로그/태그용 영문 키
+    title_selector: str
+    content_selector: str
+    image_selector: str
+
+    content_mode: str = "text"
+    content_joiner: str = "\n"
+    drop_last_paragraph: bool = False          # 한겨레: 마지막 문단(기자 정보) 제외
+    keep_empty_paragraphs: bool = False        # 한겨레/조선일보: 빈 문단도 그대로 연결 (기존 크롤러 결과 유지)
+    title_fallback_to_row: bool = False        # 조선일보: 제목이 없으면 빅카인즈 목록의 제목 사용
+    remove_selectors: Tuple[str, ...] = ()     # 본문에서 미리 지울 요소
+    title_strip_strings: bool = True           # False면 el.text.strip()
+    image_attr: str = "src"
+    image_max_len: Optional[int] = None        # base64 src 방지
+
+    url_rewrites: Tuple[Tuple[str, str], ...] = ()
+    force_https: bool = False
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    renderer: str = "httpx"         # "httpx" | "playwright"
+    parser: str = "html.parser"
+
+    concurrency: int = DEFAULT_CONCURRENCY
+    rate: float = DEFAULT_RATE
+    burst: int = DEFAULT_BURST
+
+
+PRESS_SPECS: Dict[str, PressSpec] = {
+    "동아일보": PressSpec(
+        name="동아일보",
+        key="donga",
+        title_selector="#contents > header > div > section > h1",
+        content_selector="#contents > div.view_body > div > div.main_view > section.news_view",
+        image_selector="#contents > div.view_body > div > div.main_view > section.news_view > figure > div > img",
+    ),
+    "KBS": PressSpec(
+        name="KBS",
+        key="kbs",
+        title_selector="div.view-headline h4",
+        content_selector="div#cont_newstext",
+        image_selector="div#element-image img",
+        title_strip_strings=False,
+        # 리다이렉션(302) 회피를 위해 PC 버전 URL로 변경
+        url_rewrites=(("/news/view.do", "/news/pc/view/view.do"),),
+        rate=2.0,
+    ),
+    "한겨레": PressSpec(
+        name="한겨레",
+        key="hani",
+        title_selector="h3.ArticleDetailView_title__9kRU_",
+        content_selector="div.article-text p.text",
+        image_selector="picture img",
+        content_mode="paragraphs",
+        content_joiner=" ",
+        drop_last_paragraph=True,
+        keep_empty_paragraphs=True,
+        force_https=True,
+        headers={
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+            "Cache-Control": "no-cache",
+            "Pragma": "no-cache",
+            "Referer": "https://www.hani.co.kr/",
+        },
+    ),
+    "조선일보": PressSpec(
+        name="조선일보",
+        key="chosun",
+        title_selector="h1.article-header__headline span",
+        content_selector="section.article-body p",
+        image_selector="section.article-body div.lazyload-wrapper img",
+        content_mode="paragraphs",
+        content_joiner=" ",
+        keep_empty_paragraphs=True,
+        title_fallback_to_row=True,
+        # JS 렌더링이 필요해서 playwright 사용
+        renderer="playwright",
+        parser="lxml",
+        concurrency=2,
+        rate=1.0,
+        burst=2,
+    ),
+    "국민일보": PressSpec(
+        name="국민일보",
+        key="kmib",
+        title_selector="#article_header h1",
+        content_selector="div.article_content #articleBody",
+        image_selector="#articleBody > div.article_body_img > figure > img",
+        content_mode="lines",
+        remove_selectors=("div.article_recommend",),
+    ),
+    "내일신문": PressSpec(
+        name="내일신문",
+        key="naeil",
+        title_selector="#container > section > div > header > h1",
+        content_selector="div.article-view p",
+        image_selector="figure.article-img img.fade",
+        content_mode="paragraphs",
+    ),
+    "매일신문": PressSpec(
+        name="매일신문",
+        key="everyday",
+        title_selector="div.article_head h1.title",
+        content_selector="div#articlebody p",
+        image_selector="figure.img_center img",
+        content_mode="paragraphs",
+        title_strip_strings=False,
+        rate=2.0,
+    ),
+    "한국일보": PressSpec(
+        name="한국일보",
+        key="hankookilbo",
+        title_selector="div.end-top div.col-main h1.title",
+        content_selector="div.end-body div.col-main p",
+        image_selector="div.img-box img",
+        content_mode="paragraphs",
+        title_strip_strings=False,
+        image_max_len=500,
+        rate=2.0,
+    ),
+}
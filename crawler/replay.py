@@ -0,0 +1,206 @@
+"""
+크롤러 응답 녹화/재생
+
+- 녹화: CrawlSession(record_path=...) 또는 CRAWLER_RECORD_PATH 환경변수를 주면
+  가져온 기사 응답을 URL 키로 gzip JSONL 아카이브에 쌓습니다 (같은 URL은 마지막 것이 유효)
+- 재생: 아카이브를 언론사 사이트 대신 서빙하는 로컬 HTTP 서버
+  CrawlSession(replay_url=...) 또는 CRAWLER_REPLAY_URL 을 주면 모든 기사 요청이
+  {replay_url}/r/{quote(원본 URL)} 로 바뀌어 네트워크 없이 같은 결과를 재현합니다
+- 서버는 지연(latency/jitter)과 에러율(error_rate)을 seed 기반으로 주입 → 벤치마크/CI 재현성
+
+실행 (프로젝트 루트):
+    python -m crawler.replay --archive data/crawl_archive.jsonl.gz --port 8765 --latency-ms 80 --error-rate 0.02
+"""
+import argparse
+import base64
+import gzip
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import quote, unquote
+
+from util.logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+REPLAY_PREFIX = "/r/"
+
+
+def replay_target(replay_url: str, url: str) -> str:
+    """원본 URL → 재생 서버 URL"""
+    return f"{replay_url.rstrip('/')}{REPLAY_PREFIX}{quote(url, safe='')}"
+
+
+class ResponseArchive:
+    """
+    URL 키 응답 아카이브 (gzip JSONL)
+    - 한 줄 = {"url", "status", "content_type", "fetched_at", "body"(base64)}
+    - 쓰기는 append 모드 gzip member로 이어붙이므로 여러 실행을 같은 파일에 누적할 수 있습니다
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._fh = None
+        self.recorded_cnt = 0
+
+    def open_for_write(self) -> "ResponseArchive":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = gzip.open(self.path, "at", encoding="utf-8")
+        return self
+
+    def add(self, url: str, status: int, content_type: Optional[str], body: bytes) -> None:
+        record = {
+            "url": url,
+            "status": status,
+            "content_type": content_type or "text/html",
+            "fetched_at": datetime.now(KST).isoformat(),
+            "body": base64.b64encode(body).decode("ascii"),
+        }
+        self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.recorded_cnt += 1
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """{url: record(body는 bytes로 디코딩)}"""
+        records: Dict[str, Dict[str, Any]] = {}
+        with gzip.open(self.path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                record["body"] = base64.b64decode(record["body"])
+                records[record["url"]] = record
+        return records
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        records: Dict[str, Dict[str, Any]],
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 42,
+    ):
+        super().__init__(address, _ReplayHandler)
+        self.records = records
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.served_cnt = 0
+        self.error_cnt = 0
+
+    def draw(self):
+        """(지연 초, 에러 주입 여부) — 요청 순서가 같으면 결과도 같습니다"""
+        with self._rng_lock:
+            delay = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+            fail = self._rng.random() < self.error_rate
+        return max(0.0, delay) / 1000, fail
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: ReplayServer
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/plain; charset=utf-8") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if not self.path.startswith(REPLAY_PREFIX):
+            self._send(404, b"unknown path")
+            return
+
+        delay, fail = self.server.draw()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self.server.error_cnt += 1
+            self._send(self.server.error_status, b"injected error")
+            return
+
+        record = self.server.records.get(unquote(self.path[len(REPLAY_PREFIX):]))
+        if record is None:
+            self._send(404, b"not in archive")
+            return
+        self.server.served_cnt += 1
+        self._send(record["status"], record["body"], record["content_type"])
+
+    def log_message(self, format, *args):
+        # 요청마다 stderr에 찍히는 기본 로그는 벤치마크 측정을 흐리므로 끕니다
+        pass
+
+
+def start_replay_server(
+    archive_path: str,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    **options,
+) -> ReplayServer:
+    """백그라운드 스레드로 재생 서버를 띄웁니다 (port=0이면 빈 포트). 종료는 server.shutdown()"""
+    records = ResponseArchive(archive_path).load()
+    server = ReplayServer((host, port), records, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"replay server: {server.base_url} ({len(records)} urls)")
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--archive", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    records = ResponseArchive(args.archive).load()
+    server = ReplayServer(
+        (args.host, args.port),
+        records,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+    print(f"replaying {len(records)} urls on {server.base_url} (CRAWLER_REPLAY_URL={server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
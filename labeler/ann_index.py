@@ -0,0 +1,490 @@
+"""
+기사 임베딩 근사 최근접 이웃(ANN) 사이드카 인덱스
+
+연관 기사/추천이 매번 ES kNN(k=1000, num_candidates=2000 등)으로 5건 남짓을 찾던 것을
+프로세스 안 인덱스에서 바로 찾고, 인덱스를 쓸 수 없을 때만 ES로 내려갑니다.
+
+- 최근 ANN_WINDOW_DAYS일 article_embedding 을 보관 (L2 정규화 벡터라 dot = cosine)
+- 벡터는 memory-mapped 파일(vectors.f32)에 두고, id/status/날짜는 meta 파일에 저장 → 재시작 시 바로 로드
+- hnswlib가 있으면 HNSW 그래프(hnsw.bin)도 함께 저장/로드, 없거나 필터 후 후보가 적으면 numpy 전수 비교
+- status / 날짜 필터는 행 단위 bool 배열(bitmap)로 만들어 HNSW filter 또는 전수 비교 mask로 사용
+- 갱신: 임베딩 단계가 벡터를 쓰면 index_embeddings()로 바로 추가하고,
+  ann_index_sync job(sync_from_es)이 주기적으로 status/날짜 변경·누락·기간 만료를 ES와 맞춥니다
+- 점수는 ES cosine kNN _score 와 같은 (1 + cos) / 2 로 돌려줘서 기존 유사도 컷을 그대로 씁니다
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from util.elastic import es
+from util.elastic_templates import build_info_docs
+from util.logger import Logger
+from util.vector_store import get_vectors
+
+logger = Logger().get_logger(__name__)
+
+try:
+    import hnswlib
+
+    HAS_HNSWLIB = True
+except ImportError:
+    hnswlib = None
+    HAS_HNSWLIB = False
+
+KST = timezone(timedelta(hours=9))
+
+ANN_ENABLED = os.getenv("ANN_ENABLED", "1") != "0"
+ANN_DIR = os.getenv("ANN_INDEX_DIR", "data/ann")
+ANN_WINDOW_DAYS = int(os.getenv("ANN_WINDOW_DAYS", "30"))
+DIM = 768
+INITIAL_CAPACITY = 65_536
+# 필터 통과 후보가 이 수 이하이면 HNSW 대신 전수 비교 (정확하고 이 규모에서는 더 빠름)
+BRUTE_FORCE_MAX = 20_000
+# 지워진 행이 이 비율을 넘으면 sync 때 파일을 새로 만듭니다
+COMPACT_RATIO = 0.3
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 128
+# sync 시작 이 시간(초) 안에 추가된 행은 ES에서 아직 안 보일 수 있어 만료하지 않습니다 (refresh 전)
+SYNC_GRACE_SEC = 30
+
+
+def _to_yyyymmdd(value) -> int:
+    """collected_at(ISO) / upload_date(yyyymmdd) → 20260107 형태 정수 (모르면 0)"""
+    if not value:
+        return 0
+    s = str(value)
+    digits = s[:10].replace("-", "") if "-" in s[:10] else s[:8]
+    return int(digits) if digits.isdigit() and len(digits) == 8 else 0
+
+
+def _days_ago(days: int) -> int:
+    return int((datetime.now(KST) - timedelta(days=days)).strftime("%Y%m%d"))
+
+
+class AnnIndex:
+    """
+    행 번호(row) = HNSW label. article_id → row 는 row_of 로 찾습니다
+    같은 기사가 다시 들어오면 같은 행을 덮어씁니다 (벡터/메타 갱신)
+    """
+
+    def __init__(self, path: str = ANN_DIR, dim: int = DIM):
+        self.path = Path(path)
+        self.dim = dim
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.ids: List[str] = []
+        self.row_of: Dict[str, int] = {}
+        self.capacity = 0
+        self.status = np.zeros(0, dtype=np.int8)
+        self.dates = np.zeros(0, dtype=np.int32)
+        self.alive = np.zeros(0, dtype=bool)
+        # article_id → 마지막 add 시각(monotonic, 프로세스 안에서만) — sync 만료 판단용
+        self.added_at: Dict[str, float] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._hnsw = None
+
+    # ---------- 저장 / 로드 ----------
+    @property
+    def count(self) -> int:
+        return len(self.ids)
+
+    @property
+    def alive_count(self) -> int:
+        return int(self.alive[:self.count].sum())
+
+    def _vectors_file(self) -> Path:
+        return self.path / "vectors.f32"
+
+    def _open_vectors(self, capacity: int, mode: str) -> np.memmap:
+        self.path.mkdir(parents=True, exist_ok=True)
+        return np.memmap(self._vectors_file(), dtype=np.float32, mode=mode, shape=(capacity, self.dim))
+
+    def _ensure_capacity(self, needed: int) -> None:
+        if needed <= self.capacity:
+            return
+        new_capacity = max(INITIAL_CAPACITY, self.capacity)
+        while new_capacity < needed:
+            new_capacity *= 2
+        if self._vectors is not None:
+            self._vectors.flush()
+            del self._vectors
+        # r+ 로는 크기를 못 늘리므로 파일 길이를 먼저 늘린 뒤 다시 엽니다 (기존 행은 그대로)
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self._vectors_file(), "ab") as f:
+            f.truncate(new_capacity * self.dim * 4)
+        self._vectors = self._open_vectors(new_capacity, "r+")
+
+        for name, dtype in (("status", np.int8), ("dates", np.int32), ("alive", bool)):
+            grown = np.zeros(new_capacity, dtype=dtype)
+            old = getattr(self, name)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+        if self._hnsw is not None:
+            self._hnsw.resize_index(new_capacity)
+        self.capacity = new_capacity
+
+    def _new_hnsw(self, capacity: int):
+        if not HAS_HNSWLIB:
+            return None
+        index = hnswlib.Index(space="ip", dim=self.dim)
+        index.init_index(max_elements=capacity, ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+        index.set_ef(HNSW_EF_SEARCH)
+        return index
+
+    def save(self) -> None:
+        """벡터 flush + meta/hnsw 파일을 임시 파일에 쓰고 rename (읽는 쪽이 반쯤 쓴 파일을 보지 않게)"""
+        with self._lock:
+            if self._vectors is None:
+                return
+            self._vectors.flush()
+            n = self.count
+            meta_tmp = self.path / "meta.json.tmp"
+            with open(meta_tmp, "w", encoding="utf-8") as f:
+                json.dump({"dim": self.dim, "capacity": self.capacity, "ids": self.ids}, f)
+            arrays_tmp = self.path / "meta_arrays.tmp.npz"
+            np.savez(arrays_tmp, status=self.status[:n], dates=self.dates[:n], alive=self.alive[:n])
+            if self._hnsw is not None:
+                hnsw_tmp = self.path / "hnsw.bin.tmp"
+                self._hnsw.save_index(str(hnsw_tmp))
+                os.replace(hnsw_tmp, self.path / "hnsw.bin")
+            os.replace(arrays_tmp, self.path / "meta_arrays.npz")
+            os.replace(meta_tmp, self.path / "meta.json")
+
+    @classmethod
+    def load(cls, path: str = ANN_DIR, dim: int = DIM) -> "AnnIndex":
+        index = cls(path, dim)
+        meta_file = index.path / "meta.json"
+        if not meta_file.exists() or not index._vectors_file().exists():
+            return index
+        with open(meta_file, encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = np.load(index.path / "meta_arrays.npz")
+        n = len(meta["ids"])
+
+        index.ids = list(meta["ids"])
+        index.row_of = {aid: i for i, aid in enumerate(index.ids)}
+        index.capacity = int(meta["capacity"])
+        index._vectors = index._open_vectors(index.capacity, "r+")
+        for name, dtype in (("status", np.int8), ("dates", np.int32), ("alive", bool)):
+            full = np.zeros(index.capacity, dtype=dtype)
+            full[:n] = arrays[name]
+            setattr(index, name, full)
+
+        if HAS_HNSWLIB:
+            hnsw_file = index.path / "hnsw.bin"
+            if hnsw_file.exists():
+                index._hnsw = hnswlib.Index(space="ip", dim=dim)
+                index._hnsw.load_index(str(hnsw_file), max_elements=index.capacity)
+                index._hnsw.set_ef(HNSW_EF_SEARCH)
+            if index._hnsw is None or index._hnsw.get_current_count() != n:
+                # 그래프가 없거나 벡터 파일과 안 맞으면 memmap 벡터로 다시 만듭니다
+                index._rebuild_hnsw()
+        logger.info(f"ann index loaded: rows={n} alive={index.alive_count} hnsw={index._hnsw is not None}")
+        return index
+
+    def _rebuild_hnsw(self) -> None:
+        self._hnsw = self._new_hnsw(self.capacity)
+        if self._hnsw is None or not self.count:
+            return
+        self._hnsw.add_items(np.asarray(self._vectors[:self.count]), np.arange(self.count))
+        for row in np.flatnonzero(~self.alive[:self.count]):
+            self._hnsw.mark_deleted(int(row))
+
+    # ---------- 갱신 ----------
+    def add_many(self, items: Iterable[Tuple[str, List[float], int, int]]) -> int:
+        """[(article_id, vector, status, yyyymmdd)] — 이미 있는 기사는 같은 행을 덮어씁니다"""
+        items = list(items)
+        if not items:
+            return 0
+        with self._lock:
+            self._ensure_capacity(self.count + len(items))
+            if self._hnsw is None and HAS_HNSWLIB:
+                self._hnsw = self._new_hnsw(self.capacity)
+
+            rows = []
+            now = time.monotonic()
+            for article_id, _, status, date in items:
+                row = self.row_of.get(article_id)
+                if row is None:
+                    row = len(self.ids)
+                    self.ids.append(article_id)
+                    self.row_of[article_id] = row
+                elif self._hnsw is not None and not self.alive[row]:
+                    self._hnsw.unmark_deleted(row)
+                self.status[row] = status
+                self.dates[row] = date
+                self.alive[row] = True
+                self.added_at[article_id] = now
+                rows.append(row)
+
+            vectors = np.asarray([v for _, v, _, _ in items], dtype=np.float32)
+            self._vectors[rows] = vectors
+            if self._hnsw is not None:
+                self._hnsw.add_items(vectors, np.asarray(rows))
+        return len(items)
+
+    def update_meta(self, article_id: str, status: Optional[int] = None, date: Optional[int] = None) -> bool:
+        with self._lock:
+            row = self.row_of.get(article_id)
+            if row is None:
+                return False
+            if status is not None:
+                self.status[row] = status
+            if date:
+                self.dates[row] = date
+            return True
+
+    def remove(self, article_ids: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for article_id in article_ids:
+                row = self.row_of.get(article_id)
+                if row is None or not self.alive[row]:
+                    continue
+                self.alive[row] = False
+                if self._hnsw is not None:
+                    self._hnsw.mark_deleted(row)
+                removed += 1
+        return removed
+
+    def compact(self) -> None:
+        """지워진 행을 빼고 벡터 파일/그래프를 새로 만듭니다"""
+        with self._lock:
+            keep = np.flatnonzero(self.alive[:self.count])
+            vectors = np.asarray(self._vectors[keep])
+            items = [(self.ids[r], vectors[i], int(self.status[r]), int(self.dates[r])) for i, r in enumerate(keep)]
+            del self._vectors
+            self._vectors_file().unlink()
+            self._reset()
+            self.add_many(items)
+
+    # ---------- 조회 ----------
+    def vector(self, article_id: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self.row_of.get(article_id)
+            if row is None or not self.alive[row]:
+                return None
+            return np.array(self._vectors[row])
+
+    def _mask(self, since: Optional[int], min_status: Optional[int], statuses: Optional[Iterable[int]]) -> np.ndarray:
+        n = self.count
+        mask = self.alive[:n].copy()
+        if since:
+            mask &= self.dates[:n] >= since
+        if min_status is not None:
+            mask &= self.status[:n] >= min_status
+        if statuses:
+            mask &= np.isin(self.status[:n], list(statuses))
+        return mask
+
+    def search(
+        self,
+        vector,
+        k: int = 10,
+        since: Optional[int] = None,
+        min_status: Optional[int] = None,
+        statuses: Optional[Iterable[int]] = None,
+        exclude: Iterable[str] = (),
+    ) -> List[Tuple[str, float]]:
+        """[(article_id, score)] score = (1 + cos) / 2 (ES cosine kNN _score 와 같은 척도), 높은 순"""
+        q = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            mask = self._mask(since, min_status, statuses)
+            for article_id in exclude:
+                row = self.row_of.get(article_id)
+                if row is not None:
+                    mask[row] = False
+            candidates = int(mask.sum())
+            if candidates == 0:
+                return []
+            k = min(k, candidates)
+
+            if self._hnsw is not None and candidates > BRUTE_FORCE_MAX:
+                try:
+                    labels, distances = self._hnsw.knn_query(q, k=k, filter=lambda label: bool(mask[label]))
+                    # space="ip" 거리 = 1 - dot
+                    return [
+                        (self.ids[int(label)], (2.0 - float(d)) / 2.0)
+                        for label, d in zip(labels[0], distances[0])
+                    ]
+                except RuntimeError:
+                    # 필터가 좁아 k개를 못 채운 경우 → 전수 비교
+                    pass
+
+            rows = np.flatnonzero(mask)
+            sims = np.asarray(self._vectors[rows]) @ q
+            top = np.argpartition(-sims, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+            top = top[np.argsort(-sims[top])]
+            return [(self.ids[int(rows[i])], (1.0 + float(sims[i])) / 2.0) for i in top]
+
+    # ---------- ES 동기화 ----------
+    def sync_from_es(self, window_days: int = ANN_WINDOW_DAYS, chunk_size: int = 1000) -> Dict[str, int]:
+        """
+        최근 window_days일 기사와 맞춥니다
+        - 이미 있는 기사는 status/날짜만 갱신 (벡터 안 읽음)
+        - 없는 기사는 임베딩을 읽어 추가 (util.vector_store.get_vectors)
+        - 기간이 지났거나 ES에서 사라진 기사는 삭제 표시 (비율이 크면 compact)
+          스캔 전에 있던 행만 대상 — 스캔 중(또는 직전, refresh 전)에 임베딩 단계가 추가한 기사는 지우지 않습니다
+        """
+        from util.backfill import scan_pages
+
+        query = {
+            "bool": {
+                "filter": [
+                    {"range": {"collected_at": {"gte": f"now-{window_days}d/d"}}},
+                    {"exists": {"field": "article_embedding"}},
+                ]
+            }
+        }
+        started = time.monotonic() - SYNC_GRACE_SEC
+        with self._lock:
+            expirable = [aid for aid in self.ids if self.added_at.get(aid, 0.0) < started]
+        seen = set()
+        added = updated = 0
+        for hits, _ in scan_pages(query, ["status", "collected_at"], chunk_size, None):
+            missing = {}
+            for h in hits:
+                src = h.get("_source") or {}
+                article_id = h["_id"]
+                seen.add(article_id)
+                status = int(src.get("status") or 0)
+                date = _to_yyyymmdd(src.get("collected_at"))
+                if self.update_meta(article_id, status, date) and self.alive[self.row_of[article_id]]:
+                    updated += 1
+                else:
+                    missing[article_id] = (status, date)
+            if missing:
+                vectors = get_vectors("article", list(missing))
+                added += self.add_many(
+                    (article_id, vec, *missing[article_id]) for article_id, vec in vectors.items()
+                )
+
+        with self._lock:
+            # 스캔 도중 다시 add 된 행도 제외
+            removed = self.remove([
+                aid for aid in expirable
+                if aid not in seen and self.added_at.get(aid, 0.0) < started
+            ])
+        if self.count and (self.count - self.alive_count) / self.count > COMPACT_RATIO:
+            self.compact()
+        self.save()
+        return {"added": added, "updated": updated, "removed": removed, "alive": self.alive_count}
+
+
+_index: Optional[AnnIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_ann_index() -> Optional[AnnIndex]:
+    """프로세스당 1개 (처음 쓸 때 디스크에서 로드). ANN_ENABLED=0 이면 None"""
+    global _index
+    if not ANN_ENABLED:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = AnnIndex.load()
+    return _index
+
+
+def ann_neighbors(
+    vector,
+    k: int,
+    since_days: Optional[int] = None,
+    min_status: Optional[int] = None,
+    exclude: Iterable[str] = (),
+) -> Optional[List[Tuple[str, float]]]:
+    """
+    사이드카 인덱스 이웃 [(article_id, score)]
+    None이면 인덱스를 쓸 수 없는 상태(비활성/비어 있음/오류) → 호출 쪽이 ES kNN으로 대체합니다
+    """
+    try:
+        index = get_ann_index()
+        if index is None or index.alive_count == 0:
+            return None
+        if since_days is not None and since_days > ANN_WINDOW_DAYS:
+            # 보관 기간보다 긴 조건은 인덱스로 답할 수 없음
+            return None
+        since = _days_ago(since_days) if since_days is not None else None
+        return index.search(vector, k=k, since=since, min_status=min_status, exclude=exclude)
+    except Exception as e:
+        logger.warning(f"ann search failed, fallback to ES: {e}")
+        return None
+
+
+def ann_vector(article_id: str) -> Optional[List[float]]:
+    index = get_ann_index() if ANN_ENABLED else None
+    vec = index.vector(article_id) if index is not None else None
+    return vec.tolist() if vec is not None else None
+
+
+def index_embeddings(doc_embeddings: Dict[str, List[float]], status: Optional[int]) -> None:
+    """
+    임베딩 단계에서 방금 쓴 벡터를 바로 반영합니다 (실패해도 다음 sync에서 맞춰짐)
+    - status가 있으면(스트리밍) 오늘 수집 기사로 추가
+    - status가 None이면(재임베딩) 이미 있는 기사의 벡터만 교체
+    """
+    if not ANN_ENABLED or not doc_embeddings:
+        return
+    try:
+        index = get_ann_index()
+        today = int(datetime.now(KST).strftime("%Y%m%d"))
+        items = []
+        for article_id, vec in doc_embeddings.items():
+            row = index.row_of.get(article_id)
+            if row is not None:
+                items.append((article_id, vec, int(status if status is not None else index.status[row]), int(index.dates[row])))
+            elif status is not None:
+                items.append((article_id, vec, int(status), today))
+        index.add_many(items)
+    except Exception as e:
+        logger.warning(f"ann index update failed: {e}")
+
+
+def remove_articles(article_ids: Iterable[str]) -> None:
+    """article_data 에서 삭제한 기사를 바로 빼냅니다 (실패해도 다음 sync에서 맞춰짐)"""
+    if not ANN_ENABLED:
+        return
+    try:
+        index = get_ann_index()
+        index.remove(article_ids)
+    except Exception as e:
+        logger.warning(f"ann index remove failed: {e}")
+
+
+def sync_ann_index(window_days: int = ANN_WINDOW_DAYS) -> Dict[str, int]:
+    """scheduler job(ann_index_sync): ES와 맞추고 디스크에 저장, info_logs에 결과를 남깁니다"""
+    index = get_ann_index()
+    if index is None:
+        return {}
+    t0 = time.monotonic()
+    result = index.sync_from_es(window_days)
+    es.index(
+        index="info_logs",
+        document=build_info_docs(
+            run_id=datetime.now(KST).strftime("%Y%m%d_%H"),
+            job_id="ann_index_sync",
+            component="ann",
+            stage="ann_index_sync_end",
+            status="ok",
+            duration_ms=int((time.monotonic() - t0) * 1000),
+            input_cnt=result["added"] + result["updated"],
+            success_cnt=result["alive"],
+            failed_cnt=0,
+            message=(
+                f"added={result['added']} updated={result['updated']} removed={result['removed']} "
+                f"alive={result['alive']} hnsw={HAS_HNSWLIB} window_days={window_days}"
+            ),
+        )
+    )
+    return result
@@ -1,80 +1,228 @@
+"""
+기사 카테고리 분류 (스트리밍 categorizer 단계)
+
+- 분류 모델(pickle)은 처음 분류할 때 로드합니다 (labeler.model_registry "category")
+  → crawler/main 을 import만 하는 프로세스(FastAPI 등)는 로드 비용이 없습니다
+- 입력 id는 CATEGORY_CHUNK 단위 mget, 예측은 CATEGORY_PREDICT_BATCH 단위 predict_proba
+- 최고 확률이 CATEGORY_MIN_PROBA 미만이면 category_review 인덱스로 보냅니다 (기본 0 = 보내지 않음)
+  검토 대상은 status 2 에 머물고 스트리밍 다음 단계로 넘어가지 않습니다.
+  검토 후 release_reviewed({article_id: 카테고리}) 로 라벨을 쓰고 신뢰도 → DB 단계를 이어서 돌립니다
+- 라벨 매핑에 없는 예측은 기존처럼 article_data / article_raw 에서 삭제 — update/삭제/검토 모두 bulk 1번
+  삭제한 기사는 vector_store float 사본과 ANN 사이드카에서도 바로 뺍니다 (연관 기사 결과에 남지 않게)
+- CATEGORY_BACKEND=embedding 이면 본문 대신 article_embedding 위 선형 헤드(labeler.category_head)로 분류
+  (임베딩을 못 찾은 기사만 본문을 읽어 pickle 로 분류)
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
 import joblib
-from util.elastic import  es
 from elasticsearch import helpers
+
+from labeler.model_registry import registry
+from util.elastic import es
 from util.elastic_templates import build_error_doc
+from util.logger import Logger
+from util.near_dup import plan_reuse
+from util.vector_store import delete_vectors, get_vectors
 
-model = r"model/news_category_classifier_add.pkl"
-model = joblib.load(model)
+logger = Logger().get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+CATEGORY_MODEL_PATH = os.getenv("CATEGORY_MODEL_PATH", r"model/news_category_classifier_add.pkl")
+CATEGORY_CHUNK = int(os.getenv("CATEGORY_CHUNK", "500"))
+CATEGORY_PREDICT_BATCH = int(os.getenv("CATEGORY_PREDICT_BATCH", "256"))
+# 0이면 검토로 보내지 않음 (기존 동작, 기본값), predict_proba가 없는 모델은 항상 1.0
+CATEGORY_MIN_PROBA = float(os.getenv("CATEGORY_MIN_PROBA", "0"))
+REVIEW_INDEX = "category_review"
+# text(pickle, 제목 + 본문) | embedding(labeler.category_head)
+CATEGORY_BACKEND = os.getenv("CATEGORY_BACKEND", "text")
+
+LABEL_MAPPING = {
+    0: "스포츠",
+    1: "지역",
+    2: "문화",
+    3: "사회",
+    4: "정치",
+    5: "국제"
+}
+
+_SOURCE_FIELDS = ["article_id", "article_title", "article_content", "dup_group_id"]
+_HEAD_SOURCE_FIELDS = ["article_id", "article_title", "dup_group_id"]
+_head_fallback_logged = False
+
+
+def _load_category_model():
+    return joblib.load(CATEGORY_MODEL_PATH)
+
+
+def _warmup_category_model(model) -> None:
+    model.predict(["모델 워밍업 문장입니다."])
 
-# article_id를 리스트 형태로 넣어주면 해당 기사들을 찾고 카테고리를 추가합니다
-def categorizer(article_list):
 
-    query = {
-        "_source": ["article_id", "article_title", "article_content"],
-        "size": 1000,
-        "query": {
-            "terms": {"article_id": article_list}
-        }
-    }
-
-    resp = es.search(index="article_data", body=query)
-    hits = resp.get("hits", {}).get("hits", [])
-
-    article_ids = []
-    texts = []
-    for h in hits:
-        src = h.get("_source", {})
-        article_id = src.get("article_id")
-        if not article_id:
-            continue
-
-        title = src.get("article_title") or ""
-        content = src.get("article_content") or ""
-        texts.append(f"{title} {content}")
-        article_ids.append(article_id)
-
-    predict_labels = model.predict(texts)
-
-    label_mapping = {
-        0: "스포츠",
-        1: "지역",
-        2: "문화",
-        3: "사회",
-        4: "정치",
-        5: "국제"
-    }
-    
+registry.register(
+    "category",
+    _load_category_model,
+    _warmup_category_model,
+    describe=lambda model: {"backend": type(model).__name__, "path": CATEGORY_MODEL_PATH},
+)
+
+
+def get_category_model():
+    return registry.get("category")
+
+
+def _text(src: dict) -> str:
+    return f"{src.get('article_title') or ''} {src.get('article_content') or ''}"
+
+
+def classify(texts: List[str]) -> List[Tuple[Optional[str], float, Dict[str, float]]]:
+    """
+    텍스트별 (카테고리 또는 None, 최고 확률, {카테고리: 확률})
+    - 최고 확률 클래스는 model.classes_ 전체에서 고릅니다 (model.predict 와 같은 결과)
+      그 클래스가 LABEL_MAPPING에 없으면 카테고리 None → 기존처럼 삭제 대상
+    - 확률 dict 에는 LABEL_MAPPING에 있는 클래스만 남깁니다
+    - predict_proba가 없는 모델이면 예측 라벨 1.0
+    """
+    model = get_category_model()
     results = []
-    null_cat = []
-
-    for a_id, predict_label in zip(article_ids, predict_labels):
-        lbl = int(predict_label)
-        if lbl in label_mapping:
-            results.append({
-                "article_id": a_id,
-                "category": label_mapping[lbl]
-            })
+    for i in range(0, len(texts), CATEGORY_PREDICT_BATCH):
+        batch = texts[i:i + CATEGORY_PREDICT_BATCH]
+        if hasattr(model, "predict_proba"):
+            proba = model.predict_proba(batch)
+            classes = [LABEL_MAPPING.get(int(c)) for c in model.classes_]
+            for row in proba:
+                best = int(row.argmax())
+                probs = {c: float(p) for c, p in zip(classes, row) if c is not None}
+                results.append((classes[best], float(row[best]), probs))
+        else:
+            for lbl in model.predict(batch):
+                cat = LABEL_MAPPING.get(int(lbl))
+                results.append((cat, 1.0, {cat: 1.0} if cat else {}))
+    return results
+
+
+def predict_proba(texts: List[str]) -> List[Dict[str, float]]:
+    """텍스트별 {카테고리: 확률} (LABEL_MAPPING에 없는 클래스는 빠짐)"""
+    return [probs for _, _, probs in classify(texts)]
+
+
+def _classify_docs(docs: List[dict]) -> List[Tuple[Optional[str], float, Dict[str, float]]]:
+    if CATEGORY_BACKEND != "embedding":
+        return classify([_text(src) for src in docs])
+
+    from labeler.ann_index import ann_vector
+    from labeler.category_head import classify_vectors, get_category_head
+
+    ids = [src["article_id"] for src in docs]
+    vectors = {}
+    try:
+        get_category_head()
+    except (RuntimeError, FileNotFoundError) as e:
+        # 헤드가 없거나 지금 임베딩 모델과 안 맞으면 이 묶음은 전부 본문을 읽어 pickle 로 (경고는 프로세스당 1번)
+        global _head_fallback_logged
+        if not _head_fallback_logged:
+            logger.warning(f"category head unavailable, fallback to text model: {e}")
+            _head_fallback_logged = True
+    else:
+        for article_id in ids:
+            vec = ann_vector(article_id)
+            if vec is not None:
+                vectors[article_id] = vec
+        vectors.update(get_vectors("article", [i for i in ids if i not in vectors]))
+
+    results: Dict[str, Tuple[Optional[str], float, Dict[str, float]]] = {}
+    with_vec = [i for i in ids if i in vectors]
+    if with_vec:
+        results.update(zip(with_vec, classify_vectors([vectors[i] for i in with_vec])))
+    without = [i for i in ids if i not in vectors]
+    if without:
+        resp = es.mget(index="article_data", ids=without, _source=_SOURCE_FIELDS)
+        found = [d["_source"] for d in resp["docs"] if d.get("found")]
+        results.update(zip([src["article_id"] for src in found], classify([_text(src) for src in found])))
+    return [results.get(i, (None, 0.0, {})) for i in ids]
+
+
+def _categorize_chunk(ids: List[str]) -> Tuple[Dict[str, str], Dict[str, dict], List[str], int, int]:
+    """
+    반환: (분류 {id: 카테고리}, 검토 {id: 검토 문서}, 삭제 id, 예측 건수, 재사용 건수)
+    """
+    # mget은 실시간 조회라 앞 단계(임베딩)가 방금 쓴 문서도 refresh 없이 읽힙니다
+    source = _HEAD_SOURCE_FIELDS if CATEGORY_BACKEND == "embedding" else _SOURCE_FIELDS
+    resp = es.mget(index="article_data", ids=ids, _source=source)
+    docs = [d["_source"] for d in resp["docs"] if d.get("found") and d["_source"].get("article_id")]
+    if not docs:
+        return {}, {}, [], 0, 0
+
+    # 근사 중복 그룹은 대표 1건만 예측하고 나머지는 대표(또는 이미 분류된 그룹 대표)의 카테고리를 복사합니다
+    plan = plan_reuse("category", docs, "article_label.category")
+    predicted = _classify_docs(plan.compute) if plan.compute else []
+    decisions = {src["article_id"]: p for src, p in zip(plan.compute, predicted)}
+    # 묶음 밖 대표에서 복사한 값은 이미 확정된 카테고리 문자열
+    for article_id, value in plan.resolve(decisions).items():
+        decisions[article_id] = value if isinstance(value, tuple) else (value, 1.0, {value: 1.0})
+
+    categories, review, null_cat = {}, {}, []
+    now = datetime.now(KST).isoformat()
+    for src in docs:
+        article_id = src["article_id"]
+        category, confidence, probs = decisions.get(article_id, (None, 0.0, {}))
+        if category is None:
+            # 대표가 분류되지 않은 그룹은 같이 삭제 대상이 됩니다
+            null_cat.append(article_id)
+        elif confidence < CATEGORY_MIN_PROBA:
+            top = sorted(probs.items(), key=lambda x: -x[1])[:3]
+            review[article_id] = {
+                "article_id": article_id,
+                "article_title": src.get("article_title") or "",
+                "predicted": category,
+                "confidence": round(confidence, 4),
+                "candidates": [{"category": c, "proba": round(p, 4)} for c, p in top],
+                "model": CATEGORY_BACKEND,
+                "created_at": now,
+            }
         else:
-            null_cat.append(a_id)
+            categories[article_id] = category
+    return categories, review, null_cat, len(plan.compute), plan.saved_cnt
+
+
+# article_id를 리스트 형태로 넣어주면 해당 기사들을 찾고 카테고리를 추가합니다
+def categorizer(article_list):
+
+    if not article_list:
+        return []
+
+    categories, review, null_cat = {}, {}, []
+    predicted_cnt = saved_cnt = 0
+    for i in range(0, len(article_list), CATEGORY_CHUNK):
+        c, r, n, p, s = _categorize_chunk(article_list[i:i + CATEGORY_CHUNK])
+        categories.update(c)
+        review.update(r)
+        null_cat.extend(n)
+        predicted_cnt += p
+        saved_cnt += s
+    if not categories and not review and not null_cat:
+        return []
 
-    actions = (
-        {
+    actions = []
+    for article_id, category in categories.items():
+        actions.append({
             "_op_type": "update",
             "_index": "article_data",
-            "_id": r["article_id"],  # ES 문서 _id가 article_id인 경우
+            "_id": article_id,  # ES 문서 _id가 article_id인 경우
             "doc": {
                 "article_label": {
-                    "category": r["category"]
+                    "category": category
                 },
                 "status": "3"
             }
-        }
-        for r in results
-    )
-
+        })
+    for article_id, doc in review.items():
+        actions.append({"_op_type": "index", "_index": REVIEW_INDEX, "_id": article_id, "_source": doc})
     for null_id in null_cat:
-        es.delete(index="article_data",id=null_id)
-        es.delete(index="article_raw",id=null_id)
+        actions.append({"_op_type": "delete", "_index": "article_data", "_id": null_id})
+        actions.append({"_op_type": "delete", "_index": "article_raw", "_id": null_id})
 
     if len(null_cat):
         error_doc = build_error_doc(
@@ -85,12 +233,51 @@ def categorizer(article_list):
     helpers.bulk(
         es,
         actions,
+        chunk_size=500,
         request_timeout=120,
         raise_on_error=False,
     )
+    if null_cat:
+        from labeler.ann_index import remove_articles
+
+        delete_vectors("article", null_cat)
+        remove_articles(null_cat)
+
+    print(
+        f"{len(categories)}개의 기사 카테고리 라벨링 성공 "
+        f"(예측 {predicted_cnt}건, 재사용 {saved_cnt}건, 검토 {len(review)}건, 삭제 {len(null_cat)}건)"
+    )
+    return list(categories)
+
+
+def release_reviewed(labels: Dict[str, str]) -> List[str]:
+    """
+    검토가 끝난 기사 {article_id: 카테고리} → 라벨 + status 3, 검토 문서 삭제,
+    스트리밍 파이프라인의 categorizer 다음 단계(신뢰도 → DB)를 그대로 이어서 실행
+    반환: 라벨을 쓴 article_id
+    """
+    from score.trust.trust_pipline import run_trust_pipeline
+    from util.repository import upsert_article
+
+    labels = {aid: cat for aid, cat in labels.items() if cat in LABEL_MAPPING.values()}
+    if not labels:
+        return []
+    actions = []
+    for article_id, category in labels.items():
+        actions.append({
+            "_op_type": "update",
+            "_index": "article_data",
+            "_id": article_id,
+            "doc": {"article_label": {"category": category}, "status": "3"},
+        })
+        actions.append({"_op_type": "delete", "_index": REVIEW_INDEX, "_id": article_id})
+    helpers.bulk(es, actions, chunk_size=500, request_timeout=120, raise_on_error=False)
+
+    ids = list(labels)
+    run_trust_pipeline(ids)
+    upsert_article(ids)
+    return ids
 
-    print(f"{len(results)}개의 기사 카테고리 라벨링 성공")
 
 if __name__ == "__main__":
     pass
-
@@ -0,0 +1,267 @@
+"""
+임베딩 기반 카테고리 분류기 (article_embedding 위의 선형 헤드)
+
+텍스트 분류 pickle(labeler.categorizer)은 제목 + 본문을 다시 벡터화하지만,
+임베딩 단계가 이미 768차원 article_embedding 을 만들어 두므로 그 위에 선형 헤드만 얹습니다.
+
+- 추론: softmax(X @ W.T + b) — 묶음 전체를 행렬곱 1번 (numpy만 사용, 기사당 수 µs)
+- 학습: sklearn LogisticRegression(multinomial) 으로 W, b를 구해 npz 로 저장 (CATEGORY_HEAD_PATH)
+  라벨은 ES에 저장된 article_label.category (현재 pickle 결과 + 그룹 재사용 값)
+- 근사 중복 그룹이 학습/평가에 나뉘어 들어가지 않도록 dup_group_id 해시로 나눕니다
+- 임베딩 모델이 바뀌면 헤드도 다시 학습해야 합니다 (npz 에 embed_model 기록, 다르면 로드 거부)
+
+학습 / 평가 (프로젝트 루트):
+    python -m labeler.category_head train --days 90
+    python -m labeler.category_head eval --days 14 --gold data/category_gold.jsonl
+categorizer 단계에서 쓰려면 CATEGORY_BACKEND=embedding
+"""
+import argparse
+import json
+import os
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from labeler.model_registry import EMBED_MODEL_NAME, registry
+from util.logger import Logger
+from util.vector_store import get_vectors
+
+logger = Logger().get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+CATEGORY_HEAD_PATH = os.getenv("CATEGORY_HEAD_PATH", "model/category_head.npz")
+TEST_PERCENT = 20
+
+
+class CategoryHead:
+    def __init__(self, weight: np.ndarray, bias: np.ndarray, classes: List[str], meta: Optional[dict] = None):
+        self.weight = np.ascontiguousarray(weight, dtype=np.float32)  # (classes, dim)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.classes = list(classes)
+        self.meta = meta or {}
+
+    def predict_proba(self, vectors) -> np.ndarray:
+        x = np.asarray(vectors, dtype=np.float32)
+        x = x / np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+        logits = x @ self.weight.T + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        e = np.exp(logits)
+        return e / e.sum(axis=1, keepdims=True)
+
+    def predict(self, vectors) -> List[str]:
+        return [self.classes[i] for i in self.predict_proba(vectors).argmax(axis=1)]
+
+    def save(self, path: str = CATEGORY_HEAD_PATH) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp.npz"
+        np.savez(tmp, weight=self.weight, bias=self.bias, classes=np.array(self.classes), meta=json.dumps(self.meta, ensure_ascii=False))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = CATEGORY_HEAD_PATH) -> "CategoryHead":
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"category head not found: {path} (python -m labeler.category_head train)")
+        data = np.load(path)
+        meta = json.loads(str(data["meta"]))
+        if meta.get("embed_model") != EMBED_MODEL_NAME:
+            raise RuntimeError(f"category head trained on {meta.get('embed_model')}, current {EMBED_MODEL_NAME}")
+        return cls(data["weight"], data["bias"], [str(c) for c in data["classes"]], meta)
+
+
+registry.register(
+    "category_head",
+    lambda: CategoryHead.load(),
+    lambda head: head.predict_proba(np.zeros((1, head.weight.shape[1]), dtype=np.float32)),
+    describe=lambda head: {"backend": "linear_head", "path": CATEGORY_HEAD_PATH, "trained_at": head.meta.get("trained_at")},
+)
+
+
+def get_category_head() -> CategoryHead:
+    return registry.get("category_head")
+
+
+def classify_vectors(vectors) -> List[Tuple[str, float, Dict[str, float]]]:
+    """벡터별 (카테고리, 최고 확률, {카테고리: 확률}) — labeler.categorizer.classify 와 같은 모양"""
+    head = get_category_head()
+    proba = head.predict_proba(vectors)
+    results = []
+    for row in proba:
+        best = int(row.argmax())
+        results.append((head.classes[best], float(row[best]), {c: float(p) for c, p in zip(head.classes, row)}))
+    return results
+
+
+# ---------- 학습 데이터 ----------
+def _is_test(group_id: str) -> bool:
+    return zlib.crc32(group_id.encode("utf-8")) % 100 < TEST_PERCENT
+
+
+def load_labeled(days: int, max_docs: int = 0, with_text: bool = False) -> List[dict]:
+    """최근 days일 분류된 기사 [{article_id, group_id, category, vector, text?}] (임베딩 없는 기사는 제외)"""
+    from util.backfill import scan_pages
+
+    query = {
+        "bool": {
+            "filter": [
+                {"range": {"collected_at": {"gte": f"now-{days}d/d"}}},
+                {"exists": {"field": "article_label.category"}},
+            ]
+        }
+    }
+    source = ["article_label.category", "dup_group_id"] + (["article_title", "article_content"] if with_text else [])
+    rows = []
+    for hits, _ in scan_pages(query, source, 1000, None):
+        vectors = get_vectors("article", [h["_id"] for h in hits])
+        for h in hits:
+            src = h.get("_source") or {}
+            vec = vectors.get(h["_id"])
+            if vec is None:
+                continue
+            row = {
+                "article_id": h["_id"],
+                "group_id": src.get("dup_group_id") or h["_id"],
+                "category": src["article_label"]["category"],
+                "vector": vec,
+            }
+            if with_text:
+                row["text"] = f"{src.get('article_title') or ''} {src.get('article_content') or ''}"
+            rows.append(row)
+        if max_docs and len(rows) >= max_docs:
+            return rows[:max_docs]
+    return rows
+
+
+def load_gold(path: str) -> Dict[str, str]:
+    """사람이 확인한 라벨 jsonl: {"article_id", "category"} 한 줄씩"""
+    gold = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                d = json.loads(line)
+                gold[d["article_id"]] = d["category"]
+    return gold
+
+
+# ---------- 학습 / 평가 ----------
+def train(rows: List[dict], c: float = 4.0) -> CategoryHead:
+    from sklearn.linear_model import LogisticRegression
+
+    x = np.asarray([r["vector"] for r in rows], dtype=np.float32)
+    x /= np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+    y = [r["category"] for r in rows]
+    clf = LogisticRegression(C=c, max_iter=2000)
+    clf.fit(x, y)
+    meta = {
+        "embed_model": EMBED_MODEL_NAME,
+        "trained_at": datetime.now(KST).isoformat(),
+        "train_docs": len(rows),
+        "c": c,
+    }
+    return CategoryHead(clf.coef_, clf.intercept_, [str(k) for k in clf.classes_], meta)
+
+
+def parity_report(head: CategoryHead, rows: List[dict], gold: Optional[Dict[str, str]] = None) -> dict:
+    """
+    평가 묶음에서 헤드 vs 현재 pickle
+    - stored_acc: ES에 저장된 라벨(현재 pickle 결과) 대비 정확도
+    - agreement: 같은 기사에 대한 두 모델 예측 일치율
+    - gold_acc: 사람이 확인한 라벨이 있으면 그 기준 정확도
+    - us_per_doc: 분류 시간 (pickle은 텍스트 벡터화 포함, 헤드는 임베딩 행렬곱만)
+    """
+    from sklearn.metrics import classification_report
+
+    from labeler.categorizer import classify
+
+    stored = [r["category"] for r in rows]
+    x = np.asarray([r["vector"] for r in rows], dtype=np.float32)
+
+    t0 = time.perf_counter()
+    head_pred = head.predict(x)
+    head_us = (time.perf_counter() - t0) * 1e6 / max(len(rows), 1)
+
+    report = {
+        "docs": len(rows),
+        "head": {"stored_acc": float(np.mean([a == b for a, b in zip(head_pred, stored)])), "us_per_doc": round(head_us, 2)},
+        "per_class": classification_report(stored, head_pred, output_dict=True, zero_division=0),
+    }
+
+    if rows and "text" in rows[0]:
+        t0 = time.perf_counter()
+        text_pred = [c for c, _, _ in classify([r["text"] for r in rows])]
+        text_us = (time.perf_counter() - t0) * 1e6 / max(len(rows), 1)
+        report["pickle"] = {"stored_acc": float(np.mean([a == b for a, b in zip(text_pred, stored)])), "us_per_doc": round(text_us, 2)}
+        report["agreement"] = float(np.mean([a == b for a, b in zip(head_pred, text_pred)]))
+    else:
+        text_pred = None
+
+    if gold:
+        idx = [i for i, r in enumerate(rows) if r["article_id"] in gold]
+        if idx:
+            truth = [gold[rows[i]["article_id"]] for i in idx]
+            report["gold_docs"] = len(idx)
+            report["head"]["gold_acc"] = float(np.mean([head_pred[i] == t for i, t in zip(idx, truth)]))
+            if text_pred is not None:
+                report["pickle"]["gold_acc"] = float(np.mean([text_pred[i] == t for i, t in zip(idx, truth)]))
+    return report
+
+
+def _print_report(report: dict) -> None:
+    print(f"eval docs                 : {report['docs']}" + (f" (gold {report['gold_docs']})" if "gold_docs" in report else ""))
+    for name in ("head", "pickle"):
+        if name not in report:
+            continue
+        r = report[name]
+        gold = f"  gold_acc={r['gold_acc']:.4f}" if "gold_acc" in r else ""
+        print(f"{name:<6} stored_acc={r['stored_acc']:.4f}{gold}  {r['us_per_doc']:10.2f} us/doc")
+    if "agreement" in report:
+        print(f"head vs pickle agreement  : {report['agreement']:.4f}")
+    for cls, m in report["per_class"].items():
+        if isinstance(m, dict) and cls not in ("macro avg", "weighted avg"):
+            print(f"  {cls:<6} precision={m['precision']:.3f} recall={m['recall']:.3f} n={int(m['support'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="article_embedding 선형 헤드 카테고리 분류기")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    for name in ("train", "eval"):
+        p = sub.add_parser(name)
+        p.add_argument("--days", type=int, default=90 if name == "train" else 14)
+        p.add_argument("--max-docs", type=int, default=0)
+        p.add_argument("--gold", default=None, help="사람이 확인한 라벨 jsonl (article_id, category)")
+        p.add_argument("--path", default=CATEGORY_HEAD_PATH)
+        p.add_argument("--no-pickle", action="store_true", help="현재 pickle 과 비교 생략 (본문 안 읽음)")
+    sub.choices["train"].add_argument("--c", type=float, default=4.0)
+    sub.choices["train"].add_argument("--min-acc", type=float, default=0.0, help="평가 정확도가 이보다 낮으면 저장 안 함")
+    sub.choices["eval"].add_argument("--all-groups", action="store_true", help="학습 묶음 그룹까지 평가 (기본: 평가 묶음만)")
+    args = parser.parse_args()
+
+    rows = load_labeled(args.days, args.max_docs, with_text=not args.no_pickle)
+    gold = load_gold(args.gold) if args.gold else None
+
+    if args.cmd == "train":
+        train_rows = [r for r in rows if not _is_test(r["group_id"])]
+        test_rows = [r for r in rows if _is_test(r["group_id"])]
+        print(f"train / eval docs         : {len(train_rows)} / {len(test_rows)}")
+        head = train(train_rows, c=args.c)
+        report = parity_report(head, test_rows, gold)
+        _print_report(report)
+        if report["head"]["stored_acc"] < args.min_acc:
+            print(f"stored_acc < {args.min_acc}, not saved")
+            raise SystemExit(1)
+        head.meta["eval"] = {k: v for k, v in report.items() if k != "per_class"}
+        head.save(args.path)
+        print(f"saved: {args.path}")
+    else:
+        head = CategoryHead.load(args.path)
+        if not args.all_groups:
+            # train 과 같은 평가 묶음만 (학습에 쓴 그룹이 섞이면 정확도가 부풀려짐)
+            rows = [r for r in rows if _is_test(r["group_id"])]
+        _print_report(parity_report(head, rows, gold))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,18 @@
 from util.elastic import es
 import numpy as np
 import re
-from sentence_transformers import SentenceTransformer
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
 from elasticsearch import helpers
 from datetime import datetime
+from typing import Optional
+
+from labeler.ann_index import index_embeddings
+from labeler.embedding_cache import get_embedding_cache
+from labeler.encode_planner import encode_planned
+from labeler.model_registry import get_embedding_model
+from labeler.related_store import store_related
+from util.near_dup import plan_reuse
+from util.vector_store import put_vectors
 
 
 #가중치 계산 함수
@@ -34,6 +42,62 @@ def sent_weights_tfidf_in_doc(sents: list[str], mode="sum") -> np.ndarray:
     w = w / (w.sum() + 1e-12)
     return w.astype(np.float32)
 
+# 묶음 전체 문장을 한 번에 해싱하는 벡터라이저 (어휘 사전을 만들지 않으므로 기사마다 fit 할 필요가 없음)
+# 열 수는 희소 행렬 메모리와 무관하므로 크게 잡아 한 기사 안 n-gram 해시 충돌을 사실상 없앱니다
+_SENT_HASH_FEATURES = 2 ** 30
+_SENT_HASHER = HashingVectorizer(
+    analyzer="char",
+    ngram_range=(3, 5),
+    n_features=_SENT_HASH_FEATURES,
+    alternate_sign=False,
+    norm=None,
+    dtype=np.float64,
+)
+
+
+def sent_weights_tfidf_batch(per_doc_sents: list[list[str]]) -> list[np.ndarray]:
+    """
+    sent_weights_tfidf_in_doc(mode="sum")를 여러 기사에 대해 한 번에 계산합니다
+    - 전체 문장을 HashingVectorizer로 한 번에 count 행렬로 만들고
+    - (기사, n-gram)별 문서 빈도를 np.unique 한 번으로 세서 기사 안 IDF(smooth_idf)를 그대로 재현
+    - 행 L2 정규화 / 행 합 / 기사별 softmax 까지 희소 행렬 값 배열 위에서 처리합니다
+    IDF는 기존과 같이 기사 안 문장 기준이라 가중치가 같습니다 (해시 충돌로 인한 오차만 있음)
+    """
+    lengths = np.array([len(sents) for sents in per_doc_sents], dtype=np.int64)
+    flat = [s for sents in per_doc_sents for s in sents]
+    if not flat:
+        return [np.array([], dtype=np.float32) for _ in per_doc_sents]
+
+    X = _SENT_HASHER.transform(flat).tocsr()  # (전체 문장 수, n_features) count
+    n_sents = X.shape[0]
+    row_of_nz = np.repeat(np.arange(n_sents), np.diff(X.indptr))
+    doc_of_nz = np.repeat(np.arange(len(per_doc_sents)), lengths)[row_of_nz]
+
+    # 같은 기사 안에서 그 n-gram이 나온 문장 수 = df
+    _, inverse, counts = np.unique(
+        doc_of_nz * _SENT_HASH_FEATURES + X.indices, return_inverse=True, return_counts=True
+    )
+    df = counts[inverse.ravel()]
+    n_doc = lengths[doc_of_nz]
+    vals = X.data * (np.log((1 + n_doc) / (1 + df)) + 1)
+
+    norms = np.sqrt(np.bincount(row_of_nz, weights=vals * vals, minlength=n_sents))
+    sums = np.bincount(row_of_nz, weights=vals, minlength=n_sents)
+    scores = np.divide(sums, norms, out=np.zeros(n_sents), where=norms > 0)
+
+    weights = []
+    for doc_scores in np.split(scores, np.cumsum(lengths)[:-1]):
+        if len(doc_scores) == 0:
+            weights.append(np.array([], dtype=np.float32))
+            continue
+        doc_scores = doc_scores + 1e-6
+        doc_scores = doc_scores - doc_scores.max()
+        w = np.exp(doc_scores)
+        w = w / (w.sum() + 1e-12)
+        weights.append(w.astype(np.float32))
+    return weights
+
+
 # L2 정규화를 통해 1에 가깝게 눌러줍니다
 def l2_normalize(v: np.ndarray, eps: float = 1e-12) -> np.ndarray:
     return v / (np.linalg.norm(v) + eps)
@@ -52,6 +116,7 @@ def build_doc_embeddings(
     alpha: float = 0.3,
     sent_weight_mode: str = "tfidf",
     max_sents: int = 40,
+    cache=None,
 ) -> dict[str, list[float]]:
     """
     input:
@@ -64,8 +129,27 @@ def build_doc_embeddings(
       {
         article_id: [float, float, ...]  # len = 768
       }
+
+    cache: labeler.embedding_cache.EmbeddingCache — 제목/본문/설정이 같은 기사는 캐시 벡터를 쓰고 miss만 인코딩
     """
 
+    # 캐시 조회: 내용 해시가 같은 기사는 인코딩 대상에서 뺍니다
+    cached = {}
+    keys = {}
+    if cache is not None:
+        recipe = f"alpha={alpha}|weight={sent_weight_mode}|max_sents={max_sents}"
+        for a in articles:
+            keys[a["article_id"]] = cache.key(
+                (a.get("article_title") or "").strip(),
+                (a.get("article_content") or "").strip(),
+                recipe,
+            )
+        hits = cache.get_many(list(set(keys.values())))
+        cached = {aid: hits[k] for aid, k in keys.items() if k in hits}
+        articles = [a for a in articles if a["article_id"] not in cached]
+        if not articles:
+            return cached
+
     per_doc_sents = []
     per_doc_weights = []
     titles = []
@@ -86,17 +170,14 @@ def build_doc_embeddings(
         if len(sents) > max_sents:
             sents = sents[:max_sents]
         
-        # 지정한 옵션에 따라 문장 가중치를 결정합니다. 저희는 디폴트로 sqrt_len 사용합니다
+        # 지정한 옵션에 따라 문장 가중치를 결정합니다. 저희는 디폴트로 tfidf 사용합니다
+        # tfidf는 묶음 전체를 한 번에 계산하므로 아래 루프 다음에 채웁니다 (tfidf_doc = 기사마다 fit 하던 기존 방식)
         if not sents:
             w = np.array([], dtype=np.float32)
-        elif sent_weight_mode == "tfidf":  # ✅ 추가
+        elif sent_weight_mode == "tfidf":
+            w = None
+        elif sent_weight_mode == "tfidf_doc":
             w = sent_weights_tfidf_in_doc(sents, mode="sum")
-
-            if len(w) > 0:
-                w[0] *= 1.3
-            if len(w) > 1:
-                w[1] *= 1.2
-
         elif sent_weight_mode == "uniform":
             w = np.ones(len(sents), dtype=np.float32)
         elif sent_weight_mode == "len":
@@ -109,8 +190,16 @@ def build_doc_embeddings(
         titles.append(title if title else " ")
         ids.append(a_id)
 
-    # 우선 제목 임베딩 리스트를 생성합니다
-    title_vecs = model.encode(titles, normalize_embeddings=False)
+    if sent_weight_mode == "tfidf":
+        per_doc_weights = sent_weights_tfidf_batch(per_doc_sents)
+
+    if sent_weight_mode in ("tfidf", "tfidf_doc"):
+        # 앞 문장(리드) 가중치 보정
+        for w in per_doc_weights:
+            if len(w) > 0:
+                w[0] *= 1.3
+            if len(w) > 1:
+                w[1] *= 1.2
 
     # 모든 문장의 임베딩 리스트를 생성합니다
     flat_sents = []
@@ -123,10 +212,12 @@ def build_doc_embeddings(
         spans.append((idx, idx + len(sents)))
         idx += len(sents)
     
-    # 모든 문장을 batch로 벡터화합니다
-    sent_vecs = (
-        model.encode(flat_sents, normalize_embeddings=False)
-        if flat_sents else None
+    # 제목 + 모든 문장을 한 번에 벡터화합니다
+    # 중복 문장(기자 서명, 통신사 표기 등)은 1번만, 길이가 비슷한 문장끼리 묶어서 인코딩한 뒤 원래 순서로 되돌립니다
+    (title_vecs, sent_vecs), plan_stats = encode_planned(model, [titles, flat_sents])
+    print(
+        f"인코딩 {plan_stats['unique']}/{plan_stats['texts']}문장 "
+        f"(중복 제거 {plan_stats['dedup_ratio']:.1%}, 패딩 감소 {plan_stats['padding_avoided_ratio']:.1%})"
     )
 
     # 이제 분리된 제목과 본문을 합치고 기사별 벡터를 생성합니다
@@ -147,75 +238,97 @@ def build_doc_embeddings(
         Edoc = alpha * Et + (1 - alpha) * Ebody
         Edoc = l2_normalize(Edoc.astype(np.float32))
         doc_embeddings[aid] = Edoc.tolist()  # ES 저장용 list
+
+    if cache is not None:
+        cache.put_many({keys[aid]: vec for aid, vec in doc_embeddings.items()})
+        doc_embeddings.update(cached)
     return doc_embeddings
 
 
 # 원하는 기사 식별키의 목록을 넣고 임베딩 필드를 업데이트 시키는 함수입니다
-def create_embedding(article_list):
-    model = SentenceTransformer("snunlp/KR-SBERT-V40K-klueNLI-augSTS")
-    # 1) 원하는 _id(=article_id)들을 mget으로 정확히 조회
-    resp = es.mget(
-        index="article_data",
-        body={"ids": article_list},
-        _source=["article_id", "article_title", "article_content"]
-    )
+# 모델은 labeler.model_registry에서 프로세스당 1번만 로드해 스트리밍/backfill/쿼리 임베딩이 공유합니다
+def embed_articles(articles: list[dict], status: Optional[int] = 2, reuse: bool = True) -> int:
+    """
+    {article_id, article_title, article_content, dup_group_id} 리스트 → 임베딩 → article_data bulk update
+    - status가 None이면 상태는 건드리지 않습니다 (재임베딩용)
+    - reuse=True면 근사 중복 그룹 대표의 임베딩을 복사하고 대표만 인코딩합니다 (util.near_dup)
+      모델이 바뀐 재임베딩에서는 예전 벡터를 복사하면 안 되므로 reuse=False
+    - 제목/본문이 그대로인 기사는 임베딩 캐시(모델 버전 포함 키)에서 가져옵니다
+    - 쓰고 나면 연관 기사 목록(related_ids/related_scores)도 함께 계산합니다
+    - 반환: 업데이트 성공 건수
+    """
+    if not articles:
+        return 0
 
-    # 2) 존재하는 문서만 추출 (없는 id는 누락됨)
-    articles = [d["_source"] for d in resp["docs"] if d.get("found")]
-
-    # (옵션) 못 찾은 id 로그
-    not_found = [d["_id"] for d in resp["docs"] if not d.get("found")]
-    if not_found:
-        print(f"[warn] not found ids: {len(not_found)} (ex: {not_found[:5]})")
+    plan = plan_reuse("embedding", articles, "article_embedding") if reuse else None
+    targets = plan.compute if plan else articles
 
     doc_embeddings = build_doc_embeddings(
-        articles=articles,
-        model=model,
+        articles=targets,
+        model=get_embedding_model(),
         sent_weight_mode="tfidf",
-    )
+        cache=get_embedding_cache(),
+    ) if targets else {}
+    if plan:
+        doc_embeddings.update(plan.resolve(doc_embeddings))
+        if plan.saved_cnt:
+            print(f"임베딩 재사용 {plan.saved_cnt}건 (인코딩 {len(targets)}건)")
+
+    def _doc(vec):
+        doc = {"article_embedding": vec}
+        if status is not None:
+            doc["status"] = status
+        return doc
 
     actions = (
         {
             "_op_type": "update",
             "_index": "article_data",
             "_id": article_id,
-            "doc": {"article_embedding": vec , "status":2}
+            "doc": _doc(vec)
         }
         for article_id, vec in doc_embeddings.items()
     )
 
-    helpers.bulk(es, actions, chunk_size=500, request_timeout=120)
-    print("임베딩 생성 성공")
-
+    success, _ = helpers.bulk(es, actions, chunk_size=500, request_timeout=120, raise_on_error=False)
+    # float 사본 (article_data 는 int8 양자화 + _source 제외, util.vector_store)
+    put_vectors("article", doc_embeddings)
 
-def re_embedding():
-    model = SentenceTransformer("snunlp/KR-SBERT-V40K-klueNLI-augSTS")
-    body = {
-        "_source": ["article_id", "article_title", "article_content"],
-        "size": 500,
-    }
-    resp = es.search(index="article_data", body=body)
-    articles = [h["_source"] for h in resp["hits"]["hits"]]
+    # 연관 기사 사이드카 인덱스에도 바로 반영 (labeler.ann_index)
+    index_embeddings(doc_embeddings, status)
+    # 연관 기사 목록 미리 계산 + 더 가까운 이웃이 생긴 예전 기사 목록 갱신 (labeler.related_store)
+    related = store_related(doc_embeddings)
+    if related["refreshed"]:
+        print(f"연관 기사 목록 {related['computed']}건 계산, 예전 기사 {related['refreshed']}건 갱신")
+    return success
 
-    doc_embeddings = build_doc_embeddings(articles= articles, model=model)
 
-    actions = (
-        {
-            "_op_type": "update",
-            "_index": "article_data",
-            "_id": article_id,
-            "doc": {
-                "article_embedding": vec  # ← 필드 지정
-            }
-        }
-        for article_id, vec in doc_embeddings.items()
+def create_embedding(article_list):
+    if not article_list:
+        return
+    # 1) 원하는 _id(=article_id)들을 mget으로 정확히 조회
+    resp = es.mget(
+        index="article_data",
+        body={"ids": article_list},
+        _source=["article_id", "article_title", "article_content", "dup_group_id"]
     )
 
-    # es에 모든 내용을 한번에 올립니다
-    helpers.bulk(es, actions, chunk_size=500, request_timeout=120)
-    print("작업 성공")
+    # 2) 존재하는 문서만 추출 (없는 id는 누락됨)
+    articles = [d["_source"] for d in resp["docs"] if d.get("found")]
+
+    # (옵션) 못 찾은 id 로그
+    not_found = [d["_id"] for d in resp["docs"] if not d.get("found")]
+    if not_found:
+        print(f"[warn] not found ids: {len(not_found)} (ex: {not_found[:5]})")
+
+    embed_articles(articles, status=2)
+    print("임베딩 생성 성공")
 
-if __name__ == "__main__":
-    re_embedding()
 
+def re_embedding(**options) -> dict:
+    """article_data 전체(또는 날짜/상태 조건)를 재임베딩합니다. 옵션은 util.backfill.run_backfill 참고"""
+    from util.backfill import run_backfill
+    return run_backfill("re_embedding", **options)
 
+if __name__ == "__main__":
+    re_embedding()
@@ -0,0 +1,162 @@
+"""
+기사 임베딩 캐시 (ES 보조 인덱스 embedding_cache)
+
+- 키: sha256(모델 이름/백엔드/버전 + 임베딩 조합 설정 + 제목 + 본문) — 내용이 같으면 같은 키
+  제목/본문이 그대로인 기사를 다시 임베딩할 때(재수집, 재임베딩 backfill 등) 인코딩을 건너뜁니다
+- 모델 파일을 같은 이름으로 교체했다면 EMBED_CACHE_VERSION을 올려서 예전 벡터를 무효화하세요
+- 조회는 mget(실시간), 저장은 helpers.bulk — ES 오류는 miss로 처리하고 임베딩은 계속 진행합니다
+- 누적 hit/miss는 log_cache_stats()로 info_logs에 남기고 카운터를 비웁니다
+"""
+import hashlib
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from elasticsearch import helpers
+
+from labeler.model_registry import EMBED_MODEL_NAME, embedding_backend
+from util.elastic import es
+from util.elastic_templates import build_info_docs
+from util.logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+CACHE_INDEX = "embedding_cache"
+EMBED_CACHE_ENABLED = os.getenv("EMBED_CACHE_ENABLED", "1") != "0"
+EMBED_CACHE_VERSION = os.getenv("EMBED_CACHE_VERSION", "1")
+
+# 벡터는 검색하지 않으므로 _source에만 두고 매핑하지 않습니다 (dynamic: false)
+_MAPPINGS = {
+    "dynamic": False,
+    "properties": {
+        "model_version": {"type": "keyword"},
+        "created_at": {"type": "date"},
+    },
+}
+
+
+class EmbeddingCache:
+    def __init__(self, index: str = CACHE_INDEX, model_version: Optional[str] = None):
+        self.index = index
+        self._model_version = model_version
+        self._lock = threading.Lock()
+        self._index_ready = False
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.errors = 0
+
+    @property
+    def model_version(self) -> str:
+        # torch / onnx_int8 벡터는 조금씩 달라서 백엔드도 키에 넣습니다
+        return self._model_version or f"{EMBED_MODEL_NAME}@{embedding_backend()}@{EMBED_CACHE_VERSION}"
+
+    def key(self, title: str, content: str, recipe: str) -> str:
+        raw = "\x1f".join((self.model_version, recipe, title, content))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        if not keys:
+            return {}
+        found = {}
+        try:
+            resp = es.mget(index=self.index, ids=keys, _source=["vector"])
+            for d in resp["docs"]:
+                vec = (d.get("_source") or {}).get("vector") if d.get("found") else None
+                if vec:
+                    found[d["_id"]] = vec
+        except Exception as e:
+            # 인덱스가 아직 없거나 ES 오류 → 전부 miss
+            logger.info(f"embedding cache lookup skipped: {e}")
+            with self._lock:
+                self.errors += 1
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, vectors: Dict[str, List[float]]) -> None:
+        if not vectors:
+            return
+        now = datetime.now(KST).isoformat()
+        actions = (
+            {
+                "_op_type": "index",
+                "_index": self.index,
+                "_id": key,
+                "_source": {"vector": vec, "model_version": self.model_version, "created_at": now},
+            }
+            for key, vec in vectors.items()
+        )
+        try:
+            self._ensure_index()
+            success, _ = helpers.bulk(es, actions, chunk_size=500, request_timeout=120, raise_on_error=False)
+        except Exception as e:
+            logger.warning(f"embedding cache store failed: {e}")
+            with self._lock:
+                self.errors += 1
+            return
+        with self._lock:
+            self.stored += success
+
+    def snapshot(self, reset: bool = False) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "lookups": lookups,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stored": self.stored,
+                "errors": self.errors,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+            if reset:
+                self.hits = self.misses = self.stored = self.errors = 0
+        return stats
+
+    def _ensure_index(self) -> None:
+        if self._index_ready:
+            return
+        if not es.indices.exists(index=self.index):
+            try:
+                es.indices.create(index=self.index, mappings=_MAPPINGS)
+            except Exception as e:
+                # 동시에 만든 경우(resource_already_exists)는 무시
+                if "already_exists" not in str(e):
+                    raise
+        self._index_ready = True
+
+
+embedding_cache = EmbeddingCache()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    return embedding_cache if EMBED_CACHE_ENABLED else None
+
+
+def log_cache_stats(run_id: str, job_id: str) -> Dict[str, float]:
+    """이번 실행 동안의 캐시 hit/miss를 info_logs(stage=embedding_cache_end)에 남기고 카운터를 비웁니다"""
+    stats = embedding_cache.snapshot(reset=True)
+    if not stats["lookups"]:
+        return stats
+    es.index(
+        index="info_logs",
+        document=build_info_docs(
+            run_id=run_id,
+            job_id=job_id,
+            component="embedding",
+            stage="embedding_cache_end",
+            status="warn" if stats["errors"] else "ok",
+            input_cnt=stats["lookups"],
+            success_cnt=stats["hits"],
+            failed_cnt=stats["misses"],
+            message=(
+                f"hit_rate={stats['hit_rate']:.2%} stored={stats['stored']} "
+                f"errors={stats['errors']} model_version={embedding_cache.model_version}"
+            ),
+        )
+    )
+    return stats
@@ -0,0 +1,89 @@
+"""
+문장 인코딩 계획 (build_doc_embeddings 용)
+
+- 한 묶음의 제목 + 본문 문장을 한 리스트로 모아 같은 문장은 1번만 인코딩합니다
+  (기자 서명, 통신사 표기, "무단 전재 및 재배포 금지" 같은 상투 문장이 기사마다 반복됨)
+- 고유 문장을 길이 순으로 정렬하고 길이 버킷(LENGTH_BUCKETS)별로 batch_size씩 인코딩 → 패딩 낭비 감소
+- 결과 벡터는 원래 순서로 되돌려(scatter) 기존 spans 그대로 사용할 수 있게 반환합니다
+
+패딩 낭비는 글자 수 기준 근사치입니다 (batch마다 최장 길이 x 개수 - 실제 길이 합).
+기준(baseline)은 기존 방식 = 제목/문장을 따로 encode 하고 중복도 그대로 인코딩하는 경우입니다
+(SentenceTransformer.encode는 호출 안에서 길이 정렬을 하므로 기준도 정렬된 것으로 계산).
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+ENCODE_BATCH_SIZE = 32
+# 길이(글자) 버킷 경계 — batch가 버킷을 넘지 않게 잘라서 한 batch 안 길이 차이를 줄입니다
+LENGTH_BUCKETS = (16, 32, 48, 64, 96, 128, 192, 256)
+
+
+def _bucket_of(length: int) -> int:
+    for i, edge in enumerate(LENGTH_BUCKETS):
+        if length <= edge:
+            return i
+    return len(LENGTH_BUCKETS)
+
+
+def _padding_waste(lengths: List[int], batch_size: int) -> int:
+    waste = 0
+    for i in range(0, len(lengths), batch_size):
+        batch = lengths[i:i + batch_size]
+        waste += max(batch) * len(batch) - sum(batch)
+    return waste
+
+
+def encode_planned(
+    model,
+    groups: List[List[str]],
+    batch_size: int = ENCODE_BATCH_SIZE,
+) -> Tuple[List[np.ndarray], Dict[str, float]]:
+    """
+    groups: 따로 encode 하던 텍스트 리스트들 (예: [titles, flat_sents])
+    반환: (groups와 같은 모양의 벡터 배열 리스트, 통계)
+    통계: texts, unique, dedup_ratio,
+          padding_chars_arrival(도착 순서로 묶었다면), padding_chars_baseline(기존), padding_chars_planned,
+          padding_avoided_ratio(기존 대비)
+    """
+    texts = [t for group in groups for t in group]
+
+    # 1) 고유 문장 → 인덱스
+    index_of: Dict[str, int] = {}
+    unique: List[str] = []
+    for t in texts:
+        if t not in index_of:
+            index_of[t] = len(unique)
+            unique.append(t)
+
+    # 2) 길이 순 정렬 → 길이 버킷별로 나눠 인코딩 (버킷 안은 encode 내부 정렬과 같은 순서)
+    order = sorted(range(len(unique)), key=lambda i: -len(unique[i]))
+    buckets: Dict[int, List[int]] = {}
+    for i in order:
+        buckets.setdefault(_bucket_of(len(unique[i])), []).append(i)
+
+    vecs = None
+    for members in buckets.values():
+        encoded = model.encode([unique[i] for i in members], batch_size=batch_size, normalize_embeddings=False)
+        if vecs is None:
+            vecs = np.empty((len(unique), encoded.shape[1]), dtype=encoded.dtype)
+        vecs[members] = encoded
+
+    # 3) 원래 순서로 되돌리기
+    out = []
+    for group in groups:
+        out.append(vecs[[index_of[t] for t in group]] if group else None)
+
+    arrival = sum(_padding_waste([len(t) for t in g], batch_size) for g in groups if g)
+    baseline = sum(_padding_waste(sorted((len(t) for t in g), reverse=True), batch_size) for g in groups if g)
+    planned = sum(_padding_waste([len(unique[i]) for i in members], batch_size) for members in buckets.values())
+    stats = {
+        "texts": len(texts),
+        "unique": len(unique),
+        "dedup_ratio": round(1 - len(unique) / len(texts), 4) if texts else 0.0,
+        "padding_chars_arrival": arrival,
+        "padding_chars_baseline": baseline,
+        "padding_chars_planned": planned,
+        "padding_avoided_ratio": round(1 - planned / baseline, 4) if baseline else 0.0,
+    }
+    return out, stats
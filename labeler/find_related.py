@@ -1,19 +1,34 @@
 import json
 from util.elastic import es
+from labeler.ann_index import ann_neighbors, ann_vector
+from labeler.related_store import load_related
+from util.vector_store import get_vector
 
 def similar_articles(article_id):
-    body = {
-        "_source": ["article_embedding"],
-        "size": 1,
-        "query": {"term": {"article_id": article_id}}
-    }
+    # 임베딩 단계에서 미리 계산한 목록이 있으면 get 한 번으로 끝 (labeler.related_store)
+    stored = load_related(article_id)
+    if stored is not None:
+        # 다른 경로와 같은 모양: 자기 자신이 첫 번째
+        return [{"article_id": article_id, "score": 1.0}] + [
+            {"article_id": aid, "score": score} for aid, score in stored[:4]
+        ]
 
-    resp = es.search(index="article_data", body=body)
-    hits = resp["hits"]["hits"]
-    if not hits:
-        raise ValueError("No document found for article_id")
+    # 사이드카 인덱스(labeler.ann_index)에 기사 자신이 있을 때만 인덱스로 찾습니다
+    # (인덱스는 최근 ANN_WINDOW_DAYS일만 보관 → 그보다 오래된 기사는 자신도 빠지고 이웃도 잘리므로 ES kNN)
+    query_vec = ann_vector(article_id)
+    if query_vec is not None:
+        # 자기 자신은 빼고 찾아서 맨 앞에 붙입니다 (호출 쪽에서 [1:] 사용, 동점 중복 기사와 순서가 섞이지 않게)
+        neighbors = ann_neighbors(query_vec, k=4, exclude=[article_id])
+        if neighbors is not None:
+            return [{"article_id": article_id, "score": 1.0}] + [
+                {"article_id": aid, "score": score} for aid, score in neighbors
+            ]
+    else:
+        # _source 에는 벡터가 없으므로 float 사본에서 읽습니다 (util.vector_store)
+        query_vec = get_vector("article", article_id)
+        if query_vec is None:
+            raise ValueError("No document found for article_id")
 
-    query_vec = hits[0]["_source"]["article_embedding"]
     res = es.search(
         index="article_data",
         size=5,
@@ -37,5 +52,3 @@ def similar_articles(article_id):
 
 # if __name__ == "__main__":
     # similar_articles(article_id)
-
-
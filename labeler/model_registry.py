@@ -0,0 +1,228 @@
+"""
+프로세스 단위 모델 레지스트리
+
+- 모델은 처음 쓰는 순간 1번만 로드하고(lazy), 이후 모든 단계가 같은 인스턴스를 공유합니다
+  (스트리밍 임베딩 단계 / 재임베딩 backfill / 온라인 쿼리 임베딩)
+- 로드 직후 짧은 문장으로 warm-up 1번 → 첫 요청에서 생기는 지연(커널/메모리 할당)을 로드 시점으로 당김
+- torch 스레드 수를 명시적으로 고정합니다 (API 워커/스케줄러가 한 프로세스에서 CPU를 나눠 쓰므로)
+- 로드/워밍업 시간, 파라미터 메모리, RSS 증가량을 info_logs에 남기고 model_stats()로 조회
+- 임베딩 모델은 EMBED_BACKEND로 torch / onnx_int8(labeler.onnx_embedder) 중 선택합니다
+
+사용법:
+    from labeler.model_registry import get_embedding_model, embed_query
+    model = get_embedding_model()
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from util.elastic import es
+from util.elastic_templates import build_info_docs
+from util.logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+EMBED_MODEL_NAME = os.getenv("EMBED_MODEL_NAME", "snunlp/KR-SBERT-V40K-klueNLI-augSTS")
+# torch(fp32 PyTorch) | onnx_int8(labeler.onnx_embedder, 내보낸 모델이 없으면 torch로 대체)
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch")
+# 모델 스레드 수 (0이면 torch 기본값 유지)
+MODEL_NUM_THREADS = int(os.getenv("MODEL_NUM_THREADS", str(min(4, os.cpu_count() or 1))))
+
+_WARMUP_TEXTS = ["모델 워밍업 문장입니다.", "정부는 이번 발표에서 새로운 계획을 밝혔다."]
+
+
+def _rss_bytes() -> int:
+    """현재 프로세스 RSS (linux /proc 기준, 못 읽으면 0)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _param_bytes(model) -> int:
+    try:
+        return sum(p.numel() * p.element_size() for p in model.parameters())
+    except Exception:
+        return 0
+
+
+_threads_configured = False
+
+
+def _configure_threads() -> None:
+    global _threads_configured
+    if _threads_configured or MODEL_NUM_THREADS <= 0:
+        return
+    import torch
+
+    torch.set_num_threads(MODEL_NUM_THREADS)
+    _threads_configured = True
+
+
+class ModelRegistry:
+    """
+    name → loader 등록, get(name) 최초 호출 시 로드 + warm-up
+    - 같은 모델을 여러 스레드가 동시에 처음 요청해도 로드는 1번만 (모델별 lock)
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._warmups: Dict[str, Optional[Callable[[Any], None]]] = {}
+        self._describes: Dict[str, Optional[Callable[[Any], Dict[str, Any]]]] = {}
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        warmup: Optional[Callable[[Any], None]] = None,
+        describe: Optional[Callable[[Any], Dict[str, Any]]] = None,
+    ) -> None:
+        """describe: 로드된 모델 → stats에 덧붙일 정보 (예: 실제로 쓰인 백엔드)"""
+        with self._lock:
+            self._loaders[name] = loader
+            self._warmups[name] = warmup
+            self._describes[name] = describe
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._locks[name]:
+            model = self._models.get(name)
+            if model is None:
+                model = self._load(name)
+        return model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: dict(s) for name, s in self._stats.items()}
+
+    def unload(self, name: str) -> None:
+        """테스트/메모리 회수용 — 다음 get에서 다시 로드합니다"""
+        with self._locks[name]:
+            self._models.pop(name, None)
+            self._stats.pop(name, None)
+
+    def _load(self, name: str):
+        _configure_threads()
+        rss0 = _rss_bytes()
+        t0 = time.monotonic()
+        model = self._loaders[name]()
+        t_load = time.monotonic()
+
+        warmup = self._warmups.get(name)
+        if warmup is not None:
+            warmup(model)
+        t_warm = time.monotonic()
+
+        stats = {
+            "loaded_at": datetime.now(KST).isoformat(),
+            "load_ms": int((t_load - t0) * 1000),
+            "warmup_ms": int((t_warm - t_load) * 1000),
+            "param_mb": round(_param_bytes(model) / 2**20, 1),
+            "rss_delta_mb": round(max(0, _rss_bytes() - rss0) / 2**20, 1),
+            "num_threads": MODEL_NUM_THREADS,
+        }
+        describe = self._describes.get(name)
+        if describe is not None:
+            stats.update(describe(model))
+        self._models[name] = model
+        self._stats[name] = stats
+        logger.info(f"model loaded: {name} {stats}")
+        self._log_load(name, stats)
+        return model
+
+    def _log_load(self, name: str, stats: Dict[str, Any]) -> None:
+        try:
+            es.index(
+                index="info_logs",
+                document=build_info_docs(
+                    run_id=datetime.now(KST).strftime("%Y%m%d_%H"),
+                    job_id="model_registry",
+                    component="model",
+                    stage=f"{name}_load_end",
+                    status="ok",
+                    duration_ms=stats["load_ms"] + stats["warmup_ms"],
+                    message=(
+                        f"load_ms={stats['load_ms']} warmup_ms={stats['warmup_ms']} "
+                        f"param_mb={stats['param_mb']} rss_delta_mb={stats['rss_delta_mb']} "
+                        f"threads={stats['num_threads']} backend={stats.get('backend', '-')}"
+                    ),
+                )
+            )
+        except Exception as e:
+            # 로그 적재 실패로 모델 사용이 막히면 안 됩니다
+            logger.warning(f"model load log failed: {e}")
+
+
+registry = ModelRegistry()
+
+
+_embedding_backend = None
+
+
+def _load_embedding_model():
+    global _embedding_backend
+    if EMBED_BACKEND == "onnx_int8":
+        from labeler import onnx_embedder
+
+        try:
+            model = onnx_embedder.load_quantized(num_threads=MODEL_NUM_THREADS)
+            _embedding_backend = f"onnx_int8:{onnx_embedder.EMBED_ONNX_QCONFIG}"
+            return model
+        except (RuntimeError, FileNotFoundError) as e:
+            logger.warning(f"onnx backend unavailable, fallback to torch: {e}")
+
+    from sentence_transformers import SentenceTransformer
+
+    _embedding_backend = "torch"
+    return SentenceTransformer(EMBED_MODEL_NAME)
+
+
+def embedding_backend() -> str:
+    """실제로 로드된 임베딩 백엔드 (로드 전이면 설정값)"""
+    return _embedding_backend or EMBED_BACKEND
+
+
+def _warmup_embedding_model(model) -> None:
+    model.encode(_WARMUP_TEXTS, normalize_embeddings=False)
+
+
+registry.register(
+    "embedding",
+    _load_embedding_model,
+    _warmup_embedding_model,
+    describe=lambda model: {"backend": _embedding_backend},
+)
+
+
+def get_embedding_model():
+    """문장 임베딩 모델 (프로세스당 1개)"""
+    return registry.get("embedding")
+
+
+def embed_query(texts: List[str]) -> List[List[float]]:
+    """
+    온라인 검색/추천용 쿼리 임베딩 — 기사 임베딩과 같은 모델, L2 정규화된 벡터
+    (기사 벡터도 정규화되어 있어서 cosine / dot_product 검색에 바로 쓸 수 있습니다)
+    """
+    if not texts:
+        return []
+    vecs = get_embedding_model().encode(texts, normalize_embeddings=True)
+    return [v.tolist() for v in vecs]
+
+
+def model_stats() -> Dict[str, Dict[str, Any]]:
+    return registry.stats()
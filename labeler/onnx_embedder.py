@@ -0,0 +1,99 @@
+"""
+KR-SBERT ONNX(int8 동적 양자화) CPU 추론 백엔드
+
+서버에 GPU가 없어 PyTorch fp32 encode가 임베딩 단계 시간 대부분을 차지합니다.
+sentence-transformers의 ONNX 백엔드(optimum + onnxruntime)로 모델을 내보내고 int8 동적 양자화한 뒤
+같은 SentenceTransformer 파이프라인(토크나이저 → transformer → mean pooling)으로 실행합니다.
+
+설정 (labeler.model_registry 가 읽음):
+    EMBED_BACKEND=onnx_int8     # 기본 torch
+    EMBED_ONNX_DIR=model/kr-sbert-onnx
+    EMBED_ONNX_QCONFIG=avx2     # arm64 | avx2 | avx512 | avx512_vnni (서버 CPU에 맞게)
+
+내보내기 (프로젝트 루트, 1번만):
+    python -m labeler.onnx_embedder --qconfig avx2
+    → 이후 bench.bench_embed_backends 로 cosine 일치/처리량 확인
+
+의존성(requirements-optional.txt: optimum[onnxruntime])이 없거나 내보낸 파일이 없으면 model_registry가 torch 백엔드로 되돌아갑니다.
+"""
+import argparse
+import os
+from pathlib import Path
+
+from util.logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+try:
+    import onnxruntime as ort
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    HAS_ONNX = True
+except ImportError:
+    ort = None
+    export_dynamic_quantized_onnx_model = None
+    HAS_ONNX = False
+
+EMBED_ONNX_DIR = os.getenv("EMBED_ONNX_DIR", "model/kr-sbert-onnx")
+EMBED_ONNX_QCONFIG = os.getenv("EMBED_ONNX_QCONFIG", "avx2")
+
+
+def quantized_file_name(qconfig: str = EMBED_ONNX_QCONFIG) -> str:
+    # export_dynamic_quantized_onnx_model 이 저장하는 파일 이름 규칙
+    return f"onnx/model_qint8_{qconfig}.onnx"
+
+
+def is_exported(onnx_dir: str = EMBED_ONNX_DIR, qconfig: str = EMBED_ONNX_QCONFIG) -> bool:
+    return (Path(onnx_dir) / quantized_file_name(qconfig)).exists()
+
+
+def export_quantized(model_name: str, onnx_dir: str = EMBED_ONNX_DIR, qconfig: str = EMBED_ONNX_QCONFIG) -> str:
+    """원본 모델 → ONNX(fp32) 저장 → int8 동적 양자화 파일 추가. 양자화 파일 경로를 반환"""
+    if not HAS_ONNX:
+        raise RuntimeError("ONNX 백엔드 의존성이 없습니다: pip install -r requirements-optional.txt")
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, backend="onnx")
+    model.save(onnx_dir)
+    export_dynamic_quantized_onnx_model(model, quantization_config=qconfig, model_name_or_path=onnx_dir)
+    path = str(Path(onnx_dir) / quantized_file_name(qconfig))
+    logger.info(f"onnx int8 model exported: {path}")
+    return path
+
+
+def load_quantized(onnx_dir: str = EMBED_ONNX_DIR, qconfig: str = EMBED_ONNX_QCONFIG, num_threads: int = 0):
+    """내보낸 int8 모델을 SentenceTransformer(backend="onnx")로 로드 — encode 사용법은 torch 모델과 같습니다"""
+    if not HAS_ONNX:
+        raise RuntimeError("ONNX 백엔드 의존성이 없습니다: pip install -r requirements-optional.txt")
+    if not is_exported(onnx_dir, qconfig):
+        raise FileNotFoundError(f"onnx 모델이 없습니다: {Path(onnx_dir) / quantized_file_name(qconfig)}")
+    from sentence_transformers import SentenceTransformer
+
+    session_options = ort.SessionOptions()
+    if num_threads > 0:
+        session_options.intra_op_num_threads = num_threads
+        session_options.inter_op_num_threads = 1
+    return SentenceTransformer(
+        onnx_dir,
+        backend="onnx",
+        model_kwargs={
+            "file_name": quantized_file_name(qconfig),
+            "provider": "CPUExecutionProvider",
+            "session_options": session_options,
+        },
+    )
+
+
+def main():
+    from labeler.model_registry import EMBED_MODEL_NAME
+
+    parser = argparse.ArgumentParser(description="KR-SBERT → ONNX int8 내보내기")
+    parser.add_argument("--model", default=EMBED_MODEL_NAME)
+    parser.add_argument("--out", default=EMBED_ONNX_DIR)
+    parser.add_argument("--qconfig", default=EMBED_ONNX_QCONFIG, choices=["arm64", "avx2", "avx512", "avx512_vnni"])
+    args = parser.parse_args()
+    print(export_quantized(args.model, args.out, args.qconfig))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+연관 기사 미리 계산 (article_data.related_ids / related_scores)
+
+기사 페이지/연관 기사 API가 요청마다 임베딩 조회 + kNN(50~1000 후보)을 돌리던 것을
+임베딩 단계에서 한 번 계산해 기사 문서에 저장하고, 읽을 때는 get 1번 + mget 1번으로 끝냅니다.
+
+- 저장: 이웃을 점수 내림차순으로 RELATED_TOP_K개 (점수는 ES cosine kNN _score 와 같은 (1 + cos) / 2)
+  유사도 구간/언론사 중복 같은 화면별 필터는 읽는 쪽에서 그대로 적용합니다 (그래서 넉넉히 저장)
+- 이웃 찾기: 사이드카 인덱스(labeler.ann_index), 못 쓰면 ES kNN
+- 갱신: 새 기사가 예전 기사의 이웃 목록 최하위보다 가까우면 그 기사 목록에도 끼워 넣습니다
+  (목록이 아직 없는 예전 기사는 건드리지 않음 → 읽는 쪽이 기존 kNN 경로로 대체)
+- 삭제된 기사가 목록에 남아 있어도 mget에서 found=False 로 빠집니다
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from elasticsearch import helpers
+
+from labeler.ann_index import ANN_WINDOW_DAYS, _days_ago, _to_yyyymmdd, ann_neighbors
+from util.elastic import es
+from util.logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+RELATED_ENABLED = os.getenv("RELATED_PRECOMPUTE", "1") != "0"
+RELATED_TOP_K = int(os.getenv("RELATED_TOP_K", "30"))
+
+_FIELDS = ["related_ids", "related_scores"]
+
+
+def _neighbors(article_id: str, vector, k: int) -> List[Tuple[str, float]]:
+    found = ann_neighbors(vector, k=k, exclude=[article_id])
+    if found is not None:
+        return found
+    res = es.search(
+        index="article_data",
+        size=k + 1,
+        knn={
+            "field": "article_embedding",
+            "query_vector": vector,
+            "k": k + 1,
+            "num_candidates": max(200, 4 * k),
+            "filter": [{"range": {"collected_at": {"gte": f"now-{ANN_WINDOW_DAYS}d"}}}],
+        },
+        _source=["article_id"],
+    )
+    return [
+        (h["_source"]["article_id"], h["_score"])
+        for h in res["hits"]["hits"]
+        if h["_source"].get("article_id") != article_id
+    ][:k]
+
+
+def _merge(current: List[Tuple[str, float]], incoming: List[Tuple[str, float]], k: int) -> List[Tuple[str, float]]:
+    best: Dict[str, float] = {}
+    for aid, score in list(current) + list(incoming):
+        if score > best.get(aid, -1.0):
+            best[aid] = score
+    return sorted(best.items(), key=lambda x: -x[1])[:k]
+
+
+def _doc(ranked: List[Tuple[str, float]], now: str) -> dict:
+    return {
+        "related_ids": [aid for aid, _ in ranked],
+        "related_scores": [round(float(s), 6) for _, s in ranked],
+        "related_at": now,
+    }
+
+
+def store_related(doc_embeddings: Dict[str, List[float]], k: int = RELATED_TOP_K) -> Dict[str, int]:
+    """
+    임베딩 단계에서 호출: 방금 임베딩한 기사들의 이웃 목록을 쓰고, 더 가까운 이웃이 생긴 예전 기사 목록을 갱신
+    반환: {"computed", "refreshed"}
+    실패해도 임베딩 결과에는 영향 없음 (읽는 쪽이 기존 경로로 대체)
+    """
+    if not RELATED_ENABLED or not doc_embeddings:
+        return {"computed": 0, "refreshed": 0}
+    try:
+        now = datetime.now(KST).isoformat()
+        ranked: Dict[str, List[Tuple[str, float]]] = {}
+        incoming: Dict[str, List[Tuple[str, float]]] = {}
+        for article_id, vec in doc_embeddings.items():
+            found = _neighbors(article_id, vec, k)
+            ranked[article_id] = found
+            for other, score in found:
+                if other not in doc_embeddings:
+                    incoming.setdefault(other, []).append((article_id, score))
+
+        # 예전 기사: 현재 목록(실시간 mget)과 합쳐 top-k가 바뀐 것만 씁니다
+        refresh: Dict[str, List[Tuple[str, float]]] = {}
+        if incoming:
+            docs = es.mget(index="article_data", ids=list(incoming), _source=_FIELDS)["docs"]
+            for d in docs:
+                src = d.get("_source") or {}
+                if not d.get("found") or "related_ids" not in src:
+                    continue
+                current = list(zip(src["related_ids"], src.get("related_scores") or []))
+                merged = _merge(current, incoming[d["_id"]], k)
+                if merged != current:
+                    refresh[d["_id"]] = merged
+
+        actions = (
+            {"_op_type": "update", "_index": "article_data", "_id": aid, "doc": _doc(r, now)}
+            for aid, r in list(ranked.items()) + list(refresh.items())
+        )
+        helpers.bulk(es, actions, chunk_size=500, request_timeout=120, raise_on_error=False)
+        return {"computed": len(ranked), "refreshed": len(refresh)}
+    except Exception as e:
+        logger.warning(f"related precompute failed: {e}")
+        return {"computed": 0, "refreshed": 0}
+
+
+def load_related(article_id: str) -> Optional[List[Tuple[str, float]]]:
+    """저장된 이웃 목록 [(article_id, score)] — 아직 계산 전이면 None (호출 쪽이 kNN으로 대체)"""
+    try:
+        doc = es.get(index="article_data", id=article_id, _source=_FIELDS)
+    except Exception:
+        return None
+    src = doc.get("_source") or {}
+    if "related_ids" not in src:
+        return None
+    return list(zip(src["related_ids"], src.get("related_scores") or []))
+
+
+def related_hits(
+    article_id: str,
+    fields: List[str],
+    since_days: Optional[int] = None,
+) -> Optional[List[dict]]:
+    """
+    저장된 이웃 문서를 mget 해서 kNN hit 모양 [{"_source", "_score"}] 으로 돌려줍니다 (점수 순)
+    since_days: collected_at 기준 최근 N일만 (kNN filter 대신)
+    """
+    ranked = load_related(article_id)
+    if ranked is None:
+        return None
+    if not ranked:
+        return []
+    source = list(fields) + (["collected_at"] if since_days is not None and "collected_at" not in fields else [])
+    docs = es.mget(index="article_data", ids=[aid for aid, _ in ranked], _source=source)["docs"]
+    since = _days_ago(since_days) if since_days is not None else None
+    hits = []
+    for d, (_, score) in zip(docs, ranked):
+        if not d.get("found"):
+            continue
+        if since and _to_yyyymmdd(d["_source"].get("collected_at")) < since:
+            continue
+        hits.append({"_source": d["_source"], "_score": score})
+    return hits
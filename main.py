@@ -9,12 +9,14 @@ from apscheduler.triggers.cron import CronTrigger
 
 from crawler.crawler_main import crawl_bigkinds_full
 from labeler.topic_polar import label_polar_entity_centered_to_topics_json
+from labeler.ann_index import sync_ann_index
 from score.trend.article_trend_pipeline import run_article_trend_pipeline
 
 from util.elastic import es
 from util.elastic_templates import build_error_doc, build_info_docs  # ✅ info_logs 추가
 from api.session_timeout import close_timeout_sessions
 from util.scheduler_runtime import scheduler
+from util.webdriver_pool import webdriver_pool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -29,6 +31,12 @@ def _run_id_kst() -> str:
 def register_jobs():
     """✅ job 등록만 분리 (admin에서 job id로 pause/resume 하려면 id가 고정이어야 함)"""
 
+    # chromedriver 경로는 프로세스 시작 시 1번만 resolve (BigKinds/Trends job이 공용 브라우저 풀 사용)
+    try:
+        webdriver_pool.resolve_driver()
+    except Exception:
+        logger.exception("chromedriver resolve failed (첫 lease 때 다시 시도)")
+
     now = datetime.now(KST)
     scheduler.add_job(
         run_pipeline,
@@ -49,6 +57,17 @@ def register_jobs():
         max_instances=1
     )
 
+    # 연관 기사 사이드카 인덱스: 시작할 때 한 번 맞추고 이후 10분마다 ES와 동기화 + 디스크 저장
+    scheduler.add_job(
+        sync_ann_index,
+        IntervalTrigger(minutes=10),
+        id="ann_index_sync",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        next_run_time=now,
+    )
+
     scheduler.add_job(
         run_polarity,
         CronTrigger(hour=5, minute=0),
@@ -378,6 +397,7 @@ def main():
             time.sleep(60)
     except (KeyboardInterrupt, SystemExit):
         scheduler.shutdown()
+        webdriver_pool.shutdown()
         logger.info("scheduler stopped")
 
         # ✅ info_logs: scheduler stop summary
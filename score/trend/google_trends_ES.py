@@ -1,17 +1,18 @@
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.support import expected_conditions as EC
 from datetime import datetime, timezone, timedelta
 from elasticsearch import Elasticsearch
-import time
+
+from util.elastic_templates import build_info_docs
+from util.waits import WaitRecorder
+from util.webdriver_pool import webdriver_pool
 
 KST = timezone(timedelta(hours=9))
 
 # ES 설정
 es = Elasticsearch("http://localhost:9200")
 INDEX_NAME = "google_trends"
+TREND_ROWS_SELECTOR = "#trend-table > div.enOdEe-wZVHld-zg7Cn-haAclf > table > tbody:nth-child(3) > tr"
 
 # TrendScore (BigKinds와 스케일 통일: 0~1, 고정 Top25 기준)
 def trend_score(rank: int, _: int = None) -> float:
@@ -20,31 +21,23 @@ def trend_score(rank: int, _: int = None) -> float:
 
 
 def crawl_trends():
-    # Chrome 옵션
-    options = Options()
-    options.add_argument("--remote-allow-origins=*")
-    options.add_argument("--start-maximized")
-
-    # 스케줄러용 안전 옵션 (강력 추천)
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
+    # 공용 headless Chrome 풀에서 브라우저를 빌려 씁니다 (드라이버 resolve/브라우저 기동은 프로세스당 1번)
+    with webdriver_pool.lease() as driver:
+        return _crawl_trends(driver)
 
-    # 서버 배포할 때는 켜야함! [브라우저 창을 띄우지 않고 백그라운드에서 크롬을 실행]
-    # options.add_argument("--headless=new")
 
-    # webdriver-manager 사용 (exe 필요 파일 컴퓨터에 둘 필요없게 함 - 캐시 사용, 구동할 때마다 구동 되는 거 아님)
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+def _crawl_trends(driver):
+    waits = WaitRecorder()
 
     try:
         url = "https://trends.google.com/trending?geo=KR&hl=ko"
         driver.get(url)
         print("[1] Google Trends 접속 완료")
-        time.sleep(3)
 
-        elements = driver.find_elements(
-            By.CSS_SELECTOR, "#trend-table > div.enOdEe-wZVHld-zg7Cn-haAclf > table > tbody:nth-child(3) > tr" )
+        # 고정 sleep(3) 대신 트렌드 테이블 행이 뜰 때까지 대기
+        waits.wait(driver, EC.presence_of_element_located((By.CSS_SELECTOR, TREND_ROWS_SELECTOR)), "trend_table_ready")
+
+        elements = driver.find_elements(By.CSS_SELECTOR, TREND_ROWS_SELECTOR)
 
         if not elements:
             raise RuntimeError("Google Trends 테이블 로드 실패")
@@ -83,7 +76,21 @@ def crawl_trends():
         return {t["title"]: t["trend_score"] for t in trends}
 
     finally:
-        driver.quit()
+        try:
+            es.index(
+                index="info_logs",
+                document=build_info_docs(
+                    run_id=datetime.now(KST).strftime("%Y%m%d_%H"),
+                    job_id="crawl_trends",
+                    component="trend",
+                    stage="google_trends_waits_end",
+                    status="warn" if waits.timed_out() else "ok",
+                    duration_ms=waits.total_ms(),
+                    message=waits.summary()
+                )
+            )
+        except Exception:
+            print("wait 로그 저장 실패")
 
 # 단독 실행용
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 
 from elasticsearch import Elasticsearch, helpers
 from score.trust.total_trust_score import compute_trust_score
+from util.near_dup import plan_reuse
 
 ES_HOST = "http://localhost:9200"
 INDEX_NAME = "article_data"
@@ -13,11 +14,12 @@ def run_trust_pipeline(article_ids: list, batch_size: int = 100):
     """
     이번 사이클 article_id만 대상으로
     신뢰도 점수 계산 → status=4 업데이트
+    - 반환: 업데이트한 문서 수
     """
 
     if not article_ids:
         print("[trust_pipeline] article_ids 비어 있음")
-        return
+        return 0
 
     # dict / str 혼용 대응
     ids = [
@@ -29,29 +31,35 @@ def run_trust_pipeline(article_ids: list, batch_size: int = 100):
     resp = es.mget(
         index=INDEX_NAME,
         body={"ids": ids},
-        _source=["article_title", "article_content"]
+        _source=["article_title", "article_content", "dup_group_id"]
     )
 
-    docs = [d for d in resp["docs"] if d.get("found")]
+    docs = [{**d["_source"], "article_id": d["_id"]} for d in resp["docs"] if d.get("found")]
 
     actions = []
     total_docs = len(docs)
     updated_docs = 0
 
-    for d in docs:
-        doc_id = d["_id"]
-        src = d["_source"]
-
+    # 근사 중복 그룹(+제목 동일)은 대표 1건만 KLUE-BERT로 계산하고 점수를 복사합니다
+    plan = plan_reuse("trust", docs, "article_label.article_trust_score")
+    scores = {}
+    for src in plan.compute:
         trust_result = compute_trust_score(
             src.get("article_title", ""),
             src.get("article_content", "")
         )
+        scores[src["article_id"]] = trust_result["article_label"]["article_trust_score"]
+    scores.update(plan.resolve(scores))
 
+    for doc_id, trust_score in scores.items():
         actions.append({
             "_op_type": "update",
             "_index": INDEX_NAME,
             "_id": doc_id,
-            "doc": trust_result   # status=4 포함
+            "doc": {
+                "article_label": {"article_trust_score": trust_score},
+                "status": 4
+            }
         })
 
         if len(actions) >= batch_size:
@@ -66,5 +74,8 @@ def run_trust_pipeline(article_ids: list, batch_size: int = 100):
     print(
         f"[trust_pipeline_by_ids] "
         f"대상 기사 수: {total_docs}, "
-        f"신뢰도 점수 부여 완료: {updated_docs}"
+        f"신뢰도 점수 부여 완료: {updated_docs}, "
+        f"점수 재사용: {plan.saved_cnt}"
     )
+
+    return updated_docs
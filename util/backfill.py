@@ -0,0 +1,327 @@
+"""
+article_data 전체를 대상으로 하는 재처리(backfill) 러너
+
+- point-in-time(PIT) + search_after 로 article_data 전체를 chunk 단위로 끝까지 훑습니다
+  (기존 re_clean_articles / re_embedding 은 search 1번 = 앞 500건만 처리)
+- 정렬 키는 article_id 라서 PIT가 바뀌어도(재시작) 같은 커서로 이어서 진행할 수 있습니다
+- 처리 완료된 지점까지만 checkpoint 파일(JSON)에 커서를 저장 → 중단 후 재실행 시 이어서 진행
+- max_docs_per_sec 로 처리 속도 제한, date_from/date_to(collected_at) 와 statuses 필터
+- workers 개의 스레드가 chunk를 병렬 처리 (조회는 순차, 처리/쓰기는 병렬)
+
+jobs:
+    re_clean     : article_raw 를 mget 해서 다시 전처리 → article_data 제목/본문 갱신 (status 유지)
+    re_embedding : article_data 제목/본문으로 임베딩 재계산 → article_embedding 갱신 (status 유지)
+
+실행 (프로젝트 루트):
+    python -m util.backfill re_clean --from 2026-01-01 --to 2026-01-31 --workers 4 --rate 300
+    python -m util.backfill re_embedding --status 4 5 --restart
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from util.elastic import es
+from util.elastic_templates import build_error_doc, build_info_docs
+from util.logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+SCAN_INDEX = "article_data"
+PIT_KEEP_ALIVE = "5m"
+# article_id 는 dynamic 매핑(text + .keyword)이라 text 필드로는 정렬할 수 없습니다 (checkpoint 커서도 이 값)
+SCAN_SORT_FIELD = "article_id.keyword"
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_WORKERS = 2
+CHECKPOINT_DIR = os.getenv("BACKFILL_CHECKPOINT_DIR", "data/backfill")
+
+# 같은 job이 동시에 두 번 돌면 checkpoint가 꼬이므로 프로세스 안에서 막습니다
+_running: set = set()
+_running_lock = threading.Lock()
+
+
+def _re_clean_chunk(docs: List[Dict[str, Any]]) -> Dict[str, int]:
+    from util.cleaner import clean_chunk
+
+    m = clean_chunk([d["_id"] for d in docs], status=None)
+    return {"ok": m["ok"], "failed": m["failed"]}
+
+
+def _re_embedding_chunk(docs: List[Dict[str, Any]]) -> Dict[str, int]:
+    from labeler.create_embeddings import embed_articles
+
+    articles = [{**(d.get("_source") or {}), "article_id": d["_id"]} for d in docs]
+    ok = embed_articles(articles, status=None, reuse=False)
+    return {"ok": ok, "failed": len(articles) - ok}
+
+
+class BackfillJob:
+    def __init__(self, name: str, source: List[str], process: Callable[[List[Dict[str, Any]]], Dict[str, int]]):
+        self.name = name
+        self.source = source
+        self.process = process
+
+
+BACKFILL_JOBS: Dict[str, BackfillJob] = {
+    "re_clean": BackfillJob("re_clean", ["article_id"], _re_clean_chunk),
+    "re_embedding": BackfillJob("re_embedding", ["article_id", "article_title", "article_content"], _re_embedding_chunk),
+}
+
+
+def is_running(job_name: str) -> bool:
+    with _running_lock:
+        return job_name in _running
+
+
+class Checkpoint:
+    """search_after 커서 + 누적 처리 수를 JSON 파일에 원자적으로(임시파일 → rename) 저장합니다"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def load(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, state: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({**state, "updated_at": datetime.now(KST).isoformat()}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        if self.path.exists():
+            self.path.unlink()
+
+
+def build_query(
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    statuses: Optional[List[Any]] = None,
+    date_field: str = "collected_at",
+) -> Dict[str, Any]:
+    filters = []
+    if date_from or date_to:
+        rng = {}
+        if date_from:
+            rng["gte"] = date_from
+        if date_to:
+            rng["lte"] = date_to
+        filters.append({"range": {date_field: rng}})
+    if statuses:
+        # status는 문자열/숫자가 섞여 저장되어 있어 두 형태를 모두 넣습니다
+        values = {str(s) for s in statuses} | {int(s) for s in statuses if str(s).isdigit()}
+        filters.append({"terms": {"status": sorted(values, key=str)}})
+    if not filters:
+        return {"match_all": {}}
+    return {"bool": {"filter": filters}}
+
+
+def scan_pages(query: Dict[str, Any], source: List[str], chunk_size: int, search_after: Optional[list]):
+    """PIT + search_after 로 article_data (docs, 마지막 sort 값)을 chunk 단위로 돌려줍니다 (labeler.ann_index sync도 사용)"""
+    pit_id = es.open_point_in_time(index=SCAN_INDEX, keep_alive=PIT_KEEP_ALIVE)["id"]
+    try:
+        while True:
+            resp = es.search(
+                pit={"id": pit_id, "keep_alive": PIT_KEEP_ALIVE},
+                query=query,
+                sort=[{SCAN_SORT_FIELD: "asc"}],
+                size=chunk_size,
+                _source=source,
+                track_total_hits=False,
+                **({"search_after": search_after} if search_after else {}),
+            )
+            pit_id = resp.get("pit_id", pit_id)
+            hits = resp["hits"]["hits"]
+            if not hits:
+                return
+            search_after = hits[-1]["sort"]
+            yield hits, search_after
+            if len(hits) < chunk_size:
+                return
+    finally:
+        try:
+            es.close_point_in_time(id=pit_id)
+        except Exception as e:
+            logger.info(f"close pit failed: {e}")
+
+
+def run_backfill(
+    job_name: str,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = DEFAULT_WORKERS,
+    max_docs_per_sec: Optional[float] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    statuses: Optional[List[Any]] = None,
+    checkpoint_path: Optional[str] = None,
+    restart: bool = False,
+    max_docs: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    job_name(re_clean / re_embedding)을 조건에 맞는 article_data 전체에 대해 실행합니다
+    - restart=False 면 checkpoint 커서부터 이어서, True 면 처음부터
+    - 끝까지 돌면 checkpoint는 지우고, 중간에 실패/중단되면 마지막 완료 지점이 남습니다
+    - 반환: {"job", "processed", "ok", "failed", "chunks", "elapsed_ms", "resumed_from"}
+    """
+    job = BACKFILL_JOBS[job_name]
+    with _running_lock:
+        if job_name in _running:
+            raise RuntimeError(f"backfill already running: {job_name}")
+        _running.add(job_name)
+
+    run_id = datetime.now(KST).strftime("%Y%m%d_%H")
+    checkpoint = Checkpoint(checkpoint_path or os.path.join(CHECKPOINT_DIR, f"{job_name}.json"))
+    filters = {"date_from": date_from, "date_to": date_to, "statuses": statuses}
+    state = {} if restart else checkpoint.load()
+    if state and state.get("filters") != filters:
+        # 조건이 바뀌면 커서 의미가 달라지므로 처음부터
+        logger.info(f"backfill {job_name}: filters changed, ignore checkpoint")
+        state = {}
+
+    search_after = state.get("search_after")
+    totals = {"processed": state.get("processed", 0), "ok": state.get("ok", 0), "failed": state.get("failed", 0)}
+    chunks = 0
+    t0 = time.monotonic()
+    scanned = 0
+    stopped_early = False
+    # (search_after, 문서 수, future) — 앞 chunk가 모두 끝난 지점까지만 checkpoint를 전진시킵니다
+    in_flight: deque = deque()
+
+    def _drain(block_until: int) -> None:
+        nonlocal chunks
+        while in_flight and (len(in_flight) > block_until or in_flight[0][2].done()):
+            cursor, n_docs, future = in_flight.popleft()
+            result = future.result()
+            chunks += 1
+            totals["processed"] += n_docs
+            totals["ok"] += result.get("ok", 0)
+            totals["failed"] += result.get("failed", 0)
+            checkpoint.save({"job": job_name, "filters": filters, "search_after": cursor, **totals})
+
+    try:
+        query = build_query(date_from, date_to, statuses)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for hits, cursor in scan_pages(query, job.source, chunk_size, search_after):
+                if max_docs is not None and scanned >= max_docs:
+                    stopped_early = True
+                    break
+                scanned += len(hits)
+                in_flight.append((cursor, len(hits), pool.submit(job.process, hits)))
+                _drain(block_until=max(1, workers) * 2)
+
+                # 처리 속도 제한: 지금까지 넘긴 문서 수 / 경과 시간 <= max_docs_per_sec
+                if max_docs_per_sec:
+                    ahead = scanned / max_docs_per_sec - (time.monotonic() - t0)
+                    if ahead > 0:
+                        time.sleep(ahead)
+            _drain(block_until=0)
+
+        # max_docs로 끊은 경우는 다음 실행이 이어서 하도록 checkpoint를 남깁니다
+        if not stopped_early:
+            checkpoint.clear()
+        status = "warn" if totals["failed"] else "ok"
+        error_message = None
+    except Exception as e:
+        # 완료된 chunk까지는 checkpoint에 남아 있으므로 재실행하면 이어서 진행합니다
+        status = "error"
+        error_message = str(e)
+        logger.exception(f"backfill {job_name} failed")
+        es.index(
+            index="error_log",
+            document=build_error_doc(
+                message=f"backfill {job_name} 중단 (처리 {totals['processed']}건)",
+                service_name="backfill",
+                pipeline_run_id=run_id,
+                pipeline_job=f"backfill_{job_name}",
+                pipeline_step="chunk",
+                event_severity=3,
+                exception=e,
+                context={"filters": filters, "checkpoint": str(checkpoint.path)},
+                tags=["backfill", job_name],
+            )
+        )
+    finally:
+        with _running_lock:
+            _running.discard(job_name)
+
+    elapsed_ms = int((time.monotonic() - t0) * 1000)
+    es.index(
+        index="info_logs",
+        document=build_info_docs(
+            run_id=run_id,
+            job_id=f"backfill_{job_name}",
+            component="backfill",
+            stage=f"{job_name}_end",
+            status=status,
+            duration_ms=elapsed_ms,
+            input_cnt=totals["processed"],
+            success_cnt=totals["ok"],
+            failed_cnt=totals["failed"],
+            message=(
+                f"chunks={chunks} resumed={bool(search_after)} workers={workers} "
+                f"rate_limit={max_docs_per_sec} filters={filters}"
+            ),
+            error_message=error_message,
+            retryable=True if error_message else None,
+        )
+    )
+    logger.info(f"backfill {job_name} {status}: {totals} chunks={chunks} elapsed_ms={elapsed_ms}")
+    if job_name == "re_embedding":
+        from labeler.embedding_cache import log_cache_stats
+
+        log_cache_stats(run_id, f"backfill_{job_name}")
+
+    return {
+        "job": job_name,
+        **totals,
+        "chunks": chunks,
+        "elapsed_ms": elapsed_ms,
+        "resumed_from": search_after,
+        "status": status,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="article_data 전체 재처리 (PIT + search_after)")
+    parser.add_argument("job", choices=sorted(BACKFILL_JOBS))
+    parser.add_argument("--from", dest="date_from", default=None, help="collected_at >= (예: 2026-01-01)")
+    parser.add_argument("--to", dest="date_to", default=None, help="collected_at <= (예: 2026-01-31)")
+    parser.add_argument("--status", dest="statuses", nargs="*", default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--rate", dest="max_docs_per_sec", type=float, default=None, help="초당 최대 문서 수")
+    parser.add_argument("--checkpoint", dest="checkpoint_path", default=None)
+    parser.add_argument("--restart", action="store_true", help="checkpoint 무시하고 처음부터")
+    parser.add_argument("--max-docs", type=int, default=None)
+    args = parser.parse_args()
+
+    result = run_backfill(
+        args.job,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        max_docs_per_sec=args.max_docs_per_sec,
+        date_from=args.date_from,
+        date_to=args.date_to,
+        statuses=args.statuses,
+        checkpoint_path=args.checkpoint_path,
+        restart=args.restart,
+        max_docs=args.max_docs,
+    )
+    print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
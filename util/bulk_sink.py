@@ -0,0 +1,152 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from elasticsearch import AsyncElasticsearch, helpers
+
+from util.logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+DEFAULT_MAX_ACTIONS = 500
+DEFAULT_FLUSH_INTERVAL = 2.0  # seconds
+
+OnSuccess = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class AsyncBulkSink:
+    """
+    ES 쓰기(update/index/delete)를 모았다가 helpers.async_bulk로 한 번에 보내는 버퍼입니다
+    - max_actions개가 쌓이거나 flush_interval초가 지나면 flush
+    - 실패한 항목은 add() 때 넘긴 error_list에 크롤러 에러 형식 그대로 추가됩니다
+    - delete의 404(이미 없음)는 실패로 보지 않습니다
+    - refresh="wait_for"를 주면 마지막 flush가 검색에 보일 때까지 기다립니다 (다음 단계가 search로 읽는 경우)
+    - on_success를 넘긴 항목은 flush 성공 직후 on_success(meta)를 await 합니다 (스트리밍 파이프라인 인계)
+
+    사용법:
+        async with AsyncBulkSink(client) as sink:
+            await sink.add({"_op_type": "index", "_index": "article_raw", "_id": aid, "_source": doc},
+                           error_list=error_list, meta={"article_id": aid, "error_url": url})
+    """
+
+    def __init__(
+        self,
+        client: AsyncElasticsearch,
+        max_actions: int = DEFAULT_MAX_ACTIONS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        refresh: Optional[str] = None,
+    ):
+        self.client = client
+        self.max_actions = max_actions
+        self.flush_interval = flush_interval
+        self.refresh = refresh
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._pending: Dict[Tuple[str, str, str], Tuple[Optional[list], Dict[str, Any], Optional[OnSuccess]]] = {}
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._closing = asyncio.Event()
+
+        # flush 통계 (info_logs 용)
+        self.flush_cnt = 0
+        self.success_cnt = 0
+        self.failed_cnt = 0
+        self.flush_ms = 0
+        self.refresh_wait_ms = 0
+
+    async def __aenter__(self) -> "AsyncBulkSink":
+        self._timer = asyncio.create_task(self._flush_periodically())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._timer is not None:
+            # cancel 하지 않고 주기 flush 루프를 멈춘 뒤 진행 중인 flush가 끝날 때까지 기다립니다
+            # (flush 도중 cancel 되면 버퍼에서 꺼낸 묶음의 쓰기/다음 단계 인계가 사라짐)
+            self._closing.set()
+            await self._timer
+        t0 = time.monotonic()
+        await self.flush(refresh=self.refresh)
+        if self.refresh:
+            self.refresh_wait_ms = int((time.monotonic() - t0) * 1000)
+
+    async def _flush_periodically(self) -> None:
+        while not self._closing.is_set():
+            try:
+                await asyncio.wait_for(self._closing.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                await self.flush()
+
+    async def add(
+        self,
+        action: Dict[str, Any],
+        error_list: Optional[list] = None,
+        meta: Optional[Dict[str, Any]] = None,
+        on_success: Optional[OnSuccess] = None,
+    ) -> None:
+        key = (action.get("_op_type", "index"), action["_index"], str(action["_id"]))
+        self._buffer.append(action)
+        self._pending[key] = (error_list, meta or {}, on_success)
+        if len(self._buffer) >= self.max_actions:
+            await self.flush()
+
+    async def flush(self, refresh: Optional[str] = None) -> None:
+        async with self._lock:
+            if not self._buffer:
+                return
+            actions, self._buffer = self._buffer, []
+            pending, self._pending = self._pending, {}
+
+            t0 = time.monotonic()
+            try:
+                success, errors = await helpers.async_bulk(
+                    self.client,
+                    actions,
+                    chunk_size=self.max_actions,
+                    raise_on_error=False,
+                    raise_on_exception=False,
+                    **({"refresh": refresh} if refresh else {}),
+                )
+            except Exception as e:
+                # 연결 실패 등 요청 자체가 실패하면 이번 묶음 전체를 실패로 기록합니다
+                success = 0
+                errors = [
+                    {op_type: {"_index": index, "_id": _id, "error": str(e), "exception_type": type(e).__name__}}
+                    for (op_type, index, _id) in pending
+                ]
+            self.flush_ms += int((time.monotonic() - t0) * 1000)
+            self.flush_cnt += 1
+            self.success_cnt += success
+
+            failed_keys = set()
+            for item in errors:
+                op_type, info = next(iter(item.items()))
+                status = info.get("status")
+                if op_type == "delete" and status == 404:
+                    continue
+
+                self.failed_cnt += 1
+                key = (op_type, info.get("_index"), str(info.get("_id")))
+                failed_keys.add(key)
+                error_list, meta, _ = pending.get(key, (None, {}, None))
+                if error_list is None:
+                    logger.warning(f"bulk {op_type} failed: {info}")
+                    continue
+
+                error = info.get("error")
+                if isinstance(error, dict):
+                    error_type = error.get("type") or "BulkError"
+                    error_message = error.get("reason") or f"status={status}"
+                else:
+                    error_type = info.get("exception_type") or "BulkError"
+                    error_message = str(error) if error else f"status={status}"
+
+                error_list.append({
+                    **meta,
+                    "error_type": error_type,
+                    "error_message": error_message,
+                })
+
+            # lock 안에서 기다리므로 다음 단계 큐가 가득 차면 add()/flush()도 같이 기다립니다 (back-pressure)
+            for key, (_, meta, on_success) in pending.items():
+                if on_success is not None and key not in failed_keys:
+                    await on_success(meta)
@@ -1,141 +1,182 @@
+import time
+from typing import Optional
+
+from elasticsearch import helpers
+
 from util.elastic import es
+from util.logger import Logger
+from util.near_dup import assign_groups
 from util.text_cleaner import clean_article_text
 
+logger = Logger().get_logger(__name__)
 
-# 수집된 기사에 대한 전처리 작업을 시행하기 위한 함수입니다
-def clean_articles(article_ids: list[str]):
-    
-    body = {
-        "_source": ["article_id", "article_title", "article_content"],
-        "size": len(article_ids),
-        "query": {"terms": {"article_id": article_ids}}
-    }
+# mget 1번 / bulk 1번에 다루는 기사 수
+CHUNK_SIZE = 500
 
-    # ES의 article_raw 인덱스에서 전달받은 article_id들에 대해서 데이터를 호출합니다
-    resp = es.search(index="article_raw", body=body)
-    
-    # 필요한 데이터만 추출
-    article_list = [h["_source"] for h in resp["hits"]["hits"]]
-
-    for article in article_list:
-        article_id = article.get("article_id")
-        # 기사의 제목을 전처리합니다, 에러 방지위해 혹시 None인 겯우 방지 위해 공백 문자열을 넣고 갑니다
-        title_raw = article.get("article_title")
-        if title_raw is None:
-            title_raw = ""
-        elif isinstance(title_raw, list):
-            title_raw = " ".join(str(x) for x in title_raw if x) #전달받은 데이터가 문자열이 아닌 배열인 경우에 이를 문장으로 다시 변환합니다
-
-        # 상단 title_raw 전처리와 동일한 진행입니다
-        content_raw = article.get("article_content")
-        if content_raw is None:
-            content_raw = ""
-        elif isinstance(content_raw, list):
-            content_raw = " ".join(str(x) for x in content_raw if x)
+_RAW_FIELDS = ["article_id", "article_title", "article_content"]
 
-        # util.text_cleaner에 담긴 문자열 전처리 함수를 호출해서 사용합니다
-        title = clean_article_text(str(title_raw).strip())
-        content = clean_article_text(str(content_raw).strip())
 
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _to_text(raw) -> str:
+    # 에러 방지위해 None인 경우 공백 문자열, 배열인 경우 문장으로 다시 변환합니다
+    if raw is None:
+        return ""
+    if isinstance(raw, list):
+        return " ".join(str(x) for x in raw if x)
+    return str(raw)
+
+
+def _mget_raw(ids: list[str]) -> list[dict]:
+    """article_raw를 mget으로 읽습니다 (실시간 조회라 방금 적재한 문서도 refresh 없이 읽힘)"""
+    resp = es.mget(index="article_raw", ids=ids, _source=_RAW_FIELDS)
+    return [d for d in resp["docs"] if d.get("found")]
+
+
+def _bulk(actions: list[dict]):
+    """(성공 건수, 실패한 _id 집합) — delete 404(이미 없음)는 실패로 보지 않습니다"""
+    if not actions:
+        return 0, set()
+    success, errors = helpers.bulk(es, actions, raise_on_error=False, request_timeout=120)
+    failed = set()
+    for item in errors:
+        op_type, info = next(iter(item.items()))
+        if op_type == "delete" and info.get("status") == 404:
+            continue
+        failed.add(str(info.get("_id")))
+    return success, failed
+
+
+def clean_chunk(ids: list[str], status: Optional[str] = "1") -> dict:
+    """
+    article_id 한 묶음: article_raw mget → 전처리 → article_data bulk update
+    - status가 None이면 상태는 건드리지 않습니다 (이미 들어간 기사 재전처리용)
+    - 전처리된 본문으로 근사 중복 그룹(dup_group_id)도 같이 붙입니다 (util.near_dup)
+    - 반환: {"found", "ok", "failed", "dup_cnt", "updated_ids", "mget_ms", "clean_ms", "dedup_ms", "bulk_ms"}
+    """
+    t0 = time.monotonic()
+    docs = _mget_raw(ids)
+    t_mget = time.monotonic()
+
+    actions = []
+    for d in docs:
+        article = d["_source"]
+        article_id = article.get("article_id") or d["_id"]
+
+        # util.text_cleaner에 담긴 문자열 전처리 함수를 호출해서 사용합니다
         cleaned_article = {
             "article_id": article_id,
-            "article_title": title,
-            "article_content": content,
-            "status": "1"
+            "article_title": clean_article_text(_to_text(article.get("article_title")).strip()),
+            "article_content": clean_article_text(_to_text(article.get("article_content")).strip()),
         }
-        # 성공적으로 전처리 된 기사들을 아직 비어있는 article_data 인덱스에 삽입시킵니다
-        es.update(index="article_data", id=article_id, body={"doc": cleaned_article})
-    return None
+        if status is not None:
+            cleaned_article["status"] = status
+
+        # 성공적으로 전처리 된 기사들을 article_data 인덱스에 반영합니다
+        actions.append({
+            "_op_type": "update",
+            "_index": "article_data",
+            "_id": article_id,
+            "doc": cleaned_article
+        })
+    t_clean = time.monotonic()
+
+    groups = assign_groups([a["doc"] for a in actions])
+    for a in actions:
+        a["doc"].update(groups[a["_id"]])
+    dup_cnt = sum(1 for aid, g in groups.items() if g["dup_group_id"] != aid)
+    t_dedup = time.monotonic()
+
+    success, failed = _bulk(actions)
+    t_bulk = time.monotonic()
+
+    return {
+        "found": len(docs),
+        "ok": success,
+        "failed": len(failed),
+        "dup_cnt": dup_cnt,
+        "updated_ids": [a["_id"] for a in actions if a["_id"] not in failed],
+        "mget_ms": int((t_mget - t0) * 1000),
+        "clean_ms": int((t_clean - t_mget) * 1000),
+        "dedup_ms": int((t_dedup - t_clean) * 1000),
+        "bulk_ms": int((t_bulk - t_dedup) * 1000),
+    }
 
 
-# bigkinds 수집 성공했으나 기사 원문 수집에 실패한 경우를 필터링 하기 위한 함수입니다
-def delete_null(article_ids: list[str]) -> list[str]:
+# 수집된 기사에 대한 전처리 작업을 시행하기 위한 함수입니다
+def clean_articles(article_ids: list[str], chunk_size: int = CHUNK_SIZE) -> list[str]:
     """
-    이번 세션에서 수집한 article_ids 중,
-    article_data에서 본문이 없거나 비어있는 문서를 삭제.
+    article_raw → 전처리 → article_data (status "1")
+    - chunk_size개씩 mget으로 읽고, 메모리에서 전처리한 뒤 helpers.bulk 1번으로 update
+    - 청크별 mget/전처리/bulk 소요 시간을 로그로 남깁니다
+    - 반환: article_data 업데이트에 성공한 article_id 리스트
     """
     if not article_ids:
         return []
 
-    # 본문/제목 필드명은 너희 스키마에 맞게 조정
-    # 예: article_content / article_title
-    query = {
-        "_source": ["article_id", "article_title", "article_content"],
-        "size": len(article_ids),
-        "query": {
-            "terms": {"article_id": article_ids}
-        }
-    }
+    cleaned_ids = []
+    for n, chunk in enumerate(_chunks(list(article_ids), chunk_size), start=1):
+        m = clean_chunk(chunk)
+        cleaned_ids.extend(m["updated_ids"])
+        logger.info(
+            f"clean_articles chunk {n}: ids={len(chunk)} found={m['found']} ok={m['ok']} failed={m['failed']} dup={m['dup_cnt']} "
+            f"mget_ms={m['mget_ms']} clean_ms={m['clean_ms']} dedup_ms={m['dedup_ms']} bulk_ms={m['bulk_ms']}"
+        )
+    return cleaned_ids
 
-    resp = es.search(index="article_raw", body=query)
-    hits = resp.get("hits", {}).get("hits", [])
+
+# bigkinds 수집 성공했으나 기사 원문 수집에 실패한 경우를 필터링 하기 위한 함수입니다
+def delete_null(article_ids: list[str], chunk_size: int = CHUNK_SIZE) -> list[str]:
+    """
+    이번 세션에서 수집한 article_ids 중,
+    article_raw 본문이 없거나 비어있는 문서를 article_data/article_raw 에서 삭제.
+    - chunk_size개씩 mget으로 읽고 삭제는 helpers.bulk 1번으로 처리합니다
+    """
+    if not article_ids:
+        return []
 
     null_ids = []
-    for h in hits:
-        src = h.get("_source", {})
-        aid = src.get("article_id")
-        title = (src.get("article_title") or "").strip()
-        content = src.get("article_content")
-
-        # content가 None이거나, 문자열인데 공백이거나, 리스트인데 비어있으면 실패로 간주
-        empty_content = (
-            content is None or
-            (isinstance(content, str) and not content.strip()) or
-            (isinstance(content, list) and len(content) == 0)
+    for n, chunk in enumerate(_chunks(list(article_ids), chunk_size), start=1):
+        t0 = time.monotonic()
+        docs = _mget_raw(chunk)
+        t_mget = time.monotonic()
+
+        chunk_null = []
+        for d in docs:
+            src = d.get("_source", {})
+            content = src.get("article_content")
+
+            # content가 None이거나, 문자열인데 공백이거나, 리스트인데 비어있으면 실패로 간주
+            empty_content = (
+                content is None or
+                (isinstance(content, str) and not content.strip()) or
+                (isinstance(content, list) and len(content) == 0)
+            )
+            if empty_content:
+                chunk_null.append(src.get("article_id") or d["_id"])
+
+        actions = [
+            {"_op_type": "delete", "_index": index, "_id": aid}
+            for aid in chunk_null
+            for index in ("article_data", "article_raw")
+        ]
+        success, failed = _bulk(actions)
+        t_bulk = time.monotonic()
+
+        null_ids.extend(aid for aid in chunk_null if aid not in failed)
+        logger.info(
+            f"delete_null chunk {n}: ids={len(chunk)} found={len(docs)} null={len(chunk_null)} "
+            f"deleted={success} failed={len(failed)} "
+            f"mget_ms={int((t_mget - t0) * 1000)} bulk_ms={int((t_bulk - t_mget) * 1000)}"
         )
-
-        if empty_content:
-            es.delete(index="article_data", id=aid)
-            es.delete(index="article_raw", id=aid)
-            null_ids.append(aid)
-
     return null_ids
 
 
 # 이미 들어간 내용 전처리용
-def re_clean_articles():
-    body = {
-        "_source": ["article_id", "article_title", "article_content"],
-        "size": 500
-
-    }
-
-    # ES의 article_raw 인덱스에서 전달받은 article_id들에 대해서 데이터를 호출합니다
-    resp = es.search(index="article_raw", body=body)
-
-    # 필요한 데이터만 추출
-    article_list = [h["_source"] for h in resp["hits"]["hits"]]
-    print(len(article_list))
-    for article in article_list:
-        article_id = article.get("article_id")
-
-        # 기사의 제목을 전처리합니다, 에러 방지위해 혹시 None인 겯우 방지 위해 공백 문자열을 넣고 갑니다
-        title_raw = article.get("article_title")
-        if title_raw is None:
-            title_raw = ""
-        elif isinstance(title_raw, list):
-            title_raw = " ".join(str(x) for x in title_raw if x)  # 전달받은 데이터가 문자열이 아닌 배열인 경우에 이를 문장으로 다시 변환합니다
-
-        # 상단 title_raw 전처리와 동일한 진행입니다
-        content_raw = article.get("article_content")
-        if content_raw is None:
-            content_raw = ""
-        elif isinstance(content_raw, list):
-            content_raw = " ".join(str(x) for x in content_raw if x)
-
-        # util.text_cleaner에 담긴 문자열 전처리 함수를 호출해서 사용합니다
-        title = clean_article_text(str(title_raw).strip())
-        content = clean_article_text(str(content_raw).strip())
-
-        cleaned_article = {
-            "article_id": article_id,
-            "article_title": title,
-            "article_content": content
-        }
-        # 성공적으로 전처리 된 기사들을 아직 비어있는 article_data 인덱스에 삽입시킵니다
-        es.update(index="article_data", id=article_id, body={"doc": cleaned_article})
-    return None
-
-if __name__ == "__main__":
-    delete_null()
-
+def re_clean_articles(**options) -> dict:
+    """article_data 전체(또는 날짜/상태 조건)를 재전처리합니다. 옵션은 util.backfill.run_backfill 참고"""
+    from util.backfill import run_backfill
+    return run_backfill("re_clean", **options)
@@ -1,5 +1,16 @@
-from elasticsearch import Elasticsearch
+from elasticsearch import AsyncElasticsearch, Elasticsearch
+
+ES_HOST = "http://localhost:9200"
 
 es = Elasticsearch(
-    "http://localhost:9200"
+    ES_HOST
 )
+
+
+def get_async_es() -> AsyncElasticsearch:
+    """
+    비동기 ES 클라이언트 (크롤러 bulk sink 용)
+    - 이벤트 루프에 묶이므로 실행마다 새로 만들고 끝나면 close 합니다
+    - httpx 비동기 노드를 사용해서 aiohttp 추가 설치가 필요 없습니다
+    """
+    return AsyncElasticsearch(ES_HOST, node_class="httpxasync")
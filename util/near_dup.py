@@ -0,0 +1,332 @@
+"""
+근사 중복(near-duplicate) 기사 그룹핑
+
+같은 통신사 원문을 여러 언론사가 거의 그대로 싣는 경우가 많아서,
+전처리 단계에서 본문 MinHash(문자 5-gram shingle) + LSH 밴드로 dup_group_id를 붙이고
+뒤 단계(임베딩/카테고리/신뢰도)는 같은 그룹 기사의 결과를 재사용합니다.
+
+article_data에 추가되는 필드 (DUP_MAPPINGS, 처음 그룹핑할 때 put_mapping):
+    dup_group_id  : 그룹 대표 기사 article_id (중복이 없으면 자기 자신) — 추천/MMR 중복 제거 키
+    dup_bands     : LSH 밴드 키 (keyword 배열, 후보 검색용)
+    dup_signature : MinHash 서명 (long 배열, 후보 검증용 / 검색 안 하므로 index:false)
+이미 dynamic 매핑(text)으로 잡힌 인덱스는 put_mapping이 거부되므로 경고만 남기고,
+util.vector_store migrate 로 새 인덱스를 만들 때 함께 적용됩니다.
+
+재사용 정책 (DUP_REUSE_POLICY, 예: "embedding=content,category=content,trust=title"):
+    content : 같은 그룹이면 재사용
+    title   : 같은 그룹 + 제목까지 같을 때만 재사용 (제목이 점수에 들어가는 신뢰도 기본값)
+    off     : 재사용 안 함
+"""
+import hashlib
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from util.elastic import es
+from util.logger import Logger
+from util.vector_store import get_vectors
+
+logger = Logger().get_logger(__name__)
+
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+# 밴드 하나라도 겹치면 후보, 서명 일치율(추정 Jaccard)이 이 값 이상이면 같은 그룹
+DUP_THRESHOLD = 0.8
+# 너무 짧은 본문은 shingle이 적어 오탐이 많으므로 그룹핑하지 않습니다 (자기 자신이 대표)
+MIN_CONTENT_LEN = 200
+# ES에서 후보를 찾는 기간 (collected_at 기준)
+LOOKBACK = "now-7d"
+# 묶음 하나당 ES 후보 최대 건수 (밴드 수와 무관하게 고정)
+CANDIDATE_LIMIT = int(os.getenv("DUP_CANDIDATE_LIMIT", "2000"))
+
+DUP_MAPPINGS = {
+    "dup_group_id": {"type": "keyword"},
+    "dup_bands": {"type": "keyword"},
+    "dup_signature": {"type": "long", "index": False, "doc_values": False},
+}
+
+# 해시 계수는 고정 seed — ES에 저장된 서명과 계속 비교해야 하므로 바꾸면 안 됩니다
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, int(_PRIME), NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, int(_PRIME), NUM_PERM, dtype=np.uint64)
+
+_DEFAULT_POLICY = {"embedding": "content", "category": "content", "trust": "title"}
+
+
+def _load_policy() -> Dict[str, str]:
+    policy = dict(_DEFAULT_POLICY)
+    for item in os.getenv("DUP_REUSE_POLICY", "").split(","):
+        if "=" in item:
+            kind, mode = item.split("=", 1)
+            policy[kind.strip()] = mode.strip()
+    return policy
+
+
+REUSE_POLICY = _load_policy()
+
+
+def minhash(text: str) -> Optional[np.ndarray]:
+    """공백을 뺀 본문의 문자 5-gram shingle → MinHash 서명 (NUM_PERM,) / 짧으면 None"""
+    s = "".join((text or "").split())
+    if len(s) < MIN_CONTENT_LEN:
+        return None
+    hashes = np.fromiter(
+        {zlib.crc32(s[i:i + SHINGLE_SIZE].encode("utf-8")) & 0x7FFFFFFF for i in range(len(s) - SHINGLE_SIZE + 1)},
+        dtype=np.uint64,
+    )
+    # (a * x + b) mod p — a, x < 2^31 이라 uint64 안에서 넘치지 않습니다
+    return ((_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+
+
+def band_keys(sig: np.ndarray) -> List[str]:
+    return [
+        f"{b:02d}{hashlib.blake2b(sig[b * ROWS:(b + 1) * ROWS].tobytes(), digest_size=8).hexdigest()}"
+        for b in range(BANDS)
+    ]
+
+
+def similarity(sig1: np.ndarray, sig2: np.ndarray) -> float:
+    return float(np.mean(sig1 == sig2))
+
+
+class NearDupIndex:
+    """
+    최근 그룹핑한 기사의 밴드 → 기사 인덱스 (프로세스 메모리)
+    - 스트리밍 파이프라인의 직전 묶음은 아직 검색에 안 보일 수 있어서 메모리에서 먼저 찾습니다
+    - max_items를 넘으면 오래된 기사부터 뺍니다
+    """
+
+    def __init__(self, max_items: int = 50_000):
+        self.max_items = max_items
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bands: Dict[str, set] = {}
+
+    def add(self, article_id: str, group_id: str, sig: np.ndarray, bands: List[str]) -> None:
+        self.remove(article_id)
+        self._items[article_id] = (group_id, sig, bands)
+        for key in bands:
+            self._bands.setdefault(key, set()).add(article_id)
+        while len(self._items) > self.max_items:
+            self.remove(next(iter(self._items)))
+
+    def remove(self, article_id: str) -> None:
+        item = self._items.pop(article_id, None)
+        if item is None:
+            return
+        for key in item[2]:
+            members = self._bands.get(key)
+            if members is not None:
+                members.discard(article_id)
+                if not members:
+                    del self._bands[key]
+
+    def candidates(self, bands: Iterable[str]) -> Dict[str, tuple]:
+        found = {}
+        for key in bands:
+            for article_id in self._bands.get(key, ()):
+                group_id, sig, _ = self._items[article_id]
+                found[article_id] = (group_id, sig)
+        return found
+
+
+_index = NearDupIndex()
+_index_lock = threading.Lock()
+
+_mapping_ready = False
+_mapping_lock = threading.Lock()
+
+
+def _ensure_mapping() -> None:
+    """article_data에 dup_* 필드 매핑을 한 번 넣습니다 (실패해도 그룹핑은 계속)"""
+    global _mapping_ready
+    if _mapping_ready:
+        return
+    with _mapping_lock:
+        if _mapping_ready:
+            return
+        try:
+            es.indices.put_mapping(index="article_data", properties=DUP_MAPPINGS)
+        except Exception as e:
+            # 이미 다른 타입(dynamic text 등)으로 잡힌 경우 — 새 인덱스로 옮길 때까지 기존 매핑 사용
+            logger.warning(f"near-dup mapping not applied: {e}")
+        _mapping_ready = True
+
+
+def _search_candidates(bands: List[str], exclude_ids: set) -> Dict[str, tuple]:
+    """ES에서 밴드가 하나라도 겹치는 최근 기사 → {article_id: (group_id, sig, bands)}"""
+    if not bands:
+        return {}
+    resp = es.search(
+        index="article_data",
+        size=CANDIDATE_LIMIT,
+        query={
+            "bool": {
+                "filter": [
+                    {"terms": {"dup_bands": bands}},
+                    {"range": {"collected_at": {"gte": LOOKBACK}}},
+                ]
+            }
+        },
+        _source=["dup_group_id", "dup_signature", "dup_bands"],
+    )
+    found = {}
+    for hit in resp["hits"]["hits"]:
+        src = hit.get("_source") or {}
+        if hit["_id"] in exclude_ids or not src.get("dup_signature"):
+            continue
+        found[hit["_id"]] = (
+            src.get("dup_group_id") or hit["_id"],
+            np.asarray(src["dup_signature"], dtype=np.uint64),
+            src.get("dup_bands") or [],
+        )
+    return found
+
+
+def assign_groups(articles: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    [{"article_id", "article_content"}] → {article_id: {"dup_group_id", "dup_bands", "dup_signature"}}
+    - 후보: 프로세스 메모리 인덱스 + ES(최근 LOOKBACK) + 같은 묶음 앞쪽 기사
+    - 후보 중 서명 일치율이 가장 높고 DUP_THRESHOLD 이상인 기사의 그룹을 따라가고, 없으면 자기 자신이 대표
+    """
+    prepared = []
+    for a in articles:
+        sig = minhash(a.get("article_content") or "")
+        prepared.append((a["article_id"], sig, band_keys(sig) if sig is not None else []))
+
+    all_bands = sorted({key for _, _, bands in prepared for key in bands})
+    _ensure_mapping()
+    try:
+        remote = _search_candidates(all_bands, {aid for aid, _, _ in prepared})
+    except Exception as e:
+        # 후보 검색이 실패해도 전처리는 계속 (메모리 인덱스로만 그룹핑)
+        logger.warning(f"near-dup candidate search failed: {e}")
+        remote = {}
+
+    remote_bands: Dict[str, set] = {}
+    for article_id, (_, _, bands) in remote.items():
+        for key in bands:
+            remote_bands.setdefault(key, set()).add(article_id)
+
+    results = {}
+    with _index_lock:
+        for article_id, sig, bands in prepared:
+            if sig is None:
+                results[article_id] = {"dup_group_id": article_id}
+                continue
+
+            candidates = _index.candidates(bands)
+            for key in bands:
+                for other in remote_bands.get(key, ()):
+                    candidates.setdefault(other, remote[other][:2])
+            candidates.pop(article_id, None)
+
+            group_id, best = article_id, DUP_THRESHOLD
+            for other, (other_group, other_sig) in candidates.items():
+                score = similarity(sig, other_sig)
+                if score >= best:
+                    group_id, best = other_group, score
+
+            _index.add(article_id, group_id, sig, bands)
+            results[article_id] = {
+                "dup_group_id": group_id,
+                "dup_bands": bands,
+                "dup_signature": sig.tolist(),
+            }
+    return results
+
+
+def _get_path(src: Dict[str, Any], path: str):
+    for part in path.split("."):
+        if not isinstance(src, dict):
+            return None
+        src = src.get(part)
+    return src
+
+
+def _norm_title(title) -> str:
+    return " ".join(str(title or "").split())
+
+
+class ReusePlan:
+    """
+    한 묶음에서 모델을 돌릴 기사 / 결과를 복사할 기사를 나눕니다
+    - compute   : 실제로 모델을 돌릴 기사 (그룹별 대표 1건 + 재사용 불가 기사)
+    - followers : {article_id: 같은 묶음의 대표 article_id} — 대표 결과를 그대로 복사
+    - reused    : {article_id: 값} — 이미 처리된 그룹 대표(묶음 밖)의 값
+    """
+
+    def __init__(self, compute: List[Dict], followers: Dict[str, str], reused: Dict[str, Any]):
+        self.compute = compute
+        self.followers = followers
+        self.reused = reused
+
+    @property
+    def saved_cnt(self) -> int:
+        return len(self.followers) + len(self.reused)
+
+    def resolve(self, computed: Dict[str, Any]) -> Dict[str, Any]:
+        """대표 결과(computed)로 followers/reused 값을 채운 {article_id: 값} (대표가 실패했으면 빠집니다)"""
+        out = dict(self.reused)
+        for article_id, rep_id in self.followers.items():
+            if rep_id in computed:
+                out[article_id] = computed[rep_id]
+        return out
+
+
+def plan_reuse(kind: str, docs: List[Dict[str, Any]], field: str) -> ReusePlan:
+    """
+    kind: "embedding" | "category" | "trust" (REUSE_POLICY 키)
+    docs: article_data _source (article_id, article_title, dup_group_id 포함)
+    field: 재사용할 값의 경로 (예: "article_embedding", "article_label.category")
+    """
+    mode = REUSE_POLICY.get(kind, "off")
+    if mode == "off":
+        return ReusePlan(list(docs), {}, {})
+
+    def _key(doc):
+        group_id = doc.get("dup_group_id") or doc["article_id"]
+        return (group_id, _norm_title(doc.get("article_title"))) if mode == "title" else (group_id,)
+
+    # 1) 묶음 밖 그룹 대표가 이미 처리된 값을 가지고 있으면 그대로 사용
+    outside = {
+        doc["dup_group_id"]
+        for doc in docs
+        if doc.get("dup_group_id") and doc["dup_group_id"] != doc["article_id"]
+    } - {doc["article_id"] for doc in docs}
+    canonical = {}
+    if outside:
+        # 벡터는 article_data _source 에 없으므로(util.vector_store) float 사본에서 읽고, 제목만 _source 에서
+        vectors = get_vectors("article", sorted(outside)) if kind == "embedding" else None
+        source = ["article_title"] if vectors is not None else [field, "article_title"]
+        resp = es.mget(index="article_data", ids=sorted(outside), _source=source)
+        for d in resp["docs"]:
+            if vectors is not None:
+                value = vectors.get(d["_id"]) if d.get("found") else None
+            else:
+                value = _get_path(d.get("_source") or {}, field) if d.get("found") else None
+            if value is not None:
+                canonical[d["_id"]] = (value, _norm_title(d["_source"].get("article_title")))
+
+    compute, followers, reused, reps = [], {}, {}, {}
+    for doc in docs:
+        article_id = doc["article_id"]
+        group_id = doc.get("dup_group_id") or article_id
+        hit = canonical.get(group_id)
+        if hit is not None and (mode != "title" or hit[1] == _norm_title(doc.get("article_title"))):
+            reused[article_id] = hit[0]
+            continue
+        # 2) 같은 묶음 안에서는 그룹(+제목)별로 1건만 계산
+        key = _key(doc)
+        if key in reps:
+            followers[article_id] = reps[key]
+        else:
+            reps[key] = article_id
+            compute.append(doc)
+    return ReusePlan(compute, followers, reused)
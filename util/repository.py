@@ -70,14 +70,16 @@ def upsert_article(article_list: List[str]):
     to_article_label = []
     db = SessionLocal()
 
-    query = {
-        "_source": ["article_id", "article_title", "article_content", "url", "article_label"],
-        "size": 1000,
-        "query": {"terms": {"article_id": article_list}},
-    }
+    if not article_list:
+        return
 
-    resp = es.search(index="article_data", body=query)
-    hits = resp.get("hits", {}).get("hits", [])
+    # mget은 실시간 조회라 신뢰도 단계가 방금 쓴 점수도 refresh 없이 읽힙니다
+    resp = es.mget(
+        index="article_data",
+        ids=article_list,
+        _source=["article_id", "article_title", "article_content", "url", "article_label"],
+    )
+    hits = [d for d in resp["docs"] if d.get("found")]
     if not hits:
         return
 
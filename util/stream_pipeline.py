@@ -0,0 +1,215 @@
+import asyncio
+import time
+import traceback
+from typing import Callable, Dict, List, Optional
+
+from util.elastic import es
+from util.elastic_templates import build_error_doc, build_info_docs
+from util.logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+# 큐 종료 신호
+_DONE = object()
+
+
+class StreamStage:
+    """
+    스트리밍 파이프라인의 한 단계입니다
+    - fn: article_id 리스트를 받아 처리하는 기존 동기 함수 (clean_articles, create_embedding ...)
+      반환값이 list면 그 id들만 다음 단계로, 그 외(None, 건수 등)면 받은 id 전부를 넘깁니다
+    - batch_size / max_wait: batch_size개가 모이거나 첫 id 이후 max_wait초가 지나면 한 묶음으로 실행
+    - queue_size: 이 단계 입력 큐 크기. 가득 차면 앞 단계(최초 단계면 크롤러)가 기다립니다 (back-pressure)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        component: str,
+        fn: Callable[[List[str]], Optional[List[str]]],
+        batch_size: int = 100,
+        max_wait: float = 1.0,
+        queue_size: Optional[int] = None,
+    ):
+        self.name = name
+        self.component = component
+        self.fn = fn
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.queue_size = queue_size or batch_size * 2
+
+        # 단계 통계 (info_logs 용)
+        self.batch_cnt = 0
+        self.input_cnt = 0
+        self.success_cnt = 0
+        self.failed_cnt = 0
+        self.busy_ms = 0
+
+
+class StreamingPipeline:
+    """
+    크롤링 → 전처리 → 임베딩 → 카테고리 → 신뢰도 → DB 를 단계별 bounded queue로 잇습니다
+    - 기사 1건이 article_raw에 적재되는 즉시 put() → 첫 단계 큐로 들어갑니다
+    - 각 단계는 자기 큐에서 micro-batch를 꺼내 스레드(asyncio.to_thread)에서 실행하고 결과 id를 다음 큐로 넘김
+    - 전 단계가 동시에 돌며, 큐가 가득 차면 put이 기다리므로 느린 단계가 크롤러 속도를 조절합니다
+    - 한 묶음이 실패하면 error_log에 남기고 그 묶음만 버립니다 (다음 묶음은 계속 처리)
+
+    사용법:
+        pipeline = StreamingPipeline([StreamStage("clean_articles", "preprocess", clean_articles), ...], run_id, job_id)
+        pipeline.start()
+        await pipeline.put(article_id)     # 크롤러에서 기사마다
+        await pipeline.close()             # 남은 기사를 끝까지 흘려보내고 통계 기록
+    """
+
+    def __init__(self, stages: List[StreamStage], run_id: str, job_id: str):
+        self.stages = stages
+        self.run_id = run_id
+        self.job_id = job_id
+        self._queues: List[asyncio.Queue] = []
+        self._workers: List[asyncio.Task] = []
+        self._entered_at: Dict[str, float] = {}
+        self._latencies_ms: List[int] = []
+        self.completed_ids: List[str] = []
+        self._t0 = 0.0
+
+    def start(self) -> None:
+        self._t0 = time.monotonic()
+        self._queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        for i, stage in enumerate(self.stages):
+            out_queue = self._queues[i + 1] if i + 1 < len(self.stages) else None
+            self._workers.append(asyncio.create_task(self._run_stage(stage, self._queues[i], out_queue)))
+
+    async def put(self, article_id: str) -> None:
+        self._entered_at[article_id] = time.monotonic()
+        await self._queues[0].put(article_id)
+
+    async def close(self) -> List[str]:
+        """입력을 닫고 모든 단계가 비워질 때까지 기다립니다. 마지막 단계까지 통과한 id를 반환"""
+        await self._queues[0].put(_DONE)
+        await asyncio.gather(*self._workers)
+        self._log_summary()
+        return self.completed_ids
+
+    async def _next_batch(self, stage: StreamStage, queue: asyncio.Queue):
+        """(batch, done) — 첫 id는 기다리고, 이후는 max_wait 안에 들어온 것만 모읍니다"""
+        first = await queue.get()
+        if first is _DONE:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + stage.max_wait
+        while len(batch) < stage.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _run_stage(self, stage: StreamStage, in_queue: asyncio.Queue, out_queue: Optional[asyncio.Queue]):
+        done = False
+        while not done:
+            batch, done = await self._next_batch(stage, in_queue)
+            if batch:
+                passed = await self._run_batch(stage, batch)
+                for article_id in passed:
+                    if out_queue is not None:
+                        await out_queue.put(article_id)
+                    else:
+                        self._finish(article_id)
+        if out_queue is not None:
+            await out_queue.put(_DONE)
+
+    async def _run_batch(self, stage: StreamStage, batch: List[str]) -> List[str]:
+        stage.batch_cnt += 1
+        stage.input_cnt += len(batch)
+        t0 = time.monotonic()
+        try:
+            result = await asyncio.to_thread(stage.fn, batch)
+            if not isinstance(result, list):
+                passed = batch
+            else:
+                kept = set(result)
+                passed = [aid for aid in batch if aid in kept]
+        except Exception as e:
+            logger.error(f"stream stage {stage.name} failed ({len(batch)} ids): {e}")
+            self._log_batch_error(stage, batch, e)
+            passed = []
+        finally:
+            stage.busy_ms += int((time.monotonic() - t0) * 1000)
+
+        stage.success_cnt += len(passed)
+        stage.failed_cnt += len(batch) - len(passed)
+        return passed
+
+    def _log_batch_error(self, stage: StreamStage, batch: List[str], exc: Exception) -> None:
+        # 로그 적재 실패로 단계 worker가 죽으면 앞 단계 큐가 영원히 막히므로 여기서 예외를 삼킵니다
+        try:
+            es.index(
+                index="error_log",
+                document=build_error_doc(
+                    message=f"{stage.name} 스트리밍 묶음 실패 ({len(batch)}건)",
+                    service_name="crawler",
+                    pipeline_run_id=self.run_id,
+                    pipeline_job=self.job_id,
+                    pipeline_step=stage.name,
+                    event_severity=3,
+                    exception=exc,
+                    samples=[{"article_ids": batch[:10], "traceback": traceback.format_exc()}],
+                    tags=["crawler", "stream", stage.component],
+                )
+            )
+        except Exception as log_exc:
+            logger.error(f"stream stage {stage.name} error_log failed: {log_exc}")
+
+    def _finish(self, article_id: str) -> None:
+        self.completed_ids.append(article_id)
+        entered = self._entered_at.pop(article_id, None)
+        if entered is not None:
+            self._latencies_ms.append(int((time.monotonic() - entered) * 1000))
+
+    def _log_summary(self) -> None:
+        for stage in self.stages:
+            es.index(
+                index="info_logs",
+                document=build_info_docs(
+                    run_id=self.run_id,
+                    job_id=self.job_id,
+                    component=stage.component,
+                    stage=f"{stage.name}_end",
+                    status="warn" if stage.failed_cnt else "ok",
+                    duration_ms=stage.busy_ms,
+                    input_cnt=stage.input_cnt,
+                    success_cnt=stage.success_cnt,
+                    failed_cnt=stage.failed_cnt,
+                    message=f"stream batches={stage.batch_cnt} batch_size={stage.batch_size}"
+                )
+            )
+
+        latencies = sorted(self._latencies_ms)
+        p50 = latencies[len(latencies) // 2] if latencies else 0
+        p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+        entered_cnt = self.stages[0].input_cnt if self.stages else 0
+        es.index(
+            index="info_logs",
+            document=build_info_docs(
+                run_id=self.run_id,
+                job_id=self.job_id,
+                component="crawler",
+                stage="stream_pipeline_end",
+                status="ok" if len(self.completed_ids) == entered_cnt else "warn",
+                duration_ms=int((time.monotonic() - self._t0) * 1000),
+                input_cnt=entered_cnt,
+                success_cnt=len(self.completed_ids),
+                failed_cnt=max(0, entered_cnt - len(self.completed_ids)),
+                message=(
+                    f"collect→done latency p50={p50}ms p95={p95}ms "
+                    f"max={latencies[-1] if latencies else 0}ms"
+                )
+            )
+        )
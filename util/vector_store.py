@@ -0,0 +1,279 @@
+"""
+임베딩 벡터 저장 방식 (article_data.article_embedding / user_embeddings.embedding)
+
+1) 검색용 벡터: dense_vector + index_options int8_hnsw (VECTOR_INDEX_TYPE)
+   - HNSW 그래프/벡터를 int8로 양자화해서 메모리(off-heap)와 디스크를 약 1/4로 줄임
+   - 검색 쿼리는 float 벡터 그대로 (ES가 양자화), 기존 kNN 코드 수정 불필요
+2) _source 에서 벡터 제외: index.mapping.exclude_source_vectors (ES 9.2+)
+   - _source.excludes 는 쓰지 않습니다: 부분 update(status, article_label, related_ids …)가
+     _source 로 문서를 다시 만들면서 벡터가 사라지기 때문. 이 설정은 update/reindex 때 벡터를 복원합니다
+   - 검색 응답/_source 에서 벡터가 빠지므로 벡터가 필요한 곳은 get_vectors()로 읽습니다
+3) float 사본(보조 인덱스 vector_store): 재정렬(rerank)과 조회용
+   - float32 → base64 문자열 (768차원 약 4KB, JSON float 리스트는 약 15KB)
+   - 매핑하지 않고 _source 에만 둡니다 (dynamic: false)
+
+기존 인덱스는 설정을 바꿀 수 없어서 새 인덱스로 reindex 후 alias 로 교체합니다:
+    python -m util.vector_store migrate article_data --swap
+"""
+import argparse
+import base64
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from elasticsearch import helpers
+
+from util.elastic import es
+from util.logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+VECTOR_DIMS = 768
+# int8_hnsw | int4_hnsw | hnsw(float, 기존과 같음)
+VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "int8_hnsw")
+VECTOR_STORE_INDEX = "vector_store"
+VECTOR_STORE_ENABLED = os.getenv("VECTOR_STORE_ENABLED", "1") != "0"
+
+# kind → (인덱스, 벡터 필드)
+VECTOR_FIELDS = {
+    "article": ("article_data", "article_embedding"),
+    "user": ("user_embeddings", "embedding"),
+}
+
+_STORE_MAPPINGS = {
+    "dynamic": False,
+    "properties": {
+        "kind": {"type": "keyword"},
+        "updated_at": {"type": "date"},
+    },
+}
+
+
+def vector_field_mapping() -> dict:
+    return {
+        "type": "dense_vector",
+        "dims": VECTOR_DIMS,
+        "index": True,
+        "similarity": "cosine",
+        "index_options": {"type": VECTOR_INDEX_TYPE, "m": 16, "ef_construction": 100},
+    }
+
+
+def index_body(kind: str) -> dict:
+    """새 인덱스 생성용 settings + mappings (나머지 필드는 기존처럼 dynamic 매핑)"""
+    _, field = VECTOR_FIELDS[kind]
+    properties = {field: vector_field_mapping()}
+    if kind == "article":
+        # 근사 중복 필드 (util.near_dup) — 기존 인덱스에서는 dynamic text 로 잡혀 있을 수 있음
+        from util.near_dup import DUP_MAPPINGS
+
+        properties.update(DUP_MAPPINGS)
+    return {
+        "settings": {"index.mapping.exclude_source_vectors": True},
+        "mappings": {"properties": properties},
+    }
+
+
+# ---------- float 사본 ----------
+def encode_vector(vec) -> str:
+    return base64.b64encode(np.asarray(vec, dtype="<f4").tobytes()).decode("ascii")
+
+
+def decode_vector(raw: str) -> List[float]:
+    return np.frombuffer(base64.b64decode(raw), dtype="<f4").tolist()
+
+
+def _store_id(kind: str, key: str) -> str:
+    return f"{kind}:{key}"
+
+
+_store_ready = False
+_store_lock = threading.Lock()
+
+
+def _ensure_store() -> None:
+    global _store_ready
+    if _store_ready:
+        return
+    with _store_lock:
+        if _store_ready:
+            return
+        if not es.indices.exists(index=VECTOR_STORE_INDEX):
+            try:
+                es.indices.create(index=VECTOR_STORE_INDEX, mappings=_STORE_MAPPINGS)
+            except Exception as e:
+                # 동시에 만든 경우(resource_already_exists)는 무시
+                if "already_exists" not in str(e):
+                    raise
+        _store_ready = True
+
+
+def put_vectors(kind: str, vectors: Dict[str, List[float]]) -> int:
+    """float 사본 저장 (실패해도 본 인덱스 쓰기에는 영향 없음)"""
+    if not VECTOR_STORE_ENABLED or not vectors:
+        return 0
+    now = datetime.now(KST).isoformat()
+    actions = (
+        {
+            "_op_type": "index",
+            "_index": VECTOR_STORE_INDEX,
+            "_id": _store_id(kind, key),
+            "_source": {"kind": kind, "vector": encode_vector(vec), "updated_at": now},
+        }
+        for key, vec in vectors.items()
+    )
+    try:
+        _ensure_store()
+        success, _ = helpers.bulk(es, actions, chunk_size=500, request_timeout=120, raise_on_error=False)
+        return success
+    except Exception as e:
+        logger.warning(f"vector store write failed: {e}")
+        return 0
+
+
+def delete_vectors(kind: str, keys: Iterable[str]) -> None:
+    if not VECTOR_STORE_ENABLED:
+        return
+    actions = (
+        {"_op_type": "delete", "_index": VECTOR_STORE_INDEX, "_id": _store_id(kind, key)}
+        for key in keys
+    )
+    try:
+        helpers.bulk(es, actions, chunk_size=500, request_timeout=120, raise_on_error=False)
+    except Exception as e:
+        logger.warning(f"vector store delete failed: {e}")
+
+
+def get_vectors(kind: str, keys: List[str]) -> Dict[str, List[float]]:
+    """
+    float 벡터 조회: vector_store 사본 → 없으면 원본 인덱스 _source (이전 방식으로 저장된 문서)
+    반환: {key: vector} (못 찾은 key는 빠짐)
+    """
+    keys = [k for k in dict.fromkeys(keys) if k]
+    if not keys:
+        return {}
+    found: Dict[str, List[float]] = {}
+    if VECTOR_STORE_ENABLED:
+        try:
+            resp = es.mget(index=VECTOR_STORE_INDEX, ids=[_store_id(kind, k) for k in keys], _source=["vector"])
+            for key, d in zip(keys, resp["docs"]):
+                raw = (d.get("_source") or {}).get("vector") if d.get("found") else None
+                if raw:
+                    found[key] = decode_vector(raw)
+        except Exception as e:
+            logger.info(f"vector store lookup skipped: {e}")
+
+    missing = [k for k in keys if k not in found]
+    if missing:
+        index, field = VECTOR_FIELDS[kind]
+        resp = es.mget(index=index, ids=missing, _source=[field])
+        for d in resp["docs"]:
+            vec = (d.get("_source") or {}).get(field) if d.get("found") else None
+            if vec:
+                found[d["_id"]] = vec
+    return found
+
+
+def get_vector(kind: str, key: str) -> Optional[List[float]]:
+    return get_vectors(kind, [key]).get(key)
+
+
+def rerank(kind: str, query_vector, hits: List[dict], id_field: str = "article_id") -> List[dict]:
+    """
+    양자화 kNN 결과를 float 사본으로 다시 점수 매겨 정렬 (_score = (1 + cos) / 2, ES cosine 과 같은 척도)
+    사본이 없는 hit는 ES 점수를 그대로 둡니다
+    """
+    if not hits:
+        return hits
+    keys = [(h.get("_source") or {}).get(id_field) or h.get("_id") for h in hits]
+    vectors = get_vectors(kind, keys)
+    q = np.asarray(query_vector, dtype=np.float32)
+    q /= max(float(np.linalg.norm(q)), 1e-12)
+    for key, h in zip(keys, hits):
+        vec = vectors.get(key)
+        if vec is None:
+            continue
+        v = np.asarray(vec, dtype=np.float32)
+        h["_score"] = (1.0 + float(np.dot(q, v) / max(float(np.linalg.norm(v)), 1e-12))) / 2.0
+    return sorted(hits, key=lambda h: -h["_score"])
+
+
+# ---------- 인덱스 교체 ----------
+def backfill_store(kind: str, chunk_size: int = 500) -> int:
+    """원본 인덱스 _source 벡터로 vector_store 사본을 채웁니다 (exclude_source_vectors 적용 전에 실행). 반환: 저장 건수"""
+    index, field = VECTOR_FIELDS[kind]
+    stored = 0
+    if index == "article_data":
+        from util.backfill import scan_pages
+
+        # scan_pages 는 article_data 전용 (article_id 정렬 PIT)
+        for hits, _ in scan_pages({"exists": {"field": field}}, [field], chunk_size, None):
+            stored += put_vectors(kind, {h["_id"]: h["_source"][field] for h in hits if (h.get("_source") or {}).get(field)})
+        return stored
+
+    batch: Dict[str, List[float]] = {}
+    for h in helpers.scan(es, index=index, query={"query": {"exists": {"field": field}}}, _source=[field]):
+        vec = (h.get("_source") or {}).get(field)
+        if vec:
+            batch[h["_id"]] = vec
+        if len(batch) >= chunk_size:
+            stored += put_vectors(kind, batch)
+            batch = {}
+    return stored + put_vectors(kind, batch)
+
+
+def migrate(kind: str, target: Optional[str] = None, swap: bool = False, backfill: bool = True) -> Tuple[str, int]:
+    """
+    새 스키마로 인덱스를 만들고 reindex → (swap이면) 기존 인덱스를 지우고 같은 이름의 alias로 교체
+    backfill: 기존 _source 벡터로 vector_store 사본을 채움 (reindex 전에 읽어야 함)
+      user 벡터는 어느 인덱스를 옮기든 같이 채웁니다 — 읽는 쪽이 모두 get_vector("user")로 바뀌어서
+      사본 없이 user_embeddings 가 교체되면 기존 사용자 벡터를 읽을 곳이 없어짐
+    반환: (새 인덱스 이름, 복사 건수)
+    """
+    index, _ = VECTOR_FIELDS[kind]
+    target = target or f"{index}_{datetime.now(KST).strftime('%Y%m%d%H%M')}"
+
+    if backfill:
+        for k in dict.fromkeys([kind, "user"]):
+            logger.info(f"vector store backfill {k}: {backfill_store(k)} vectors")
+
+    es.indices.create(index=target, **index_body(kind))
+    resp = es.reindex(
+        source={"index": index},
+        dest={"index": target},
+        wait_for_completion=True,
+        request_timeout=3600,
+    )
+    copied = int(resp.get("created", 0)) + int(resp.get("updated", 0))
+    logger.info(f"reindex {index} → {target}: {copied} docs")
+
+    if swap:
+        es.indices.update_aliases(actions=[
+            {"remove_index": {"index": index}},
+            {"add": {"index": target, "alias": index}},
+        ])
+        logger.info(f"alias {index} → {target}")
+    return target, copied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="int8 벡터 스키마로 인덱스 교체")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    m = sub.add_parser("migrate")
+    m.add_argument("index", choices=[index for index, _ in VECTOR_FIELDS.values()])
+    m.add_argument("--target", default=None)
+    m.add_argument("--swap", action="store_true", help="reindex 후 기존 인덱스를 지우고 alias 로 교체")
+    m.add_argument("--no-store", action="store_true", help="vector_store float 사본 채우기 생략")
+    args = parser.parse_args()
+
+    kind = next(k for k, (index, _) in VECTOR_FIELDS.items() if index == args.index)
+    target, copied = migrate(kind, args.target, swap=args.swap, backfill=not args.no_store)
+    print(f"{args.index} → {target}: {copied} docs (swap={args.swap})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from util.logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+DEFAULT_TIMEOUT = 15.0      # seconds
+DEFAULT_POLL = 0.2          # seconds
+
+
+class WaitRecorder:
+    """
+    고정 time.sleep 대신 "조건이 만족될 때까지" 기다리고, 실제로 걸린 시간을 기록합니다
+    - wait(): Selenium expected_conditions 대기 (WebDriverWait)
+    - poll(): 임의의 조건 함수(ES 문서 가시성 등) 폴링 대기
+    - measure(): refresh=wait_for 요청처럼 대기가 포함된 블록의 소요 시간 측정
+    - 타임아웃은 예외 대신 False 반환 → 기존 sleep 흐름처럼 다음 단계로 진행 여부를 호출측이 결정
+
+    기록은 summary()/total_ms()로 info_logs 메시지에 남깁니다
+    """
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+
+    def _record(self, label: str, t0: float, ok: bool) -> None:
+        elapsed_ms = int((time.monotonic() - t0) * 1000)
+        self.records.append({"label": label, "elapsed_ms": elapsed_ms, "ok": ok})
+        if not ok:
+            logger.warning(f"wait timeout: {label} ({elapsed_ms}ms)")
+
+    def wait(self, driver, condition: Callable, label: str, timeout: float = DEFAULT_TIMEOUT) -> bool:
+        t0 = time.monotonic()
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=DEFAULT_POLL).until(condition)
+            ok = True
+        except TimeoutException:
+            ok = False
+        self._record(label, t0, ok)
+        return ok
+
+    def poll(
+        self,
+        predicate: Callable[[], bool],
+        label: str,
+        timeout: float = DEFAULT_TIMEOUT,
+        interval: float = DEFAULT_POLL,
+    ) -> bool:
+        t0 = time.monotonic()
+        ok = False
+        while True:
+            try:
+                ok = bool(predicate())
+            except Exception as e:
+                logger.info(f"wait poll error ({label}): {e}")
+            if ok or time.monotonic() - t0 >= timeout:
+                break
+            time.sleep(interval)
+        self._record(label, t0, ok)
+        return ok
+
+    @contextmanager
+    def measure(self, label: str):
+        t0 = time.monotonic()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self._record(label, t0, ok)
+
+    def total_ms(self) -> int:
+        return sum(r["elapsed_ms"] for r in self.records)
+
+    def timed_out(self) -> int:
+        return sum(1 for r in self.records if not r["ok"])
+
+    def summary(self, prefix: Optional[str] = None) -> str:
+        parts = [
+            f"{r['label']}={r['elapsed_ms']}ms" + ("" if r["ok"] else "(timeout)")
+            for r in self.records
+        ]
+        body = " ".join(parts)
+        return f"{prefix} {body}" if prefix else body
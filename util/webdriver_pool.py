@@ -0,0 +1,140 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from util.logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+MAX_IDLE = 2          # 실행 사이에 띄워둘 브라우저 수
+MAX_USES = 20         # 이 횟수만큼 빌려준 브라우저는 폐기 후 새로 띄움 (메모리 누수 방지)
+MAX_AGE_SEC = 6 * 60 * 60
+
+
+def build_chrome_options() -> webdriver.ChromeOptions:
+    options = webdriver.ChromeOptions()
+    # 스케줄러용: 창 없이 백그라운드 실행
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--remote-allow-origins=*")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    return options
+
+
+class _PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+
+
+class WebDriverPool:
+    """
+    스케줄러 job(BigKinds, Google Trends)이 같이 쓰는 headless Chrome 풀입니다
+    - chromedriver 경로는 프로세스당 1번만 resolve (ChromeDriverManager().install())
+    - 반납된 브라우저는 띄워둔 채로 재사용, 빌려줄 때 health check
+    - MAX_USES / MAX_AGE_SEC 넘으면 폐기 후 새로 띄움
+    - lease 중 예외가 나면 해당 브라우저는 상태를 믿을 수 없으니 폐기
+
+    사용법:
+        with webdriver_pool.lease() as driver:
+            driver.get(...)
+    """
+
+    def __init__(self, max_idle: int = MAX_IDLE, max_uses: int = MAX_USES, max_age_sec: float = MAX_AGE_SEC):
+        self.max_idle = max_idle
+        self.max_uses = max_uses
+        self.max_age_sec = max_age_sec
+        self._idle: List[_PooledDriver] = []
+        self._lock = threading.Lock()
+        self._driver_path: Optional[str] = None
+
+    def resolve_driver(self) -> str:
+        with self._lock:
+            if self._driver_path is None:
+                t0 = time.monotonic()
+                self._driver_path = ChromeDriverManager().install()
+                logger.info(f"chromedriver resolved in {int((time.monotonic() - t0) * 1000)}ms: {self._driver_path}")
+            return self._driver_path
+
+    def warm_up(self) -> None:
+        """프로세스 시작 시 호출: 드라이버 경로 resolve + 브라우저 1개 미리 띄움"""
+        with self.lease():
+            pass
+
+    def _launch(self) -> _PooledDriver:
+        t0 = time.monotonic()
+        driver = webdriver.Chrome(service=Service(self.resolve_driver()), options=build_chrome_options())
+        logger.info(f"chrome launched in {int((time.monotonic() - t0) * 1000)}ms")
+        return _PooledDriver(driver)
+
+    def _healthy(self, pooled: _PooledDriver) -> bool:
+        if pooled.uses >= self.max_uses:
+            return False
+        if time.monotonic() - pooled.created_at > self.max_age_sec:
+            return False
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(pooled: _PooledDriver) -> None:
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    def _acquire(self) -> _PooledDriver:
+        while True:
+            with self._lock:
+                pooled = self._idle.pop() if self._idle else None
+            if pooled is None:
+                return self._launch()
+            if self._healthy(pooled):
+                return pooled
+            self._quit(pooled)
+
+    def _release(self, pooled: _PooledDriver) -> None:
+        try:
+            # 다음 job에 상태가 새지 않도록 비워서 반납
+            pooled.driver.delete_all_cookies()
+            pooled.driver.get("about:blank")
+        except Exception:
+            self._quit(pooled)
+            return
+
+        with self._lock:
+            if len(self._idle) < self.max_idle and pooled.uses < self.max_uses:
+                self._idle.append(pooled)
+                return
+        self._quit(pooled)
+
+    @contextmanager
+    def lease(self):
+        pooled = self._acquire()
+        pooled.uses += 1
+        try:
+            yield pooled.driver
+        except BaseException:
+            self._quit(pooled)
+            raise
+        else:
+            self._release(pooled)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._quit(pooled)
+
+
+webdriver_pool = WebDriverPool()